@@ -1,11 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 from typing import Dict
 import sys
 from pathlib import Path
 import socketio
 import logging
+import asyncio
 from contextlib import asynccontextmanager
 from sqlalchemy import inspect
 
@@ -15,8 +17,9 @@ sys.path.append(str(Path(__file__).parent.parent))
 from core.config import settings
 from api.routes import llm, chat, documents, projects, maintenance, settings as settings_router, analytics
 from api.websocket.chat_ws import sio
-from core.database import sync_engine, async_engine, SessionLocal
-from utils.ollama_service import check_ollama_on_startup, ollama_service
+from core.database import sync_engine, async_engine, SessionLocal, warm_up_pool
+from utils.ollama_service import check_ollama_on_startup
+from core.llm import get_ollama_client, OllamaClientError
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +32,14 @@ async def lifespan(app: FastAPI):
     Startup:
     - Verifies database tables exist
     - Checks if migrations are up to date
+    - Starts the model catalog refresher
 
     Shutdown:
-    - Closes database connections
+    - Stops background tasks
+    - Closes Ollama and database connections
     """
+    catalog_refresher = None
+
     # Startup
     try:
         logger.info("🚀 Starting DAA Chatbot API...")
@@ -54,6 +61,10 @@ async def lifespan(app: FastAPI):
 
         logger.info(f"✅ Database check passed - {len(tables)} tables found")
 
+        # Open pooled connections now instead of on the first requests
+        warmed = await warm_up_pool()
+        logger.info(f"✅ Database pool warmed up - {warmed} connections")
+
         # Create storage directories if they don't exist
         storage_dirs = [
             Path(settings.UPLOAD_DIR),
@@ -77,7 +88,6 @@ async def lifespan(app: FastAPI):
         # Load model settings from database
         try:
             from crud.user_settings import user_settings as crud_user_settings
-            from core.llm import ollama_client
             from core.embeddings import embedding_service
 
             async with SessionLocal() as db:
@@ -86,7 +96,7 @@ async def lifespan(app: FastAPI):
 
                 # Override defaults with database settings
                 if user_settings_obj.default_llm_model:
-                    ollama_client.switch_model(user_settings_obj.default_llm_model)
+                    get_ollama_client().switch_model(user_settings_obj.default_llm_model)
                     logger.info(f"✅ Loaded LLM model from database: {user_settings_obj.default_llm_model}")
 
                 if user_settings_obj.default_embedding_model:
@@ -97,6 +107,14 @@ async def lifespan(app: FastAPI):
             logger.warning(f"⚠️  Could not load model settings from database: {e}")
             logger.warning("   Using default models from environment configuration")
 
+        # Keep the model catalogs pre-serialized for the settings endpoints
+        if settings.MODELS_CATALOG_REFRESH_INTERVAL > 0:
+            from services.settings_service import settings_service
+
+            catalog_refresher = asyncio.create_task(
+                settings_service.run_catalog_refresher(settings.MODELS_CATALOG_REFRESH_INTERVAL)
+            )
+
         logger.info("✅ Startup complete - API is ready")
 
     except Exception as e:
@@ -107,6 +125,13 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("🛑 Shutting down DAA Chatbot API...")
+    if catalog_refresher:
+        catalog_refresher.cancel()
+    # Only close the client if something created it
+    if get_ollama_client.cache_info().currsize:
+        await get_ollama_client().aclose()
+    from core.embeddings import embedding_service
+    await embedding_service.aclose()
     await async_engine.dispose()
     logger.info("✅ Shutdown complete")
 
@@ -127,6 +152,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON payloads (project/document/model listings) for clients that
+# send Accept-Encoding: gzip. Small bodies are left alone, and Starlette 0.46+ (pinned
+# in requirements.txt) skips text/event-stream so SSE streams are not buffered.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(llm.router)
 app.include_router(chat.router)
@@ -175,9 +205,12 @@ async def api_health() -> Dict[str, str]:
 
     # Check database connection and tables
     try:
-        # Verify we can connect and query
-        inspector = inspect(sync_engine)
-        tables = inspector.get_table_names()
+        # Verify we can connect and query (through the async pool so the
+        # event loop is not blocked by a sync engine connection)
+        async with async_engine.connect() as conn:
+            tables = await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).get_table_names()
+            )
 
         required_tables = ['projects', 'documents', 'chats', 'messages']
         missing_tables = [table for table in required_tables if table not in tables]
@@ -195,21 +228,17 @@ async def api_health() -> Dict[str, str]:
         health_status["database_error"] = str(e)
         health_status["status"] = "degraded"
 
-    # Check Ollama service status
+    # Check Ollama service status with the async client (a single /api/tags call
+    # instead of blocking requests calls on the event loop)
     try:
-        is_running = ollama_service.check_status()
-        health_status["ollama_status"] = "running" if is_running else "not_running"
-
-        if is_running:
-            # Get model count
-            success, models, message = ollama_service.get_models()
-            if success:
-                health_status["ollama_models_count"] = len(models)
-            else:
-                health_status["ollama_warning"] = message
-        else:
-            health_status["status"] = "degraded"
-            health_status["ollama_warning"] = "Ollama is not running. Start with 'ollama serve'"
+        models = await get_ollama_client().list_models()
+        health_status["ollama_status"] = "running"
+        health_status["ollama_models_count"] = len(models)
+
+    except OllamaClientError:
+        health_status["ollama_status"] = "not_running"
+        health_status["status"] = "degraded"
+        health_status["ollama_warning"] = "Ollama is not running. Start with 'ollama serve'"
 
     except Exception as e:
         health_status["ollama_status"] = "error"
@@ -236,4 +265,6 @@ application = socket_app
 if __name__ == "__main__":
     import uvicorn
     # Run the combined Socket.IO + FastAPI application
-    uvicorn.run(socket_app, host="0.0.0.0", port=8000)
+    # loop="auto" picks uvloop (installed with uvicorn[standard]) when available
+    # ws_per_message_deflate negotiates permessage-deflate for Socket.IO frames
+    uvicorn.run(socket_app, host="0.0.0.0", port=8000, loop="auto", ws_per_message_deflate=True)
@@ -13,13 +13,14 @@ Endpoints:
 
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 import json
 
 from core.database import get_db
+from core.llm import is_overloaded, MAX_TEMPERATURE
 from services.chat_service import chat_service, ChatServiceError
 from models.message import MessageRole
 from models.base import format_datetime
@@ -45,7 +46,7 @@ class SendMessageRequest(BaseModel):
     """Request model for sending a message."""
     message: str = Field(..., description="User message content")
     model: Optional[str] = Field(None, description="LLM model to use (optional)")
-    temperature: float = Field(0.7, ge=0.0, le=1.0, description="Sampling temperature")
+    temperature: float = Field(0.7, ge=0.0, le=MAX_TEMPERATURE, description="Sampling temperature")
     include_history: bool = Field(True, description="Include conversation history")
     max_history: int = Field(5, ge=1, le=20, description="Maximum history messages")
     stream: bool = Field(False, description="Stream the response")
@@ -200,8 +201,8 @@ async def get_chat(
         project_id=chat.project_id,
         title=chat.title,
         message_count=chat.message_count,
-        created_at=chat.created_at.isoformat(),
-        updated_at=chat.updated_at.isoformat(),
+        created_at=format_datetime(chat.created_at),
+        updated_at=format_datetime(chat.updated_at),
         messages=messages
     )
 
@@ -345,6 +346,7 @@ async def list_chats(
 async def send_message(
     chat_id: int,
     request: SendMessageRequest,
+    http_request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -355,6 +357,7 @@ async def send_message(
     Args:
         chat_id: Chat ID
         request: Message request
+        http_request: Incoming HTTP request (its client is the scheduling key)
         db: Database session
 
     Returns:
@@ -363,6 +366,9 @@ async def send_message(
     Raises:
         HTTPException: If chat not found or message sending fails
     """
+    # Schedule LLM requests fairly per client
+    user_id = http_request.client.host if http_request.client else "default_user"
+
     try:
         # Handle streaming response
         if request.stream:
@@ -376,7 +382,8 @@ async def send_message(
                         model=request.model,
                         temperature=request.temperature,
                         include_history=request.include_history,
-                        max_history=request.max_history
+                        max_history=request.max_history,
+                        user_id=user_id
                     ):
                         # Send events as Server-Sent Events format
                         yield f"data: {json.dumps(event)}\n\n"
@@ -409,7 +416,8 @@ async def send_message(
                 model=request.model,
                 temperature=request.temperature,
                 include_history=request.include_history,
-                max_history=request.max_history
+                max_history=request.max_history,
+                user_id=user_id
             )
 
             return RAGAnswerResponse(
@@ -427,6 +435,12 @@ async def send_message(
             )
 
     except ChatServiceError as e:
+        if is_overloaded(e):
+            logger.warning(f"Message sending rejected: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests are waiting for the model, try again later"
+            )
         logger.error(f"Message sending failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -211,22 +211,17 @@ async def process_document_background(
 
                 # Generate embeddings for chunks
                 chunk_texts = [chunk.text for chunk in chunks]
-                embeddings = embedding_service.generate_embeddings_batch(
+                indices, valid_embeddings = embedding_service.generate_embeddings_batch(
                     texts=chunk_texts,
-                    batch_size=10
+                    persist=True
                 )
 
-                # Filter out empty embeddings
-                valid_data = [
-                    (text, emb, chunk)
-                    for text, emb, chunk in zip(chunk_texts, embeddings, chunks)
-                    if emb  # Only include non-empty embeddings
-                ]
-
-                if not valid_data:
+                # Empty chunks are skipped; indices map matrix rows back to chunks
+                if not len(indices):
                     raise DocumentProcessingError("No valid embeddings generated")
 
-                valid_texts, valid_embeddings, valid_chunks = zip(*valid_data)
+                valid_texts = [chunk_texts[i] for i in indices]
+                valid_chunks = [chunks[i] for i in indices]
 
                 # Notify progress after embeddings
                 await notify_document_processing(project_id, document_id, 'processing', 60)
@@ -252,8 +247,8 @@ async def process_document_background(
                 # Store in vector database
                 success = vector_store.add_documents(
                     project_id=project_id,
-                    documents=list(valid_texts),
-                    embeddings=list(valid_embeddings),
+                    documents=valid_texts,
+                    embeddings=valid_embeddings,
                     metadatas=metadatas,
                     ids=chunk_ids
                 )
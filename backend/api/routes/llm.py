@@ -4,17 +4,20 @@ LLM API routes for model management and inference.
 Endpoints for:
 - Listing available models
 - Getting model information
-- Testing model generation
+- Testing model generation (blocking and SSE streaming)
 - Model switching
 - Health checks
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import logging
+import orjson
 
-from core.llm import ollama_client, OllamaClientError
+from core.llm import get_ollama_client, OllamaClientError, OllamaOverloadedError, MAX_TEMPERATURE
+from core.cache import response_cache, INSTALLED_MODELS_KEY, POPULAR_MODELS_KEY
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +55,9 @@ class GenerateRequest(BaseModel):
     prompt: str = Field(..., description="The prompt to generate from")
     model: Optional[str] = Field(None, description="Model to use (optional)")
     system: Optional[str] = Field(None, description="System prompt (optional)")
-    temperature: float = Field(0.7, ge=0.0, le=1.0, description="Temperature for sampling")
+    temperature: float = Field(
+        0.7, ge=0.0, le=MAX_TEMPERATURE, description="Temperature for sampling"
+    )
     max_tokens: Optional[int] = Field(None, ge=1, description="Maximum tokens to generate")
 
 
@@ -83,19 +88,19 @@ async def get_llm_status():
     Returns connection status, host, and default model.
     """
     try:
-        is_connected = await ollama_client.check_connection()
+        is_connected = await get_ollama_client().check_connection()
         return StatusResponse(
             connected=is_connected,
-            host=ollama_client.host,
-            default_model=ollama_client.default_model,
+            host=get_ollama_client().host,
+            default_model=get_ollama_client().default_model,
             message="Connected to Ollama" if is_connected else "Cannot connect to Ollama"
         )
     except Exception as e:
         logger.error(f"Error checking LLM status: {str(e)}")
         return StatusResponse(
             connected=False,
-            host=ollama_client.host,
-            default_model=ollama_client.default_model,
+            host=get_ollama_client().host,
+            default_model=get_ollama_client().default_model,
             message=f"Error: {str(e)}"
         )
 
@@ -108,7 +113,7 @@ async def list_models():
     Returns a list of models with their metadata.
     """
     try:
-        models_data = await ollama_client.list_models()
+        models_data = await get_ollama_client().list_models()
 
         # Transform model data to ModelInfo format
         models = []
@@ -124,7 +129,7 @@ async def list_models():
         return ModelsListResponse(
             models=models,
             count=len(models),
-            default_model=ollama_client.default_model
+            default_model=get_ollama_client().default_model
         )
 
     except OllamaClientError as e:
@@ -153,7 +158,7 @@ async def get_model_info(model_name: str):
         Detailed model information
     """
     try:
-        model_info = await ollama_client.get_model_info(model_name)
+        model_info = await get_ollama_client().get_model_info(model_name)
 
         return ModelDetailsResponse(
             name=model_name,
@@ -175,7 +180,7 @@ async def get_model_info(model_name: str):
 
 
 @router.post("/generate", response_model=GenerateResponse)
-async def generate_text(request: GenerateRequest):
+async def generate_text(request: GenerateRequest, http_request: Request):
     """
     Generate text from a prompt (non-streaming).
 
@@ -184,6 +189,7 @@ async def generate_text(request: GenerateRequest):
 
     Args:
         request: Generation request with prompt and parameters
+        http_request: Incoming HTTP request (its client is the scheduling key)
 
     Returns:
         Generated text response
@@ -191,19 +197,26 @@ async def generate_text(request: GenerateRequest):
     try:
         logger.info(f"Generating text with prompt length: {len(request.prompt)}")
 
-        response_text = await ollama_client.generate(
+        response_text = await get_ollama_client().generate(
             prompt=request.prompt,
             model=request.model,
             system=request.system,
             temperature=request.temperature,
-            max_tokens=request.max_tokens
+            max_tokens=request.max_tokens,
+            user_id=http_request.client.host if http_request.client else "default_user"
         )
 
         return GenerateResponse(
             response=response_text,
-            model=request.model or ollama_client.default_model
+            model=request.model or get_ollama_client().default_model
         )
 
+    except OllamaOverloadedError as e:
+        logger.warning(f"Generation rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e)
+        )
     except OllamaClientError as e:
         logger.error(f"Generation failed: {str(e)}")
         raise HTTPException(
@@ -218,6 +231,52 @@ async def generate_text(request: GenerateRequest):
         )
 
 
+@router.post("/generate/stream")
+async def generate_text_stream(
+    request: GenerateRequest,
+    http_request: Request
+) -> StreamingResponse:
+    """
+    Generate text from a prompt, streamed as Server-Sent Events.
+
+    Each event's data is a JSON string holding the next piece of text. An
+    error event is sent if generation fails mid-stream.
+
+    Args:
+        request: Generation request with prompt and parameters
+        http_request: Incoming HTTP request (its client is the scheduling key)
+
+    Returns:
+        text/event-stream response
+    """
+    logger.info(f"Streaming text with prompt length: {len(request.prompt)}")
+    user_id = http_request.client.host if http_request.client else "default_user"
+
+    async def event_generator():
+        try:
+            async for frame in get_ollama_client().generate_stream_sse(
+                prompt=request.prompt,
+                model=request.model,
+                system=request.system,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                user_id=user_id
+            ):
+                yield frame
+        except OllamaClientError as e:
+            logger.error(f"Streaming generation failed: {str(e)}")
+            yield b"event: error\ndata: " + orjson.dumps(str(e)) + b"\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
+
+
 @router.post("/model/switch")
 async def switch_model(request: ModelSwitchRequest):
     """
@@ -231,7 +290,7 @@ async def switch_model(request: ModelSwitchRequest):
     """
     try:
         # Verify model exists
-        models = await ollama_client.list_models()
+        models = await get_ollama_client().list_models()
         model_names = [model.get('name', '') for model in models]
 
         if request.model not in model_names:
@@ -241,11 +300,12 @@ async def switch_model(request: ModelSwitchRequest):
             )
 
         # Switch model
-        ollama_client.switch_model(request.model)
+        get_ollama_client().switch_model(request.model)
+        response_cache.delete(INSTALLED_MODELS_KEY)
 
         return {
             "message": f"Successfully switched to model: {request.model}",
-            "default_model": ollama_client.default_model
+            "default_model": get_ollama_client().default_model
         }
 
     except HTTPException:
@@ -272,7 +332,8 @@ async def pull_model(model_name: str):
     try:
         logger.info(f"Attempting to pull model: {model_name}")
 
-        success = await ollama_client.pull_model(model_name)
+        success = await get_ollama_client().pull_model_blocking(model_name)
+        response_cache.delete(INSTALLED_MODELS_KEY, POPULAR_MODELS_KEY)
 
         if success:
             return {
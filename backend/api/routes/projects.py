@@ -11,23 +11,33 @@ This module provides REST API endpoints for project management:
 
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from pydantic import BaseModel, Field
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import etag_response
 from core.database import get_db
 from services.project_service import project_service, ProjectServiceError
 from models.base import format_datetime
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/projects", tags=["projects"])
+router = APIRouter(
+    prefix="/api/projects",
+    tags=["projects"],
+    default_response_class=ORJSONResponse
+)
 
 
 # Pydantic models for request/response
 
 class ProjectCreate(BaseModel):
     """Request model for creating a project."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     name: str = Field(..., min_length=1, max_length=255, description="Project name")
     description: Optional[str] = Field(None, description="Project description")
     folder_path: Optional[str] = Field(None, description="Path to project folder")
@@ -36,6 +46,8 @@ class ProjectCreate(BaseModel):
 
 class ProjectUpdate(BaseModel):
     """Request model for updating a project."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
     folder_path: Optional[str] = None
@@ -96,13 +108,45 @@ class ProjectSwitchResponse(BaseModel):
     current_project: dict
 
 
+def project_to_dict(project) -> dict:
+    """
+    Convert a Project model to a JSON-ready dict matching ProjectResponse.
+
+    Project endpoints return this dict wrapped in an ORJSONResponse, so the
+    already-trusted DB data skips pydantic construction and re-validation.
+    ProjectResponse is only referenced in the route `responses` for the schema.
+
+    Args:
+        project: Project model instance
+
+    Returns:
+        Dict with the ProjectResponse fields
+    """
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "chroma_collection_name": project.chroma_collection_name,
+        "document_count": project.document_count,
+        "chat_count": project.chat_count,
+        "total_chunks": project.total_chunks,
+        "settings": project.settings,
+        "created_at": format_datetime(project.created_at),
+        "updated_at": format_datetime(project.updated_at),
+    }
+
+
 # API Endpoints
 
-@router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": ProjectResponse}}
+)
 async def create_project(
     project_data: ProjectCreate,
     db: AsyncSession = Depends(get_db)
-):
+) -> Response:
     """
     Create a new project.
 
@@ -125,40 +169,32 @@ async def create_project(
             settings_dict=project_data.settings
         )
 
-        return ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            chroma_collection_name=project.chroma_collection_name,
-            document_count=project.document_count,
-            chat_count=project.chat_count,
-            total_chunks=project.total_chunks,
-            settings=project.settings,
-            created_at=format_datetime(project.created_at),
-            updated_at=format_datetime(project.updated_at)
+        return ORJSONResponse(
+            content=project_to_dict(project),
+            status_code=status.HTTP_201_CREATED
         )
 
     except ProjectServiceError as e:
-        logger.error(f"Failed to create project: {str(e)}")
+        logger.error("Failed to create project: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error creating project: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error creating project")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create project"
         )
 
 
-@router.get("/", response_model=List[ProjectResponse])
+@router.get("/", responses={status.HTTP_200_OK: {"model": List[ProjectResponse]}})
 async def list_projects(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
     include_deleted: bool = Query(False, description="Include soft-deleted projects"),
     db: AsyncSession = Depends(get_db)
-):
+) -> Response:
     """
     List all projects.
 
@@ -172,47 +208,38 @@ async def list_projects(
         List of projects
     """
     try:
-        projects = await project_service.list_projects(
+        projects = await project_service.list_project_summaries(
             db=db,
             skip=skip,
             limit=limit,
             include_deleted=include_deleted
         )
 
-        return [
-            ProjectResponse(
-                id=project.id,
-                name=project.name,
-                description=project.description,
-                chroma_collection_name=project.chroma_collection_name,
-                document_count=project.document_count,
-                chat_count=project.chat_count,
-                total_chunks=project.total_chunks,
-                settings=project.settings,
-                created_at=format_datetime(project.created_at),
-                updated_at=format_datetime(project.updated_at)
-            )
-            for project in projects
-        ]
+        # Rows are already plain dicts: a single orjson pass encodes the list
+        return ORJSONResponse(content=projects)
 
-    except Exception as e:
-        logger.error(f"Failed to list projects: {str(e)}")
+    except Exception:
+        logger.exception("Failed to list projects")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to list projects"
         )
 
 
-@router.get("/{project_id}", response_model=ProjectResponse)
+@router.get("/{project_id}", responses={status.HTTP_200_OK: {"model": ProjectResponse}})
 async def get_project(
     project_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
-):
+) -> Response:
     """
     Get a project by ID.
 
+    The response carries an ETag; a matching If-None-Match gets an empty 304.
+
     Args:
         project_id: Project ID
+        request: Incoming request (for If-None-Match)
         db: Database session
 
     Returns:
@@ -230,35 +257,24 @@ async def get_project(
                 detail=f"Project {project_id} not found"
             )
 
-        return ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            chroma_collection_name=project.chroma_collection_name,
-            document_count=project.document_count,
-            chat_count=project.chat_count,
-            total_chunks=project.total_chunks,
-            settings=project.settings,
-            created_at=format_datetime(project.created_at),
-            updated_at=format_datetime(project.updated_at)
-        )
+        return etag_response(request, orjson.dumps(project_to_dict(project)))
 
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error(f"Failed to get project: {str(e)}")
+    except Exception:
+        logger.exception("Failed to get project")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get project"
         )
 
 
-@router.put("/{project_id}", response_model=ProjectResponse)
+@router.put("/{project_id}", responses={status.HTTP_200_OK: {"model": ProjectResponse}})
 async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
     db: AsyncSession = Depends(get_db)
-):
+) -> Response:
     """
     Update a project.
 
@@ -289,29 +305,18 @@ async def update_project(
                 detail=f"Project {project_id} not found"
             )
 
-        return ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            chroma_collection_name=project.chroma_collection_name,
-            document_count=project.document_count,
-            chat_count=project.chat_count,
-            total_chunks=project.total_chunks,
-            settings=project.settings,
-            created_at=format_datetime(project.created_at),
-            updated_at=format_datetime(project.updated_at)
-        )
+        return ORJSONResponse(content=project_to_dict(project))
 
     except HTTPException:
         raise
     except ProjectServiceError as e:
-        logger.error(f"Failed to update project: {str(e)}")
+        logger.error("Failed to update project: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error updating project: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error updating project")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update project"
@@ -351,20 +356,24 @@ async def delete_project(
     except HTTPException:
         raise
     except ProjectServiceError as e:
-        logger.error(f"Failed to delete project: {str(e)}")
+        logger.error("Failed to delete project: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error deleting project: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error deleting project")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete project"
         )
 
 
-@router.post("/{project_id}/open-folder", response_model=FolderOpenResponse)
+@router.post(
+    "/{project_id}/open-folder",
+    response_model=FolderOpenResponse,
+    response_model_exclude_unset=True
+)
 async def open_project_folder(
     project_id: int,
     folder_path: str = Query(..., description="Path to folder to open"),
@@ -394,16 +403,16 @@ async def open_project_folder(
             folder_path=folder_path
         )
 
-        return FolderOpenResponse(**result)
+        return FolderOpenResponse.model_construct(**result)
 
     except ProjectServiceError as e:
-        logger.error(f"Failed to open project folder: {str(e)}")
+        logger.error("Failed to open project folder: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error opening project folder: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error opening project folder")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to open project folder"
@@ -433,15 +442,19 @@ async def get_project_folder(
             "folder_path": folder_path
         }
 
-    except Exception as e:
-        logger.error(f"Failed to get project folder: {str(e)}")
+    except Exception:
+        logger.exception("Failed to get project folder")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get project folder"
         )
 
 
-@router.get("/{project_id}/statistics", response_model=ProjectStatistics)
+@router.get(
+    "/{project_id}/statistics",
+    response_model=ProjectStatistics,
+    response_model_exclude_unset=True
+)
 async def get_project_statistics(
     project_id: int,
     db: AsyncSession = Depends(get_db)
@@ -462,23 +475,27 @@ async def get_project_statistics(
     try:
         stats = await project_service.get_project_statistics(db, project_id)
 
-        return ProjectStatistics(**stats)
+        return ProjectStatistics.model_construct(**stats)
 
     except ProjectServiceError as e:
-        logger.error(f"Failed to get project statistics: {str(e)}")
+        logger.error("Failed to get project statistics: %s", e)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error getting project statistics: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error getting project statistics")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get project statistics"
         )
 
 
-@router.post("/{project_id}/export", response_model=ProjectExportResponse)
+@router.post(
+    "/{project_id}/export",
+    response_model=ProjectExportResponse,
+    response_model_exclude_unset=True
+)
 async def export_project(
     project_id: int,
     export_path: str = Query(..., description="Path where to save the export"),
@@ -511,28 +528,32 @@ async def export_project(
             include_chats=include_chats
         )
 
-        return ProjectExportResponse(**result)
+        return ProjectExportResponse.model_construct(**result)
 
     except ProjectServiceError as e:
-        logger.error(f"Failed to export project: {str(e)}")
+        logger.error("Failed to export project: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error exporting project: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error exporting project")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to export project"
         )
 
 
-@router.post("/import", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/import",
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": ProjectResponse}}
+)
 async def import_project(
     import_path: str = Query(..., description="Path to the export file"),
     new_name: Optional[str] = Query(None, description="Optional new name for imported project"),
     db: AsyncSession = Depends(get_db)
-):
+) -> Response:
     """
     Import a project from an export file.
 
@@ -554,34 +575,30 @@ async def import_project(
             new_name=new_name
         )
 
-        return ProjectResponse(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            chroma_collection_name=project.chroma_collection_name,
-            document_count=project.document_count,
-            chat_count=project.chat_count,
-            total_chunks=project.total_chunks,
-            settings=project.settings,
-            created_at=format_datetime(project.created_at),
-            updated_at=format_datetime(project.updated_at)
+        return ORJSONResponse(
+            content=project_to_dict(project),
+            status_code=status.HTTP_201_CREATED
         )
 
     except ProjectServiceError as e:
-        logger.error(f"Failed to import project: {str(e)}")
+        logger.error("Failed to import project: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error importing project: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error importing project")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to import project"
         )
 
 
-@router.post("/switch", response_model=ProjectSwitchResponse)
+@router.post(
+    "/switch",
+    response_model=ProjectSwitchResponse,
+    response_model_exclude_unset=True
+)
 async def switch_project_context(
     from_project_id: int = Query(..., description="Current project ID"),
     to_project_id: int = Query(..., description="Target project ID"),
@@ -610,16 +627,16 @@ async def switch_project_context(
             to_project_id=to_project_id
         )
 
-        return ProjectSwitchResponse(**result)
+        return ProjectSwitchResponse.model_construct(**result)
 
     except ProjectServiceError as e:
-        logger.error(f"Failed to switch project context: {str(e)}")
+        logger.error("Failed to switch project context: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
-    except Exception as e:
-        logger.error(f"Unexpected error switching project context: {str(e)}")
+    except Exception:
+        logger.exception("Unexpected error switching project context")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to switch project context"
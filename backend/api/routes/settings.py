@@ -6,14 +6,25 @@ This module provides REST API endpoints for system settings management:
 - Update model configuration (LLM and embedding)
 - List installed models
 - Get popular models
-- Pull/install models
+- Pull/install models (background jobs with SSE progress)
 """
 import logging
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from pydantic import BaseModel, Field
+
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import (
+    response_cache,
+    etag_response,
+    SETTINGS_KEY,
+    INSTALLED_MODELS_KEY,
+    POPULAR_MODELS_KEY,
+)
+from core.config import settings as app_settings
 from core.database import get_db
 from services.settings_service import settings_service
 
@@ -39,6 +50,8 @@ class SettingsResponse(BaseModel):
 
 class ModelUpdateRequest(BaseModel):
     """Request model for updating models."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     llm_model: Optional[str] = Field(None, description="LLM model name")
     embedding_model: Optional[str] = Field(None, description="Embedding model name")
 
@@ -72,20 +85,17 @@ class PopularModelsResponse(BaseModel):
     embedding_models: List[PopularModel]
 
 
-class ModelPullRequest(BaseModel):
-    """Request model for pulling a model."""
-    model_name: str = Field(..., min_length=1, description="Name of model to pull")
-
-
-class ModelPullResponse(BaseModel):
-    """Response model for model pull operation."""
-    success: bool
+class ModelPullJobResponse(BaseModel):
+    """Response model for a started model pull job."""
+    job_id: str
     model_name: str
-    message: str
+    status: str
 
 
 class SearchModelRequest(BaseModel):
     """Request model for searching models."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     query: str = Field(..., min_length=1, description="Search query")
     model_type: Optional[str] = Field(None, description="Filter by type: 'llm' or 'embedding'")
 
@@ -100,38 +110,69 @@ class SearchResultModel(BaseModel):
     featured: Optional[bool] = False
 
 
+# Validates and serializes a whole result list in one pydantic-core call
+search_results_adapter = TypeAdapter(List[SearchResultModel])
+
+
+def settings_to_dict(settings) -> Dict[str, Any]:
+    """
+    Convert a UserSettings model to a dict matching SettingsResponse.
+
+    Args:
+        settings: UserSettings model instance
+
+    Returns:
+        Dict with the SettingsResponse fields
+    """
+    return {
+        "default_llm_model": settings.default_llm_model,
+        "default_embedding_model": settings.default_embedding_model,
+        "default_chunk_size": settings.default_chunk_size,
+        "default_chunk_overlap": settings.default_chunk_overlap,
+        "default_retrieval_k": settings.default_retrieval_k,
+        "theme": settings.theme,
+    }
+
+
 # API Endpoints
 
-@router.get("", response_model=SettingsResponse)
+@router.get("", responses={status.HTTP_200_OK: {"model": SettingsResponse}})
 async def get_settings(
+    request: Request,
     db: AsyncSession = Depends(get_db)
-) -> SettingsResponse:
+) -> Response:
     """
     Get current system settings.
 
     Returns the current configuration including model selections and RAG settings.
+    The serialized payload is cached until the models are updated or the TTL expires,
+    and clients sending a matching If-None-Match get an empty 304.
     """
+    cached = response_cache.get(SETTINGS_KEY)
+    if cached:
+        return etag_response(request, cached.body, cached.etag)
+
     try:
+        generation = response_cache.generation(SETTINGS_KEY)
         settings = await settings_service.get_settings(db)
 
-        return SettingsResponse(
-            default_llm_model=settings.default_llm_model,
-            default_embedding_model=settings.default_embedding_model,
-            default_chunk_size=settings.default_chunk_size,
-            default_chunk_overlap=settings.default_chunk_overlap,
-            default_retrieval_k=settings.default_retrieval_k,
-            theme=settings.theme
+        entry = response_cache.set(
+            SETTINGS_KEY,
+            orjson.dumps(settings_to_dict(settings)),
+            ttl=app_settings.SETTINGS_CACHE_TTL,
+            generation=generation
         )
+        return etag_response(request, entry.body, entry.etag)
 
     except Exception as e:
-        logger.error(f"Failed to get settings: {e}")
+        logger.exception("Failed to get settings")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get settings: {str(e)}"
         )
 
 
-@router.put("/models", response_model=SettingsResponse)
+@router.put("/models", response_model=SettingsResponse, response_model_exclude_unset=True)
 async def update_models(
     request: ModelUpdateRequest,
     db: AsyncSession = Depends(get_db)
@@ -159,25 +200,20 @@ async def update_models(
         )
 
     try:
-        # Update LLM model if provided
-        if request.llm_model:
-            settings = await settings_service.update_llm_model(db, request.llm_model)
-
-        # Update embedding model if provided
-        if request.embedding_model:
-            settings = await settings_service.update_embedding_model(db, request.embedding_model)
-
-        # Get final settings
-        settings = await settings_service.get_settings(db)
+        # Cached settings and current model selections are stale after this point
+        response_cache.delete(SETTINGS_KEY, INSTALLED_MODELS_KEY)
+
+        try:
+            settings = await settings_service.update_models(
+                db,
+                llm_model=request.llm_model,
+                embedding_model=request.embedding_model
+            )
+        finally:
+            # A concurrent read may have re-cached the old values during the update
+            response_cache.delete(SETTINGS_KEY, INSTALLED_MODELS_KEY)
 
-        return SettingsResponse(
-            default_llm_model=settings.default_llm_model,
-            default_embedding_model=settings.default_embedding_model,
-            default_chunk_size=settings.default_chunk_size,
-            default_chunk_overlap=settings.default_chunk_overlap,
-            default_retrieval_k=settings.default_retrieval_k,
-            theme=settings.theme
-        )
+        return SettingsResponse(**settings_to_dict(settings))
 
     except ValueError as e:
         # Model not installed
@@ -187,116 +223,170 @@ async def update_models(
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Failed to update models: {e}")
+        logger.exception("Failed to update models")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update models: {str(e)}"
         )
 
 
-@router.get("/models/installed", response_model=InstalledModelsResponse)
-async def get_installed_models() -> InstalledModelsResponse:
+@router.get(
+    "/models/installed",
+    responses={status.HTTP_200_OK: {"model": InstalledModelsResponse}}
+)
+async def get_installed_models(request: Request) -> Response:
     """
     Get all installed models categorized by type.
 
     Returns models organized into LLM and embedding categories based on model names.
+    The service already shapes each entry as a ModelInfo dict, so the payload is
+    encoded straight to JSON instead of building a pydantic model per entry.
+    Listing models through Ollama is slow, so the payload is cached briefly.
 
     Returns:
         Installed models with current model selections
     """
+    cached = response_cache.get(INSTALLED_MODELS_KEY)
+    if cached:
+        return etag_response(request, cached.body, cached.etag)
+
     try:
+        generation = response_cache.generation(INSTALLED_MODELS_KEY)
         models = await settings_service.get_installed_models()
 
-        return InstalledModelsResponse(
-            llm_models=[ModelInfo(**model) for model in models["llm_models"]],
-            embedding_models=[ModelInfo(**model) for model in models["embedding_models"]],
-            current_llm=models["current_llm"],
-            current_embedding=models["current_embedding"]
+        entry = response_cache.set(
+            INSTALLED_MODELS_KEY,
+            orjson.dumps(models),
+            ttl=app_settings.MODELS_CACHE_TTL,
+            generation=generation
         )
+        return etag_response(request, entry.body, entry.etag)
 
     except Exception as e:
-        import traceback
-        logger.error(f"Failed to get installed models: {e}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Failed to get installed models")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get installed models: {str(e)}"
         )
 
 
-@router.get("/models/popular", response_model=PopularModelsResponse)
-async def get_popular_models() -> PopularModelsResponse:
+@router.get(
+    "/models/popular",
+    responses={status.HTTP_200_OK: {"model": PopularModelsResponse}}
+)
+async def get_popular_models(request: Request) -> Response:
     """
     Get popular models available for installation.
 
     Returns a curated list of recommended models with installation status.
+    The installation status comes from Ollama, so the payload is cached briefly
+    and served with an ETag.
 
     Returns:
         Popular models with installation status
     """
+    cached = response_cache.get(POPULAR_MODELS_KEY)
+    if cached:
+        return etag_response(request, cached.body, cached.etag)
+
     try:
+        generation = response_cache.generation(POPULAR_MODELS_KEY)
         models = await settings_service.get_popular_models()
 
-        return PopularModelsResponse(
-            llm_models=[PopularModel(**model) for model in models["llm_models"]],
-            embedding_models=[PopularModel(**model) for model in models["embedding_models"]]
+        entry = response_cache.set(
+            POPULAR_MODELS_KEY,
+            orjson.dumps(models),
+            ttl=app_settings.MODELS_CACHE_TTL,
+            generation=generation
         )
+        return etag_response(request, entry.body, entry.etag)
 
     except Exception as e:
-        logger.error(f"Failed to get popular models: {e}")
+        logger.exception("Failed to get popular models")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get popular models: {str(e)}"
         )
 
 
-@router.post("/models/pull", response_model=ModelPullResponse)
-async def pull_model(request: ModelPullRequest) -> ModelPullResponse:
+@router.post(
+    "/models/pull",
+    response_model=ModelPullJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def pull_model(
+    model_name: str = Body(..., embed=True, min_length=1, description="Name of model to pull")
+) -> ModelPullJobResponse:
     """
-    Pull/download a model from Ollama library.
+    Start pulling/downloading a model from Ollama library.
 
-    Downloads the specified model from Ollama's model library.
-    This may take several minutes depending on model size and network speed.
+    The download runs in the background since it may take several minutes
+    depending on model size and network speed. Follow its progress via
+    GET /models/pull/{job_id}/events.
 
     Args:
-        request: Model pull request with model_name
+        model_name: Name of model to pull ({"model_name": ...} request body)
 
     Returns:
-        Result of the pull operation
+        The started (or already running) pull job
+    """
+    job = settings_service.start_pull(model_name)
 
-    Raises:
-        500: If pull fails
+    return ModelPullJobResponse(
+        job_id=job.job_id,
+        model_name=job.model_name,
+        status=job.status
+    )
+
+
+@router.get("/models/pull/{job_id}/events")
+async def pull_model_events(job_id: str) -> StreamingResponse:
     """
-    try:
-        success = await settings_service.pull_model(request.model_name)
+    Stream progress of a model pull job as Server-Sent Events.
 
-        if success:
-            return ModelPullResponse(
-                success=True,
-                model_name=request.model_name,
-                message=f"Successfully pulled model '{request.model_name}'"
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to pull model '{request.model_name}'"
-            )
+    Each event carries the job status ("queued", "downloading", "success" or
+    "failed"), the download percentage when known, and an error message on
+    failure. The stream ends once the job finishes.
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error pulling model '{request.model_name}': {e}")
+    Args:
+        job_id: Pull job identifier
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        404: If the job is unknown or expired
+    """
+    job = settings_service.get_pull_job(job_id)
+
+    if not job:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to pull model: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pull job '{job_id}' not found"
         )
 
+    async def event_generator():
+        async for event in settings_service.pull_job_events(job):
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
 
-@router.get("/models/search", response_model=List[SearchResultModel])
+
+@router.get(
+    "/models/search",
+    responses={status.HTTP_200_OK: {"model": List[SearchResultModel]}}
+)
 async def search_models(
     query: str = Query(..., min_length=1, description="Search query"),
     model_type: Optional[str] = Query(None, description="Filter by type: 'llm' or 'embedding'")
-) -> List[SearchResultModel]:
+) -> Response:
     """
     Search for models in Ollama library.
 
@@ -322,13 +412,15 @@ async def search_models(
     try:
         results = await settings_service.search_models(query, model_type)
 
-        return [
-            SearchResultModel(**result)
-            for result in results
-        ]
+        return Response(
+            content=search_results_adapter.dump_json(
+                search_results_adapter.validate_python(results)
+            ),
+            media_type="application/json"
+        )
 
     except Exception as e:
-        logger.error(f"Error searching models with query '{query}': {e}")
+        logger.exception("Error searching models with query '%s'", query)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to search models: {str(e)}"
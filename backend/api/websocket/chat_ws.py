@@ -10,29 +10,242 @@ This module provides WebSocket support for:
 
 import logging
 import asyncio
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+import orjson
 import socketio
 
 from services.chat_service import ChatService, ChatServiceError
-from core.database import get_db
+from core.config import settings
+from core.database import get_db_session
+from core.llm import is_overloaded
 from core.rag_pipeline import RAGPipeline
 
 logger = logging.getLogger(__name__)
 
+
+class _OrjsonSerializer:
+    """
+    json-module compatible wrapper around orjson for Socket.IO packets.
+
+    python-socketio/engineio call dumps(obj, separators=...) and expect a str;
+    orjson always emits compact output, so extra keyword arguments are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(data: Any, **kwargs) -> Any:
+        return orjson.loads(data)
+
+
+def _create_client_manager() -> Optional[socketio.AsyncManager]:
+    """
+    Create the Socket.IO client manager.
+
+    With REDIS_URL set, room broadcasts are relayed through Redis so every
+    worker process delivers them to its own clients. Otherwise the default
+    in-process manager is used.
+
+    Returns:
+        AsyncRedisManager, or None for the default manager
+    """
+    if not settings.REDIS_URL:
+        return None
+
+    logger.info("Using Redis message queue for Socket.IO broadcasts")
+    return socketio.AsyncRedisManager(settings.REDIS_URL)
+
+
 # Create Socket.IO async server
 sio = socketio.AsyncServer(
     async_mode='asgi',
+    client_manager=_create_client_manager(),
+    json=_OrjsonSerializer,
     cors_allowed_origins=[],  # Let FastAPI CORSMiddleware handle CORS
-    logger=True,
-    engineio_logger=True
+    # Compress long-polling payloads over 1KB (WebSocket frames use permessage-deflate)
+    http_compression=True,
+    compression_threshold=1024,
+    # Per-packet logging is costly on busy servers; only enable it in debug mode
+    logger=settings.DEBUG,
+    engineio_logger=settings.DEBUG
 )
 
+
+@dataclass(slots=True)
+class ConnectionState:
+    """Metadata tracked for each connected client."""
+    connected_at: float
+    project_id: Optional[int] = None
+    chat_id: Optional[int] = None
+    outbox: Optional[asyncio.Queue] = None
+    sender: Optional[asyncio.Task] = None
+    closed: bool = False
+
+
 # Store active connections and their metadata
-active_connections: Dict[str, Dict[str, Any]] = {}
+active_connections: Dict[str, ConnectionState] = {}
 
 # Initialize services
 chat_service = ChatService(rag_pipeline=RAGPipeline())
 
+# Token coalescing for streamed responses
+TOKEN_BATCH_SIZE = 16  # Flush after this many tokens
+TOKEN_BATCH_INTERVAL = 0.025  # Or after this many seconds (25ms)
+
+# Per-client outbound queue size (producers wait when a client falls behind)
+OUTBOX_MAX_SIZE = 256
+
+
+async def _sender_loop(sid: str, outbox: asyncio.Queue):
+    """
+    Deliver queued events to a single client in order.
+
+    Args:
+        sid: Socket session ID
+        outbox: Queue of (event, data) tuples for this client
+    """
+    while True:
+        event, data = await outbox.get()
+        try:
+            # The client is connected to this worker; no need to go through Redis
+            await sio.emit(event, data, room=sid, ignore_queue=True)
+        except Exception as e:
+            logger.error(f"Error sending {event} to {sid}: {e}")
+        finally:
+            outbox.task_done()
+
+
+def _drain(outbox: asyncio.Queue):
+    """
+    Discard queued events.
+
+    Every removed event frees a slot, which wakes a producer blocked on a
+    full queue.
+
+    Args:
+        outbox: Queue of (event, data) tuples for a client
+    """
+    while True:
+        try:
+            outbox.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        outbox.task_done()
+
+
+async def send_to_client(sid: str, event: str, data: Dict[str, Any]):
+    """
+    Queue an event for a client.
+
+    Events go through the client's outbound queue so handlers are not tied to
+    the socket's write speed; a full queue applies back-pressure. Events for
+    disconnected clients are dropped. Falls back to a direct emit for clients
+    without a queue.
+
+    Args:
+        sid: Socket session ID
+        event: Event name
+        data: Event data
+    """
+    state = active_connections.get(sid)
+    if state is None or state.closed:
+        logger.debug(f"Dropping {event} for disconnected client {sid}")
+        return
+
+    if state.outbox is None:
+        await sio.emit(event, data, room=sid, ignore_queue=True)
+        return
+
+    await state.outbox.put((event, data))
+
+    # The client disconnected while we waited for room; nothing will read the
+    # queue again, so empty it to release the next blocked producer
+    if state.closed or active_connections.get(sid) is not state:
+        _drain(state.outbox)
+
+
+class TokenBatcher:
+    """
+    Coalesce streamed tokens into fewer 'message_token' emits.
+
+    Tokens are buffered and flushed when the buffer reaches TOKEN_BATCH_SIZE
+    or TOKEN_BATCH_INTERVAL has passed since the first buffered token. Each
+    emit carries the joined text in 'token' (so existing clients keep working)
+    and the individual tokens in 'tokens'.
+    """
+
+    def __init__(
+        self,
+        sid: str,
+        chat_id: int,
+        max_tokens: int = TOKEN_BATCH_SIZE,
+        max_delay: float = TOKEN_BATCH_INTERVAL
+    ):
+        """
+        Initialize token batcher.
+
+        Args:
+            sid: Socket session ID to emit to
+            chat_id: Chat the tokens belong to
+            max_tokens: Flush threshold in tokens
+            max_delay: Flush threshold in seconds
+        """
+        self.sid = sid
+        self.chat_id = chat_id
+        self.max_tokens = max_tokens
+        self.max_delay = max_delay
+        self._buffer: List[str] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._pending: Optional[asyncio.Task] = None
+        # FIFO lock keeps batches in stream order
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "TokenBatcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
+
+    async def add(self, token: str) -> None:
+        """
+        Buffer a token, flushing if the batch is full.
+
+        Args:
+            token: Streamed text token
+        """
+        self._buffer.append(token)
+
+        if len(self._buffer) >= self.max_tokens:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        """Flush a partial batch once the time window has elapsed."""
+        self._timer = None
+        if self._buffer:
+            self._pending = asyncio.create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Emit all buffered tokens as a single event."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            tokens, self._buffer = self._buffer, []
+            await send_to_client(self.sid, 'message_token', {
+                'chat_id': self.chat_id,
+                'token': "".join(tokens),
+                'tokens': tokens
+            })
+
 
 @sio.event
 async def connect(sid: str, environ: Dict[str, Any], auth: Optional[Dict[str, Any]] = None):
@@ -57,15 +270,16 @@ async def connect(sid: str, environ: Dict[str, Any], auth: Optional[Dict[str, An
         #     logger.warning(f"Rejected connection from {sid}: No auth token")
         #     return False
 
-        # Store connection metadata
-        active_connections[sid] = {
-            'connected_at': asyncio.get_event_loop().time(),
-            'project_id': None,
-            'chat_id': None
-        }
+        # Store connection metadata and start the client's sender
+        outbox = asyncio.Queue(maxsize=OUTBOX_MAX_SIZE)
+        active_connections[sid] = ConnectionState(
+            connected_at=asyncio.get_running_loop().time(),
+            outbox=outbox,
+            sender=asyncio.create_task(_sender_loop(sid, outbox))
+        )
 
         logger.info(f"Client connected: {sid}")
-        await sio.emit('connection_status', {'status': 'connected'}, room=sid)
+        await send_to_client(sid, 'connection_status', {'status': 'connected'})
         return True
 
     except Exception as e:
@@ -86,8 +300,16 @@ async def disconnect(sid: str):
 
         # Clean up connection metadata
         if sid in active_connections:
-            connection_data = active_connections[sid]
-            project_id = connection_data.get('project_id')
+            state = active_connections[sid]
+            project_id = state.project_id
+
+            # Stop the sender; anything still queued is undeliverable, and
+            # emptying the queue wakes producers blocked on a full outbox
+            state.closed = True
+            if state.sender is not None:
+                state.sender.cancel()
+            if state.outbox is not None:
+                _drain(state.outbox)
 
             # Leave project room if joined
             if project_id:
@@ -115,14 +337,14 @@ async def join_project(sid: str, data: Dict[str, Any]):
         project_id = data.get('project_id')
 
         if not project_id:
-            await sio.emit('error', {
+            await send_to_client(sid, 'error', {
                 'message': 'project_id is required'
-            }, room=sid)
+            })
             return
 
         # Leave previous project room if any
         if sid in active_connections:
-            old_project_id = active_connections[sid].get('project_id')
+            old_project_id = active_connections[sid].project_id
             if old_project_id and old_project_id != project_id:
                 await sio.leave_room(sid, f"project_{old_project_id}")
 
@@ -131,19 +353,19 @@ async def join_project(sid: str, data: Dict[str, Any]):
 
         # Update connection metadata
         if sid in active_connections:
-            active_connections[sid]['project_id'] = project_id
+            active_connections[sid].project_id = project_id
 
         logger.info(f"Client {sid} joined project {project_id}")
-        await sio.emit('project_joined', {
+        await send_to_client(sid, 'project_joined', {
             'project_id': project_id,
             'status': 'success'
-        }, room=sid)
+        })
 
     except Exception as e:
         logger.error(f"Error joining project: {e}", exc_info=True)
-        await sio.emit('error', {
+        await send_to_client(sid, 'error', {
             'message': f'Failed to join project: {str(e)}'
-        }, room=sid)
+        })
 
 
 @sio.event
@@ -159,9 +381,9 @@ async def leave_project(sid: str, data: Dict[str, Any]):
         project_id = data.get('project_id')
 
         if not project_id:
-            await sio.emit('error', {
+            await send_to_client(sid, 'error', {
                 'message': 'project_id is required'
-            }, room=sid)
+            })
             return
 
         # Leave project room
@@ -169,19 +391,19 @@ async def leave_project(sid: str, data: Dict[str, Any]):
 
         # Update connection metadata
         if sid in active_connections:
-            active_connections[sid]['project_id'] = None
+            active_connections[sid].project_id = None
 
         logger.info(f"Client {sid} left project {project_id}")
-        await sio.emit('project_left', {
+        await send_to_client(sid, 'project_left', {
             'project_id': project_id,
             'status': 'success'
-        }, room=sid)
+        })
 
     except Exception as e:
         logger.error(f"Error leaving project: {e}", exc_info=True)
-        await sio.emit('error', {
+        await send_to_client(sid, 'error', {
             'message': f'Failed to leave project: {str(e)}'
-        }, room=sid)
+        })
 
 
 @sio.event
@@ -208,85 +430,90 @@ async def send_message(sid: str, data: Dict[str, Any]):
 
         # Validate required fields
         if not chat_id:
-            await sio.emit('error', {
+            await send_to_client(sid, 'error', {
                 'message': 'chat_id is required'
-            }, room=sid)
+            })
             return
 
         if not user_message:
-            await sio.emit('error', {
+            await send_to_client(sid, 'error', {
                 'message': 'message is required'
-            }, room=sid)
+            })
             return
 
         logger.info(f"Processing message for chat {chat_id} from client {sid}")
 
         # Update connection metadata
         if sid in active_connections:
-            active_connections[sid]['chat_id'] = chat_id
+            active_connections[sid].chat_id = chat_id
 
         # Emit message received acknowledgment
-        await sio.emit('message_received', {
+        await send_to_client(sid, 'message_received', {
             'chat_id': chat_id,
             'status': 'processing'
-        }, room=sid)
+        })
 
         # Get database session
-        async for db in get_db():
+        async with get_db_session() as db:
             try:
                 # Stream response using chat service
-                async for event in chat_service.send_message_stream(
-                    db=db,
-                    chat_id=chat_id,
-                    user_message=user_message,
-                    model=model,
-                    temperature=temperature,
-                    include_history=include_history
-                ):
-                    # Forward stream events to client
-                    event_type = event.get('type')
-
-                    if event_type == 'sources':
-                        # Send retrieved sources
-                        await sio.emit('message_sources', {
-                            'chat_id': chat_id,
-                            'sources': event['data']
-                        }, room=sid)
-
-                    elif event_type == 'token':
-                        # Stream text token
-                        await sio.emit('message_token', {
-                            'chat_id': chat_id,
-                            'token': event['data']
-                        }, room=sid)
-
-                    elif event_type == 'done':
-                        # Send completion signal
-                        await sio.emit('message_complete', {
-                            'chat_id': chat_id,
-                            'metadata': event['data']
-                        }, room=sid)
+                async with TokenBatcher(sid, chat_id) as batcher:
+                    async for event in chat_service.send_message_stream(
+                        db=db,
+                        chat_id=chat_id,
+                        user_message=user_message,
+                        model=model,
+                        temperature=temperature,
+                        include_history=include_history,
+                        # Each connection is scheduled as its own caller
+                        user_id=sid
+                    ):
+                        # Forward stream events to client
+                        event_type = event.get('type')
+
+                        if event_type == 'sources':
+                            # Send retrieved sources
+                            await send_to_client(sid, 'message_sources', {
+                                'chat_id': chat_id,
+                                'sources': event['data']
+                            })
+
+                        elif event_type == 'token':
+                            # Buffer text token (emitted in batches)
+                            await batcher.add(event['data'])
+
+                        elif event_type == 'done':
+                            # Deliver remaining tokens before completion signal
+                            await batcher.flush()
+                            await send_to_client(sid, 'message_complete', {
+                                'chat_id': chat_id,
+                                'metadata': event['data']
+                            })
 
                 logger.info(f"Successfully streamed response for chat {chat_id}")
 
             except ChatServiceError as e:
+                if is_overloaded(e):
+                    logger.warning(f"Message for chat {chat_id} rejected: {e}")
+                    await send_to_client(sid, 'error', {
+                        'message': 'Too many requests are waiting for the model, try again later',
+                        'code': 'overloaded',
+                        'chat_id': chat_id
+                    })
+                    return
+
                 logger.error(f"Chat service error: {e}", exc_info=True)
-                await sio.emit('error', {
+                await send_to_client(sid, 'error', {
                     'message': f'Chat error: {str(e)}',
                     'chat_id': chat_id
-                }, room=sid)
-
-            finally:
-                # Close database session
-                await db.close()
-                break
+                })
 
     except Exception as e:
         logger.error(f"Error processing message: {e}", exc_info=True)
-        await sio.emit('error', {
+        await send_to_client(sid, 'error', {
             'message': f'Failed to process message: {str(e)}',
             'chat_id': data.get('chat_id')
-        }, room=sid)
+        })
 
 
 @sio.event
@@ -298,9 +525,9 @@ async def ping(sid: str, data: Optional[Dict[str, Any]] = None):
         sid: Socket session ID
         data: Optional ping data
     """
-    await sio.emit('pong', {
-        'timestamp': asyncio.get_event_loop().time()
-    }, room=sid)
+    await send_to_client(sid, 'pong', {
+        'timestamp': asyncio.get_running_loop().time()
+    })
 
 
 # Utility functions for broadcasting updates
@@ -309,6 +536,10 @@ async def broadcast_to_project(project_id: int, event: str, data: Dict[str, Any]
     """
     Broadcast an event to all clients in a project room.
 
+    The Socket.IO manager encodes the packet once and sends it to every
+    participant concurrently (one task per client), so a single room emit
+    already fans out without per-client serialization or sequential awaits.
+
     Args:
         project_id: Project ID
         event: Event name
@@ -0,0 +1,190 @@
+"""
+In-process response cache.
+
+This module provides:
+- A small TTL cache for pre-serialized JSON response bodies
+- Cache keys for near-static endpoints (settings, installed models)
+- Explicit invalidation hooks for write paths
+- ETag / If-None-Match handling for JSON responses
+"""
+
+import time
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+logger = logging.getLogger(__name__)
+
+
+# Cache keys
+SETTINGS_KEY = "settings:global"
+INSTALLED_MODELS_KEY = "models:installed"
+POPULAR_MODELS_KEY = "models:popular"
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Compute a strong ETag for a response body.
+
+    Args:
+        body: Serialized response body
+
+    Returns:
+        Quoted ETag value
+    """
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    The header is a comma-separated list of entity tags, or "*". Matching uses
+    the weak comparison If-None-Match calls for, so a W/ prefix is ignored.
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Quoted ETag of the current response
+
+    Returns:
+        True if the client's copy is current
+    """
+    if if_none_match.strip() == "*":
+        return True
+
+    etag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_response(request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """
+    Build a JSON response, or an empty 304 if the client already has this body.
+
+    Args:
+        request: Incoming request (checked for If-None-Match)
+        body: Serialized JSON body
+        etag: Precomputed ETag (computed from body if omitted)
+
+    Returns:
+        304 Not Modified or 200 JSON response, both carrying the ETag header
+    """
+    etag = etag or make_etag(body)
+    headers = {"ETag": etag}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@dataclass
+class CachedResponse:
+    """A cached JSON response body with its ETag."""
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    TTL cache for serialized JSON payloads.
+
+    The application runs as a single local process, so entries live in memory
+    and are shared by every request handled by this worker.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries: Dict[str, CachedResponse] = {}
+        # Bumped by delete(), so a writer can tell its data went stale mid-fetch
+        self._generations: Dict[str, int] = {}
+
+    def generation(self, key: str) -> int:
+        """
+        Get the invalidation count of a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Number of times the key has been invalidated
+        """
+        return self._generations.get(key, 0)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Get a cached entry if it has not expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            CachedResponse or None on miss/expiry
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+
+        return entry
+
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        ttl: float,
+        generation: Optional[int] = None
+    ) -> CachedResponse:
+        """
+        Store a serialized payload.
+
+        Args:
+            key: Cache key
+            body: Serialized JSON body
+            ttl: Time to live in seconds
+            generation: Value of generation(key) read before the payload was
+                fetched; if the key was invalidated since, nothing is stored
+
+        Returns:
+            The new CachedResponse (not stored if the payload is stale)
+        """
+        entry = CachedResponse(
+            body=body,
+            etag=make_etag(body),
+            expires_at=time.monotonic() + ttl
+        )
+        if generation is None or generation == self.generation(key):
+            self._entries[key] = entry
+        return entry
+
+    def delete(self, *keys: str) -> None:
+        """
+        Invalidate one or more keys.
+
+        Args:
+            *keys: Cache keys to remove
+        """
+        for key in keys:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        for key in self._entries:
+            self._generations[key] = self._generations.get(key, 0) + 1
+        self._entries.clear()
+
+
+# Create global cache instance
+response_cache = ResponseCache()
@@ -9,8 +9,12 @@ This module provides:
 """
 
 import logging
+import os
 import re
-from typing import List, Optional, Dict, Any
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -20,6 +24,111 @@ from models.document import DocumentType
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numba
+    import numpy as np
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Threads used by tiktoken's batch encode/decode (runs in Rust without the GIL)
+TOKENIZER_THREADS = os.cpu_count() or 1
+
+# Shared tiktoken encodings, loaded once per process
+_ENCODING_CACHE: Dict[str, tiktoken.Encoding] = {}
+_ENCODING_LOCK = threading.Lock()
+
+
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """
+    Get a shared tiktoken encoding, loading it on first use.
+
+    Args:
+        encoding_name: Tiktoken encoding name
+
+    Returns:
+        Encoding shared by all chunkers in this process
+    """
+    encoding = _ENCODING_CACHE.get(encoding_name)
+    if encoding is None:
+        with _ENCODING_LOCK:
+            encoding = _ENCODING_CACHE.get(encoding_name)
+            if encoding is None:
+                encoding = tiktoken.get_encoding(encoding_name)
+                _ENCODING_CACHE[encoding_name] = encoding
+    return encoding
+
+
+def _group_segments(starts, ends, chunk_size: int, chunk_overlap: int):
+    """
+    Group consecutive text segments into chunks.
+
+    Segments are added to the current chunk until the next one would push it
+    past chunk_size. The next chunk then starts with the trailing segments
+    whose combined length fits within chunk_overlap.
+
+    Only integer offsets are handled here, so the same function runs as plain
+    Python or compiled with numba.
+
+    Args:
+        starts: Start offset of each segment
+        ends: End offset of each segment
+        chunk_size: Maximum summed segment length per chunk
+        chunk_overlap: Maximum summed segment length carried over
+
+    Returns:
+        List of (first, stop) segment index ranges, one per chunk
+    """
+    groups = []
+    first = 0
+    size = 0
+
+    for i in range(len(starts)):
+        segment_size = ends[i] - starts[i]
+
+        if size + segment_size > chunk_size and i > first:
+            groups.append((first, i))
+
+            # Carry over trailing segments that fit within the overlap
+            k = i
+            overlap_size = 0
+            while k > first and overlap_size + (ends[k - 1] - starts[k - 1]) <= chunk_overlap:
+                k -= 1
+                overlap_size += ends[k] - starts[k]
+
+            first = k
+            size = overlap_size
+
+        size += segment_size
+
+    if len(starts) > first:
+        groups.append((first, len(starts)))
+
+    return groups
+
+
+if NUMBA_AVAILABLE:
+    _group_segments_compiled = numba.njit(cache=True)(_group_segments)
+
+
+@lru_cache(maxsize=8)
+def _separator_pattern(separators: Tuple[str, ...]) -> Tuple[re.Pattern, Dict[str, int]]:
+    """
+    Compile a single alternation regex matching any of the separators.
+
+    Args:
+        separators: Separators in priority order ("" is ignored)
+
+    Returns:
+        Compiled pattern and a map from separator to its priority
+    """
+    ordered = [sep for sep in separators if sep]
+    priorities = {sep: i for i, sep in enumerate(ordered)}
+    # Longer separators first so "\n\n" is not matched as two "\n"
+    alternatives = sorted(ordered, key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(sep) for sep in alternatives))
+    return pattern, priorities
+
 
 class ChunkingStrategy(str, Enum):
     """Available chunking strategies."""
@@ -73,6 +182,9 @@ class TextChunker:
         ""       # Characters (last resort)
     ]
 
+    # Whitespace following sentence-ending punctuation
+    SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
     def __init__(
         self,
         chunk_size: int = 1000,
@@ -93,7 +205,7 @@ class TextChunker:
 
         # Initialize tiktoken encoder
         try:
-            self.tokenizer = tiktoken.get_encoding(encoding_name)
+            self.tokenizer = _get_encoding(encoding_name)
         except Exception as e:
             logger.warning(f"Failed to load tiktoken encoding {encoding_name}: {e}")
             self.tokenizer = None
@@ -108,6 +220,7 @@ class TextChunker:
         text: str,
         strategy: ChunkingStrategy = ChunkingStrategy.RECURSIVE,
         document_id: Optional[int] = None,
+        approx_tokens: bool = False,
         **kwargs
     ) -> List[TextChunk]:
         """
@@ -117,6 +230,8 @@ class TextChunker:
             text: Text to chunk
             strategy: Chunking strategy to use
             document_id: Optional document ID for metadata
+            approx_tokens: Estimate token counts (~4 characters per token)
+                instead of encoding each chunk with tiktoken
             **kwargs: Additional parameters for specific strategies
 
         Returns:
@@ -128,6 +243,19 @@ class TextChunker:
         if not text.strip():
             return []
 
+        # Fast path: text that fits in one chunk comes back unchanged from every
+        # character-based strategy (token-based sizes come from max_tokens instead)
+        if len(text) <= self.chunk_size and strategy != ChunkingStrategy.TOKEN_BASED:
+            token_count = self._count_tokens([text], approx_tokens)[0]
+            return [TextChunk(
+                text=text,
+                metadata=ChunkMetadata(
+                    chunk_index=0,
+                    document_id=document_id,
+                    token_count=token_count
+                )
+            )]
+
         logger.info(f"Chunking text of length {len(text)} using {strategy.value} strategy")
 
         # Route to appropriate chunking method
@@ -144,14 +272,11 @@ class TextChunker:
         else:
             raise ValueError(f"Unsupported chunking strategy: {strategy}")
 
+        token_counts = self._count_tokens(chunks, approx_tokens)
+
         # Add metadata to chunks
         result = []
-        for i, chunk_text in enumerate(chunks):
-            # Calculate token count if tokenizer available
-            token_count = None
-            if self.tokenizer:
-                token_count = len(self.tokenizer.encode(chunk_text))
-
+        for i, (chunk_text, token_count) in enumerate(zip(chunks, token_counts)):
             metadata = ChunkMetadata(
                 chunk_index=i,
                 document_id=document_id,
@@ -163,13 +288,40 @@ class TextChunker:
         logger.info(f"Created {len(result)} chunks")
         return result
 
+    def _count_tokens(self, chunks: List[str], approx: bool = False) -> List[Optional[int]]:
+        """
+        Count tokens for chunk metadata.
+
+        Args:
+            chunks: Chunk texts
+            approx: Use the 1 token ≈ 4 characters heuristic instead of tiktoken
+
+        Returns:
+            Token count per chunk (None if no tokenizer is available)
+        """
+        if approx:
+            return [max(1, len(chunk) >> 2) for chunk in chunks]
+
+        if not self.tokenizer or not chunks:
+            return [None] * len(chunks)
+
+        # One batched call instead of an encode per chunk
+        return [
+            len(tokens)
+            for tokens in self.tokenizer.encode_batch(chunks, num_threads=TOKENIZER_THREADS)
+        ]
+
     def _chunk_recursive(
         self,
         text: str,
         separators: Optional[List[str]] = None
     ) -> List[str]:
         """
-        Recursively split text using a hierarchy of separators.
+        Split text at the highest-priority separator that fits each chunk.
+
+        All separator positions are found in a single regex pass. Each chunk
+        then ends at the last break of the best separator (in priority order)
+        within chunk_size, falling back to a hard cut when none fits.
 
         Args:
             text: Text to split
@@ -178,76 +330,44 @@ class TextChunker:
         Returns:
             List of text chunks
         """
-        separators = separators or self.DEFAULT_SEPARATORS
-        chunks = []
-
-        def split_text(text: str, sep_index: int = 0) -> List[str]:
-            """Recursively split text."""
-            if len(text) <= self.chunk_size:
-                return [text] if text.strip() else []
-
-            if sep_index >= len(separators):
-                # No more separators, split by character
-                return self._chunk_fixed_size(text)
-
-            separator = separators[sep_index]
-
-            if separator == "":
-                # Character-level split (last resort)
-                return self._chunk_fixed_size(text)
-
-            # Split by current separator
-            splits = text.split(separator)
-
-            current_chunk = []
-            current_size = 0
-
-            result = []
-
-            for i, split in enumerate(splits):
-                split_size = len(split)
-
-                # Add separator back (except for last split)
-                if i < len(splits) - 1:
-                    split_size += len(separator)
+        separators = tuple(separators or self.DEFAULT_SEPARATORS)
+        pattern, priorities = _separator_pattern(separators)
 
-                # Check if adding this split would exceed chunk size
-                if current_size + split_size > self.chunk_size and current_chunk:
-                    # Save current chunk
-                    chunk_text = separator.join(current_chunk)
-                    if i < len(splits) - 1:
-                        chunk_text += separator
+        # Break offsets (just after each separator) grouped by priority
+        breaks: List[List[int]] = [[] for _ in range(len(priorities))]
+        for match in pattern.finditer(text):
+            breaks[priorities[match.group()]].append(match.end())
 
-                    result.append(chunk_text)
-
-                    # Start new chunk with overlap
-                    overlap_text = chunk_text[-self.chunk_overlap:] if self.chunk_overlap > 0 else ""
-                    current_chunk = [overlap_text] if overlap_text else []
-                    current_size = len(overlap_text)
+        size = self.chunk_size
+        overlap = self.chunk_overlap
+        text_length = len(text)
 
-                # Add split to current chunk
-                current_chunk.append(split)
-                current_size += split_size
+        chunks = []
+        start = 0
+        prev_end = 0  # End of the previous chunk; each chunk must extend past it
 
-            # Add remaining chunk
-            if current_chunk:
-                chunk_text = separator.join(current_chunk)
-                result.append(chunk_text)
+        while start < text_length:
+            limit = start + size
+            if limit >= text_length:
+                chunks.append(text[start:])
+                break
 
-            # Recursively split chunks that are too large
-            final_result = []
-            for chunk in result:
-                if len(chunk) > self.chunk_size:
-                    final_result.extend(split_text(chunk, sep_index + 1))
-                else:
-                    final_result.append(chunk)
+            # Last break inside (prev_end, limit] of the highest-priority separator
+            end = limit
+            for offsets in breaks:
+                i = bisect_right(offsets, limit) - 1
+                if i >= 0 and offsets[i] > prev_end:
+                    end = offsets[i]
+                    break
 
-            return final_result
+            chunks.append(text[start:end])
 
-        chunks = split_text(text)
+            # Start next chunk with overlap (without going backwards)
+            start = end - overlap if end - overlap > start else end
+            prev_end = end
 
         # Filter out empty chunks
-        return [chunk for chunk in chunks if chunk.strip()]
+        return [chunk for chunk in chunks if chunk and not chunk.isspace()]
 
     def _chunk_token_based(
         self,
@@ -275,20 +395,12 @@ class TextChunker:
         # Encode text to tokens
         tokens = self.tokenizer.encode(text)
 
-        chunks = []
-        start = 0
-
-        while start < len(tokens):
-            # Get chunk of tokens
-            end = start + max_tokens
-            chunk_tokens = tokens[start:end]
+        # Token windows, each starting `overlap_tokens` before the previous end
+        step = max(1, max_tokens - overlap_tokens)
+        windows = [tokens[start:start + max_tokens] for start in range(0, len(tokens), step)]
 
-            # Decode back to text
-            chunk_text = self.tokenizer.decode(chunk_tokens)
-            chunks.append(chunk_text)
-
-            # Move start position with overlap
-            start = end - overlap_tokens
+        # Decode all windows back to text in one batched call
+        chunks = self.tokenizer.decode_batch(windows, num_threads=TOKENIZER_THREADS)
 
         return [chunk for chunk in chunks if chunk.strip()]
 
@@ -302,47 +414,23 @@ class TextChunker:
         Returns:
             List of text chunks
         """
-        # Simple sentence splitting using regex
-        sentence_pattern = r'(?<=[.!?])\s+'
-        sentences = re.split(sentence_pattern, text)
-
-        chunks = []
-        current_chunk = []
-        current_size = 0
-
-        for sentence in sentences:
-            sentence_size = len(sentence)
-
-            if current_size + sentence_size > self.chunk_size and current_chunk:
-                # Save current chunk
-                chunks.append(" ".join(current_chunk))
-
-                # Start new chunk with overlap (last few sentences)
-                if self.chunk_overlap > 0:
-                    overlap_sentences = []
-                    overlap_size = 0
-
-                    for sent in reversed(current_chunk):
-                        if overlap_size + len(sent) <= self.chunk_overlap:
-                            overlap_sentences.insert(0, sent)
-                            overlap_size += len(sent)
-                        else:
-                            break
-
-                    current_chunk = overlap_sentences
-                    current_size = overlap_size
-                else:
-                    current_chunk = []
-                    current_size = 0
+        return self._chunk_segments(text, self._sentence_spans(text))
 
-            current_chunk.append(sentence)
-            current_size += sentence_size
+    def _sentence_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yield sentence boundaries without materializing the sentences.
 
-        # Add remaining chunk
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
+        Args:
+            text: Text to scan
 
-        return [chunk for chunk in chunks if chunk.strip()]
+        Yields:
+            (start, end) offsets of each sentence in text
+        """
+        start = 0
+        for match in self.SENTENCE_BOUNDARY_PATTERN.finditer(text):
+            yield start, match.start()
+            start = match.end()
+        yield start, len(text)
 
     def _chunk_by_paragraph(self, text: str) -> List[str]:
         """
@@ -354,44 +442,55 @@ class TextChunker:
         Returns:
             List of text chunks
         """
-        # Split by double newlines (paragraphs)
-        paragraphs = text.split("\n\n")
-
-        chunks = []
-        current_chunk = []
-        current_size = 0
-
-        for para in paragraphs:
-            para_size = len(para)
+        return self._chunk_segments(text, self._paragraph_spans(text))
 
-            if current_size + para_size > self.chunk_size and current_chunk:
-                # Save current chunk
-                chunks.append("\n\n".join(current_chunk))
+    def _paragraph_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yield paragraph boundaries (split on double newlines).
 
-                # Start new chunk with overlap
-                if self.chunk_overlap > 0:
-                    overlap_paras = []
-                    overlap_size = 0
+        Args:
+            text: Text to scan
 
-                    for p in reversed(current_chunk):
-                        if overlap_size + len(p) <= self.chunk_overlap:
-                            overlap_paras.insert(0, p)
-                            overlap_size += len(p)
-                        else:
-                            break
+        Yields:
+            (start, end) offsets of each paragraph in text
+        """
+        start = 0
+        while True:
+            end = text.find("\n\n", start)
+            if end == -1:
+                break
+            yield start, end
+            start = end + 2
+        yield start, len(text)
+
+    def _chunk_segments(self, text: str, spans: Iterator[Tuple[int, int]]) -> List[str]:
+        """
+        Accumulate segments (sentences, paragraphs) into overlapping chunks.
 
-                    current_chunk = overlap_paras
-                    current_size = overlap_size
-                else:
-                    current_chunk = []
-                    current_size = 0
+        Args:
+            text: Source text
+            spans: (start, end) offsets of consecutive segments
 
-            current_chunk.append(para)
-            current_size += para_size
+        Returns:
+            List of text chunks, each a single slice of text
+        """
+        starts = []
+        ends = []
+        for start, end in spans:
+            starts.append(start)
+            ends.append(end)
+
+        if NUMBA_AVAILABLE:
+            groups = _group_segments_compiled(
+                np.array(starts, dtype=np.int64),
+                np.array(ends, dtype=np.int64),
+                self.chunk_size,
+                self.chunk_overlap
+            )
+        else:
+            groups = _group_segments(starts, ends, self.chunk_size, self.chunk_overlap)
 
-        # Add remaining chunk
-        if current_chunk:
-            chunks.append("\n\n".join(current_chunk))
+        chunks = [text[starts[first]:ends[stop - 1]] for first, stop in groups]
 
         return [chunk for chunk in chunks if chunk.strip()]
 
@@ -405,19 +504,13 @@ class TextChunker:
         Returns:
             List of text chunks
         """
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + self.chunk_size
-            chunk = text[start:end]
+        size = self.chunk_size
+        # Each chunk starts `chunk_overlap` characters before the previous end
+        step = max(1, size - self.chunk_overlap)
 
-            chunks.append(chunk)
+        chunks = [text[start:start + size] for start in range(0, len(text), step)]
 
-            # Move start with overlap
-            start = end - self.chunk_overlap
-
-        return [chunk for chunk in chunks if chunk.strip()]
+        return [chunk for chunk in chunks if not chunk.isspace()]
 
     def get_optimal_strategy(self, document_type: DocumentType) -> ChunkingStrategy:
         """
@@ -451,6 +544,9 @@ class TextChunker:
             Estimated number of chunks
         """
         text_length = len(text)
+        if text_length <= self.chunk_size:
+            return 1
+
         effective_chunk_size = self.chunk_size - self.chunk_overlap
 
         if effective_chunk_size <= 0:
@@ -460,10 +556,46 @@ class TextChunker:
         return max(1, estimated)
 
 
-# Create global chunker instances with different configurations
-default_chunker = TextChunker(chunk_size=1000, chunk_overlap=200)
-small_chunker = TextChunker(chunk_size=500, chunk_overlap=100)
-large_chunker = TextChunker(chunk_size=2000, chunk_overlap=400)
+@lru_cache(maxsize=32)
+def _get_chunker(
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    encoding_name: str = "cl100k_base"
+) -> TextChunker:
+    """
+    Get a shared TextChunker for a configuration.
+
+    Chunkers hold no per-call state, so one instance per configuration is
+    reused and the tiktoken encoding is loaded once instead of on every call.
+
+    Args:
+        chunk_size: Target chunk size in characters
+        chunk_overlap: Overlap between chunks
+        encoding_name: Tiktoken encoding name
+
+    Returns:
+        Cached TextChunker instance
+    """
+    return TextChunker(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        encoding_name=encoding_name
+    )
+
+
+# Global chunker instances with different configurations, created on first access
+_CHUNKER_PRESETS = {
+    "default_chunker": (1000, 200),
+    "small_chunker": (500, 100),
+    "large_chunker": (2000, 400),
+}
+
+
+def __getattr__(name: str) -> TextChunker:
+    """Lazily create the preset chunkers (PEP 562) so importing stays cheap."""
+    if name in _CHUNKER_PRESETS:
+        return _get_chunker(*_CHUNKER_PRESETS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Convenience functions
@@ -473,6 +605,7 @@ def chunk_text(
     chunk_overlap: int = 200,
     strategy: ChunkingStrategy = ChunkingStrategy.RECURSIVE,
     document_id: Optional[int] = None,
+    approx_tokens: bool = False,
     **kwargs
 ) -> List[TextChunk]:
     """
@@ -484,13 +617,20 @@ def chunk_text(
         chunk_overlap: Overlap between chunks
         strategy: Chunking strategy to use
         document_id: Optional document ID for metadata
+        approx_tokens: Estimate token counts instead of encoding each chunk
         **kwargs: Additional parameters
 
     Returns:
         List of TextChunk objects
     """
-    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    return chunker.chunk_text(text, strategy=strategy, document_id=document_id, **kwargs)
+    chunker = _get_chunker(chunk_size, chunk_overlap)
+    return chunker.chunk_text(
+        text,
+        strategy=strategy,
+        document_id=document_id,
+        approx_tokens=approx_tokens,
+        **kwargs
+    )
 
 
 def chunk_document_text(
@@ -498,7 +638,8 @@ def chunk_document_text(
     document_type: DocumentType,
     document_id: Optional[int] = None,
     chunk_size: int = 1000,
-    chunk_overlap: int = 200
+    chunk_overlap: int = 200,
+    approx_tokens: bool = False
 ) -> List[TextChunk]:
     """
     Chunk document text using optimal strategy for document type.
@@ -509,11 +650,12 @@ def chunk_document_text(
         document_id: Optional document ID for metadata
         chunk_size: Target chunk size
         chunk_overlap: Overlap between chunks
+        approx_tokens: Estimate token counts instead of encoding each chunk
 
     Returns:
         List of TextChunk objects
     """
-    chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunker = _get_chunker(chunk_size, chunk_overlap)
     strategy = chunker.get_optimal_strategy(document_type)
 
     logger.info(f"Chunking {document_type.value} document with {strategy.value} strategy")
@@ -521,5 +663,7 @@ def chunk_document_text(
     return chunker.chunk_text(
         text=text,
         strategy=strategy,
-        document_id=document_id
+        document_id=document_id,
+        approx_tokens=approx_tokens
     )
+
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
 
@@ -16,12 +17,42 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "nomic-embed-text"
     OLLAMA_AUTO_START: bool = True  # Attempt to auto-start Ollama if not running
     OLLAMA_STARTUP_TIMEOUT: int = 30  # Seconds to wait for Ollama to start
+    OLLAMA_MAX_CONCURRENCY: int = 8  # Max in-flight async embedding requests to Ollama
+    OLLAMA_NUM_PARALLEL: int = 4  # Max in-flight generate/chat requests (match Ollama's)
+    OLLAMA_POOL_MAX: int = 64  # Max pooled HTTP connections to Ollama (half kept alive)
+    OLLAMA_MAX_QUEUED: int = 64  # Generate/chat requests allowed to wait before returning 429
+    OLLAMA_EMBED_BATCH_SIZE: int = 64  # Texts per /api/embed request (halves on failure)
+    OLLAMA_EMBED_MAX_BATCH_SIZE: int = 256  # Upper bound when the batch size grows back
+    EMBEDDING_CACHE_SIZE: int = 10000  # Embeddings kept in the in-process LRU cache (0 = off)
+    EMBEDDING_STORAGE_DTYPE: str = "fp32"  # Cached embedding format: fp32, bf16 or int8
+    EMBEDDING_QUERY_BATCH_SIZE: int = 32  # Max concurrent query embeddings merged into one request
+    EMBEDDING_QUERY_BATCH_WAIT_MS: float = 10.0  # Wait for other queries to join a batch
+    EMBEDDING_DISK_CACHE: bool = True  # Persist chunk embeddings across restarts/re-ingests
+    EMBEDDING_DISK_CACHE_MAX_ROWS: int = 200000  # Stored chunk embeddings (LRU pruned, 0 = no cap)
+    # Reuse embeddings within this SimHash distance (0 = off); the 4-band index
+    # only finds every match up to 3, so larger values are rejected
+    EMBEDDING_NEAR_DUP_DISTANCE: int = Field(default=0, ge=0, le=3)
 
     # Database Configuration
     DATABASE_URL: str = "sqlite:///./storage/sqlite/app.db"
+    DB_POOL_SIZE: int = 10  # Connections kept open (and warmed up at startup)
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT: float = 5.0  # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 3600  # Reopen pooled connections older than this many seconds
+    DB_STATEMENT_CACHE_SIZE: int = 512  # Prepared statements cached per SQLite connection
 
     # ChromaDB Configuration
     CHROMA_PERSIST_DIR: str = "./storage/chroma"
+    MAX_OPEN_COLLECTIONS: int = 128  # Project collection handles kept open (LRU)
+    CHROMA_HNSW_M: int = 16  # Graph links per vector (higher = better recall, more memory)
+    CHROMA_HNSW_CONSTRUCTION_EF: int = 100  # Candidate list size while building the index
+    CHROMA_HNSW_SEARCH_EF: int = 64  # Candidate list size per query (recall vs. latency)
+    CHROMA_HNSW_BATCH_SIZE: int = 500  # Vectors buffered before an index update
+
+    # RAG Answer Cache Configuration
+    RAG_CACHE_SIZE: int = 256  # Answers kept per cache tier (0 = off)
+    RAG_CACHE_TTL: int = 600  # Seconds a cached answer stays valid
+    RAG_SEMANTIC_CACHE_THRESHOLD: float = 0.97  # Min cosine similarity to reuse an answer
 
     # Storage Configuration
     UPLOAD_DIR: str = "./storage/documents"
@@ -31,6 +62,15 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
+    # Response Cache Configuration (seconds)
+    SETTINGS_CACHE_TTL: int = 60
+    MODELS_CACHE_TTL: int = 30  # Installed/popular model listings (queried from Ollama)
+    MODELS_CATALOG_REFRESH_INTERVAL: int = 30  # Background re-serialization of listings (0 = off)
+
+    # WebSocket Configuration
+    # e.g. redis://localhost:6379/0 to share Socket.IO events across workers
+    REDIS_URL: str = ""  # Empty = single process
+
     # CORS Configuration
     CORS_ORIGINS: str = "http://localhost:3000"
 
@@ -1,10 +1,12 @@
 """
 Database session management and initialization.
 """
+import asyncio
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import create_engine, event, text
 
 from core.config import settings
 from models import Base
@@ -22,9 +24,80 @@ async_database_url = settings.DATABASE_URL.replace("sqlite:///", "sqlite+aiosqli
 async_engine = create_async_engine(
     async_database_url,
     echo=settings.DEBUG,
-    connect_args={"check_same_thread": False}
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        "check_same_thread": False,
+        # sqlite3 keeps this many compiled statements per connection
+        "cached_statements": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 )
 
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Apply performance PRAGMAs to every new SQLite connection.
+
+    WAL lets readers run alongside a writer, and synchronous=NORMAL only
+    fsyncs at checkpoints (safe in WAL mode). Temp tables and the page cache
+    stay in memory, and busy_timeout waits for locks instead of failing.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+    cursor.execute("PRAGMA cache_size=-65536")  # 64MB page cache
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
+# Track whether a session has written anything that still needs a commit.
+# AsyncSession wraps a sync Session, so these fire for both.
+PENDING_WRITES_KEY = "pending_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flushed_writes(session, flush_context):
+    session.info[PENDING_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[PENDING_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _clear_pending_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(PENDING_WRITES_KEY, None)
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """
+    Check whether a session has uncommitted changes.
+
+    Args:
+        session: Database session
+
+    Returns:
+        True if objects are new/dirty/deleted or writes were already flushed
+    """
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.info.get(PENDING_WRITES_KEY)
+    )
+
 # Session factories
 SessionLocal = async_sessionmaker(
     async_engine,
@@ -34,6 +107,12 @@ SessionLocal = async_sessionmaker(
     autocommit=False
 )
 
+SyncSessionLocal = sessionmaker(
+    sync_engine,
+    autoflush=False,
+    autocommit=False
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -50,12 +129,36 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with SessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            # Read-only requests skip the commit (and its fsync)
+            if has_pending_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
+
+
+async def warm_up_pool() -> int:
+    """
+    Open every pooled connection up front.
+
+    The pool connects lazily, so without this the first requests after startup
+    pay the connect cost. All connections are held at once so each one is a
+    distinct pool entry.
+
+    Returns:
+        Number of connections warmed up
+    """
+    connections = await asyncio.gather(
+        *(async_engine.connect() for _ in range(settings.DB_POOL_SIZE))
+    )
+    try:
+        for conn in connections:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            await conn.close()
+
+    return len(connections)
 
 
 def create_tables():
@@ -88,26 +191,22 @@ async def init_db():
 
     async with SessionLocal() as session:
         try:
-            # Check if default user settings exist
-            from sqlalchemy import select
-            result = await session.execute(
-                select(UserSettings).where(UserSettings.user_id == "default_user")
-            )
-            settings_obj = result.scalar_one_or_none()
-
-            if not settings_obj:
-                # Create default settings
-                settings_obj = UserSettings(
-                    user_id="default_user",
-                    default_llm_model=settings.OLLAMA_MODEL,
-                    default_embedding_model=settings.EMBEDDING_MODEL,
-                    default_chunk_size=1000,
-                    default_chunk_overlap=200,
-                    default_retrieval_k=5,
-                    theme="light"
-                )
-                session.add(settings_obj)
-                await session.commit()
+            # Create default settings unless they exist (single round-trip)
+            from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(UserSettings).values(
+                user_id="default_user",
+                default_llm_model=settings.OLLAMA_MODEL,
+                default_embedding_model=settings.EMBEDDING_MODEL,
+                default_chunk_size=1000,
+                default_chunk_overlap=200,
+                default_retrieval_k=5,
+                theme="light"
+            ).on_conflict_do_nothing(index_elements=["user_id"])
+
+            result = await session.execute(stmt)
+            await session.commit()
+
+            if result.rowcount:
                 print("✓ Default user settings created")
             else:
                 print("✓ Default user settings already exist")
@@ -118,11 +217,15 @@ async def init_db():
             raise
 
 
-async def get_db_session() -> AsyncSession:
+@asynccontextmanager
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Get a new database session (for use outside of FastAPI).
 
-    Returns:
+    Commits pending writes when the block exits normally and rolls back
+    on error, like get_db.
+
+    Yields:
         AsyncSession: Database session
 
     Usage:
@@ -130,7 +233,14 @@ async def get_db_session() -> AsyncSession:
             # Use db session
             pass
     """
-    return SessionLocal()
+    async with SessionLocal() as session:
+        try:
+            yield session
+            if has_pending_writes(session):
+                await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
 
 
 def get_sync_session() -> Session:
@@ -140,10 +250,4 @@ def get_sync_session() -> Session:
     Returns:
         Session: Synchronous database session
     """
-    from sqlalchemy.orm import sessionmaker
-    SyncSessionLocal = sessionmaker(
-        sync_engine,
-        autoflush=False,
-        autocommit=False
-    )
     return SyncSessionLocal()
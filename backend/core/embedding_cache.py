@@ -0,0 +1,288 @@
+"""
+Persistent embedding cache.
+
+This module provides:
+- A SQLite store of chunk embeddings keyed by (content hash, model)
+- Bulk lookups and upserts so re-ingesting a document only embeds changed chunks
+- Banded SimHash columns so a lightly edited chunk can reuse the embedding
+  of its previous version
+- A row cap, enforced by dropping the least recently used embeddings
+
+The store survives restarts, unlike the in-process LRU in EmbeddingService.
+Failures are logged and treated as misses; the cache never fails ingestion.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stay below SQLite's bound-parameter limit in a single IN (...) query
+SQLITE_MAX_PARAMS = 500
+
+# SimHash fingerprints are stored as 4 indexed 16-bit bands; fingerprints
+# within Hamming distance 3 share at least one band
+FINGERPRINT_BANDS = 4
+FINGERPRINT_BAND_BITS = 16
+FINGERPRINT_COLUMNS = ("fp",) + tuple(f"b{band}" for band in range(FINGERPRINT_BANDS))
+
+# Once over the row cap, prune this fraction of it as well so a full store
+# isn't pruned again on every write
+PRUNE_HEADROOM = 0.1
+
+
+def _fingerprint_row(fingerprint: Optional[int]) -> tuple:
+    """Column values (signed fingerprint, bands) for a SimHash, NULLs if absent."""
+    if fingerprint is None:
+        return (None,) * len(FINGERPRINT_COLUMNS)
+    mask = (1 << FINGERPRINT_BAND_BITS) - 1
+    signed = fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+    return (signed,) + tuple(
+        (fingerprint >> (band * FINGERPRINT_BAND_BITS)) & mask
+        for band in range(FINGERPRINT_BANDS)
+    )
+
+
+class EmbeddingCache:
+    """
+    Content-hash keyed store of float32 embeddings in SQLite.
+
+    The connection is opened on first use and shared across threads (ingestion
+    runs both on the event loop and in worker threads), guarded by a lock.
+    Each row records when it was last written or read; writes that take the
+    store over max_rows delete the least recently used rows.
+    """
+
+    def __init__(self, path: Path, max_rows: int = 0):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            max_rows: Maximum embeddings kept (0 = unlimited)
+        """
+        self.path = path
+        self.max_rows = max(0, max_rows)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """
+        Hash a chunk's text.
+
+        Args:
+            text: Chunk text
+
+        Returns:
+            Hex digest identifying the text
+        """
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """SQLite connection, created (with the schema) on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "hash TEXT NOT NULL, model TEXT NOT NULL, dim INTEGER NOT NULL, vec BLOB NOT NULL, "
+                "used_at INTEGER, fp INTEGER, b0 INTEGER, b1 INTEGER, b2 INTEGER, b3 INTEGER, "
+                "PRIMARY KEY (hash, model)) WITHOUT ROWID"
+            )
+
+            # Stores created before fingerprints and last-use times were kept
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+            for column in ("used_at",) + FINGERPRINT_COLUMNS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE embeddings ADD COLUMN {column} INTEGER")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_used ON embeddings (used_at)")
+            for band in range(FINGERPRINT_BANDS):
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_embeddings_b{band} "
+                    f"ON embeddings (model, b{band})"
+                )
+
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up stored embeddings.
+
+        Args:
+            model: Embedding model the vectors must come from
+            texts: Chunk texts
+
+        Returns:
+            Read-only float32 vectors in input order, None for misses
+        """
+        hashes = [self.content_hash(text) for text in texts]
+        found = {}
+
+        try:
+            with self._lock:
+                for start in range(0, len(hashes), SQLITE_MAX_PARAMS):
+                    part = hashes[start:start + SQLITE_MAX_PARAMS]
+                    rows = self.connection.execute(
+                        f"SELECT hash, vec FROM embeddings WHERE model = ? "
+                        f"AND hash IN ({','.join('?' * len(part))})",
+                        [model, *part]
+                    )
+                    for content_hash, vec in rows:
+                        found[content_hash] = np.frombuffer(vec, dtype=np.float32)
+
+                # Mark hits as recently used so pruning keeps them
+                if self.max_rows:
+                    self._touch(model, list(found))
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return [None] * len(texts)
+
+        if found:
+            logger.debug("Embedding cache: %d/%d chunks already embedded", len(found), len(texts))
+        return [found.get(content_hash) for content_hash in hashes]
+
+    def find_near_duplicates(
+        self,
+        model: str,
+        fingerprints: Sequence[int],
+        max_distance: int
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Look up embeddings of texts with a nearly identical SimHash.
+
+        Args:
+            model: Embedding model the vectors must come from
+            fingerprints: SimHash of each text being looked up
+            max_distance: Largest Hamming distance counted as a near-duplicate (at most 3)
+
+        Returns:
+            Read-only float32 vector of the closest match for each fingerprint,
+            None where nothing is close enough
+        """
+        band_filter = " OR ".join(f"b{band} = ?" for band in range(FINGERPRINT_BANDS))
+        query = f"SELECT fp, vec FROM embeddings WHERE model = ? AND ({band_filter})"
+        matches: List[Optional[np.ndarray]] = []
+
+        try:
+            with self._lock:
+                for fingerprint in fingerprints:
+                    best, best_distance = None, max_distance + 1
+                    row = _fingerprint_row(fingerprint)
+                    for candidate, vec in self.connection.execute(query, [model, *row[1:]]):
+                        distance = ((candidate & 0xFFFFFFFFFFFFFFFF) ^ fingerprint).bit_count()
+                        if distance < best_distance:
+                            best, best_distance = vec, distance
+                    matches.append(None if best is None else np.frombuffer(best, dtype=np.float32))
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache near-duplicate lookup failed: {e}")
+            return [None] * len(fingerprints)
+
+        return matches
+
+    def put_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+        vectors: Sequence[np.ndarray],
+        fingerprints: Optional[Sequence[int]] = None
+    ) -> None:
+        """
+        Store embeddings, replacing any existing entry for the same text and model.
+
+        Args:
+            model: Embedding model the vectors come from
+            texts: Chunk texts
+            vectors: Embedding for each text
+            fingerprints: Optional SimHash of each text, for near-duplicate lookups
+        """
+        if fingerprints is None:
+            fingerprints = [None] * len(texts)
+
+        now = int(time.time())
+        rows = [
+            (
+                self.content_hash(text),
+                model,
+                len(vector),
+                np.asarray(vector, dtype=np.float32).tobytes(),
+                now,
+                *_fingerprint_row(fingerprint)
+            )
+            for text, vector, fingerprint in zip(texts, vectors, fingerprints)
+        ]
+
+        try:
+            with self._lock:
+                conn = self.connection
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings "
+                        "(hash, model, dim, vec, used_at, fp, b0, b1, b2, b3) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    self._prune()
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def _touch(self, model: str, hashes: List[str]) -> None:
+        """Set the last-use time of stored embeddings to now (lock held)."""
+        now = int(time.time())
+        for start in range(0, len(hashes), SQLITE_MAX_PARAMS):
+            part = hashes[start:start + SQLITE_MAX_PARAMS]
+            self.connection.execute(
+                f"UPDATE embeddings SET used_at = ? WHERE model = ? "
+                f"AND hash IN ({','.join('?' * len(part))})",
+                [now, model, *part]
+            )
+
+    def _prune(self) -> None:
+        """Delete the least recently used rows beyond max_rows (lock held)."""
+        if not self.max_rows:
+            return
+
+        count = self.connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count <= self.max_rows:
+            return
+
+        excess = count - self.max_rows + int(self.max_rows * PRUNE_HEADROOM)
+        self.connection.execute(
+            "DELETE FROM embeddings WHERE (hash, model) IN "
+            "(SELECT hash, model FROM embeddings ORDER BY used_at LIMIT ?)",
+            (excess,)
+        )
+        logger.info(f"Embedding cache: pruned {excess} least recently used embeddings")
+
+    def clear(self) -> None:
+        """Remove all stored embeddings."""
+        try:
+            with self._lock:
+                self.connection.execute("DELETE FROM embeddings")
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache clear failed: {e}")
+
+
+# Create global cache instance (stored next to the vector data)
+embedding_cache = EmbeddingCache(
+    Path(settings.CHROMA_PERSIST_DIR) / "embed_cache.sqlite",
+    max_rows=settings.EMBEDDING_DISK_CACHE_MAX_ROWS
+)
@@ -4,19 +4,267 @@ Embeddings generation module using Ollama.
 This module provides:
 - Text embedding generation via Ollama embedding models
 - Batch embedding generation for efficiency
-- Embedding caching for performance
+- Embedding caching for performance (in-process LRU, plus a persistent
+  store so re-ingested chunks are not embedded again)
 - Support for multiple embedding models
+- Coalescing of concurrent single-query requests into batches
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional, Dict
+import weakref
+from collections import OrderedDict
+from typing import Any, List, Optional, Dict, Set, Tuple, Union
+import httpx
 import numpy as np
-from ollama import Client, AsyncClient
+import orjson
+from ollama import Client, AsyncClient, ResponseError
 
 from core.config import settings
+from core.embedding_cache import EmbeddingCache, embedding_cache
 
 logger = logging.getLogger(__name__)
 
+# Shared limits for async requests to Ollama (across all EmbeddingService instances)
+OLLAMA_TIMEOUT = 60.0
+OLLAMA_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+# One concurrency limit per event loop; a semaphore can't be shared across loops
+_ollama_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _ollama_semaphore() -> asyncio.Semaphore:
+    """
+    Get the running loop's limit on in-flight async embedding requests.
+
+    Created on first use in each loop (OLLAMA_MAX_CONCURRENCY slots) rather
+    than at import time, so tests and reloads that start new loops work.
+
+    Returns:
+        Semaphore shared by every EmbeddingService on the running loop
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _ollama_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.OLLAMA_MAX_CONCURRENCY)
+        _ollama_semaphores[loop] = semaphore
+    return semaphore
+
+# Supported in-memory storage formats for cached embeddings
+STORAGE_DTYPES = ("fp32", "bf16", "int8")
+
+
+def to_bfloat16(vectors: np.ndarray) -> np.ndarray:
+    """
+    Pack float32 values into bfloat16 bit patterns (round to nearest even).
+
+    bfloat16 keeps the sign, exponent and top 7 mantissa bits of a float32,
+    so it halves storage with the same dynamic range.
+
+    Args:
+        vectors: float32 array of any shape
+
+    Returns:
+        uint16 array holding the bfloat16 bits
+    """
+    bits = np.ascontiguousarray(vectors, dtype=np.float32).view(np.uint32)
+    rounding = ((bits >> 16) & 1) + np.uint32(0x7FFF)
+    return ((bits + rounding) >> 16).astype(np.uint16)
+
+
+def from_bfloat16(packed: np.ndarray) -> np.ndarray:
+    """
+    Unpack bfloat16 bit patterns into float32 values.
+
+    Args:
+        packed: uint16 array from to_bfloat16
+
+    Returns:
+        float32 array of the same shape
+    """
+    return (packed.astype(np.uint32) << 16).view(np.float32)
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint of a text.
+
+    The text is lowercased and split into overlapping word shingles; each
+    shingle's 64-bit hash votes on every bit. Texts differing by small edits
+    (whitespace, a typo) share most shingles, so their fingerprints differ in
+    only a few bits.
+
+    Args:
+        text: Text to fingerprint
+        shingle_size: Words per shingle
+
+    Returns:
+        Fingerprint as an unsigned 64-bit int
+    """
+    words = text.lower().split()
+    count = max(1, len(words) - shingle_size + 1)
+    hashes = np.fromiter(
+        (
+            int.from_bytes(
+                hashlib.blake2b(
+                    ' '.join(words[i:i + shingle_size]).encode('utf-8'),
+                    digest_size=8
+                ).digest(),
+                'little'
+            )
+            for i in range(count)
+        ),
+        dtype=np.uint64,
+        count=count
+    )
+
+    # (count, 64) bit matrix, least significant bit first
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(count, 8), axis=1, bitorder='little')
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > count
+    return int.from_bytes(np.packbits(majority, bitorder='little').tobytes(), 'little')
+
+
+class SimHashIndex:
+    """
+    Near-duplicate index mapping SimHash fingerprints to embedding cache keys.
+
+    Fingerprints are split into 4 bands of 16 bits. Two fingerprints within
+    Hamming distance 3 must agree exactly on at least one band, so candidates
+    are found with 4 dict lookups instead of a scan.
+    """
+
+    BANDS = 4
+    BAND_BITS = 16
+
+    def __init__(self, max_distance: int, max_size: int):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_distance: Largest Hamming distance counted as a near-duplicate
+                (at most 3 for the band lookup to find every match)
+            max_size: Maximum fingerprints kept (oldest are dropped first)
+        """
+        self.max_distance = max_distance
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[str, str]]" = OrderedDict()
+        self._bands: Dict[Tuple[str, int, int], set] = {}
+
+    def _band_keys(self, model: str, fingerprint: int) -> List[Tuple[str, int, int]]:
+        """Band lookup keys for a fingerprint."""
+        mask = (1 << self.BAND_BITS) - 1
+        return [
+            (model, band, (fingerprint >> (band * self.BAND_BITS)) & mask)
+            for band in range(self.BANDS)
+        ]
+
+    def get(self, model: str, fingerprint: int) -> Optional[Tuple[str, str]]:
+        """
+        Find the cache key of a near-duplicate text.
+
+        Args:
+            model: Embedding model the text was embedded with
+            fingerprint: SimHash of the text being looked up
+
+        Returns:
+            Cache key of the closest match within max_distance, or None
+        """
+        best = None
+        best_distance = self.max_distance + 1
+        for band_key in self._band_keys(model, fingerprint):
+            for candidate in self._bands.get(band_key, ()):
+                distance = (candidate ^ fingerprint).bit_count()
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+
+        if best is None:
+            return None
+        return self._entries[(model, best)]
+
+    def add(self, model: str, fingerprint: int, cache_key: Tuple[str, str]) -> None:
+        """
+        Index a fingerprint, dropping the oldest entries beyond max_size.
+
+        Args:
+            model: Embedding model the text was embedded with
+            fingerprint: SimHash of the text
+            cache_key: Key of the text's embedding in the exact-match cache
+        """
+        entry_key = (model, fingerprint)
+        if entry_key not in self._entries:
+            for band_key in self._band_keys(model, fingerprint):
+                self._bands.setdefault(band_key, set()).add(fingerprint)
+        self._entries[entry_key] = cache_key
+        self._entries.move_to_end(entry_key)
+
+        while len(self._entries) > self.max_size:
+            (old_model, old_fingerprint), _ = self._entries.popitem(last=False)
+            for band_key in self._band_keys(old_model, old_fingerprint):
+                members = self._bands.get(band_key)
+                if members is not None:
+                    members.discard(old_fingerprint)
+                    if not members:
+                        del self._bands[band_key]
+
+    def __len__(self) -> int:
+        """Number of indexed fingerprints."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all fingerprints."""
+        self._entries.clear()
+        self._bands.clear()
+
+
+# Errors that make a batch worth retrying with fewer texts (server errors, timeouts)
+BATCH_RETRY_ERRORS = (ResponseError, httpx.HTTPError)
+
+# Consecutive successful batches before the batch size grows again
+BATCH_GROWTH_STREAK = 4
+
+
+class AdaptiveBatchSize:
+    """
+    Batch size that halves on failure and doubles back after repeated success.
+
+    Starts at the configured size and never exceeds
+    settings.OLLAMA_EMBED_MAX_BATCH_SIZE.
+    """
+
+    def __init__(self, initial: Optional[int] = None):
+        """
+        Initialize batch size.
+
+        Args:
+            initial: Starting batch size (defaults to settings.OLLAMA_EMBED_BATCH_SIZE)
+        """
+        self.size = max(1, initial or settings.OLLAMA_EMBED_BATCH_SIZE)
+        self.max_size = max(self.size, settings.OLLAMA_EMBED_MAX_BATCH_SIZE)
+        self._streak = 0
+
+    def shrink(self) -> bool:
+        """
+        Halve the batch size after a failure.
+
+        Returns:
+            False if already at 1 (nothing left to retry with)
+        """
+        self._streak = 0
+        if self.size <= 1:
+            return False
+        self.size = max(1, self.size // 2)
+        return True
+
+    def grow(self) -> None:
+        """Record a success, doubling the size after a streak of them."""
+        self._streak += 1
+        if self._streak >= BATCH_GROWTH_STREAK and self.size < self.max_size:
+            self.size = min(self.max_size, self.size * 2)
+            self._streak = 0
+
 
 class EmbeddingError(Exception):
     """Raised when embedding generation fails."""
@@ -29,7 +277,8 @@ class EmbeddingService:
     def __init__(
         self,
         host: Optional[str] = None,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        storage_dtype: Optional[str] = None
     ):
         """
         Initialize embedding service.
@@ -37,34 +286,293 @@ class EmbeddingService:
         Args:
             host: Ollama server URL (defaults to settings.OLLAMA_HOST)
             model: Embedding model name (defaults to settings.EMBEDDING_MODEL)
+            storage_dtype: Format for cached embeddings, "fp32", "bf16" or "int8"
+                (defaults to settings.EMBEDDING_STORAGE_DTYPE)
+
+        Raises:
+            ValueError: If storage_dtype is not supported
         """
         self.host = host or settings.OLLAMA_HOST
         self.model = model or settings.EMBEDDING_MODEL
+        self.storage_dtype = storage_dtype or settings.EMBEDDING_STORAGE_DTYPE
+
+        if self.storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(
+                f"Unsupported embedding storage dtype: {self.storage_dtype} "
+                f"(expected one of {', '.join(STORAGE_DTYPES)})"
+            )
 
         self._client: Optional[Client] = None
         self._async_client: Optional[AsyncClient] = None
 
+        # LRU cache of embeddings keyed by (model, sha256(text))
+        self._cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._cache_max_size = settings.EMBEDDING_CACHE_SIZE
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Optional SimHash index so near-duplicate texts reuse cached embeddings
+        self._near_dups: Optional[SimHashIndex] = None
+        self._near_dup_hits = 0
+        if settings.EMBEDDING_NEAR_DUP_DISTANCE > 0 and self._cache_max_size > 0:
+            self._near_dups = SimHashIndex(
+                settings.EMBEDDING_NEAR_DUP_DISTANCE,
+                self._cache_max_size
+            )
+
+        # Persistent store consulted on LRU misses by batch calls made with persist=True
+        self._disk_cache: Optional[EmbeddingCache] = (
+            embedding_cache if settings.EMBEDDING_DISK_CACHE else None
+        )
+
+        # Embedding dimension per model (constant for a given model)
+        self._dimensions: Dict[str, int] = {}
+
         logger.info(f"EmbeddingService initialized with host={self.host}, model={self.model}")
 
     @property
     def client(self) -> Client:
         """Get or create synchronous Ollama client."""
         if self._client is None:
-            self._client = Client(host=self.host)
+            self._client = Client(host=self.host, timeout=OLLAMA_TIMEOUT)
         return self._client
 
     @property
     def async_client(self) -> AsyncClient:
         """Get or create asynchronous Ollama client."""
         if self._async_client is None:
-            self._async_client = AsyncClient(host=self.host)
+            # Bounded, keep-alive connection pool (kwargs go to httpx.AsyncClient)
+            self._async_client = AsyncClient(
+                host=self.host,
+                timeout=OLLAMA_TIMEOUT,
+                limits=OLLAMA_HTTP_LIMITS
+            )
         return self._async_client
 
+    # Batch embedding posts to /api/embed over the SDK clients' own httpx
+    # pools, so large float arrays are decoded with orjson while the base URL
+    # is the SDK's normalized OLLAMA_HOST (scheme and port may be omitted)
+
+    @property
+    def http(self) -> httpx.Client:
+        """Get synchronous HTTP client for batch embedding."""
+        return self.client._client
+
+    @property
+    def async_http(self) -> httpx.AsyncClient:
+        """Get asynchronous HTTP client for batch embedding."""
+        return self.async_client._client
+
+    async def aclose(self) -> None:
+        """Close the Ollama clients and their connection pools."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    @staticmethod
+    def _embed_payload(inputs: List[str], model: str) -> bytes:
+        """Serialize an /api/embed request body."""
+        return orjson.dumps({'model': model, 'input': inputs})
+
+    @staticmethod
+    def _embed_vectors(response: httpx.Response) -> Any:
+        """
+        Decode the embeddings from an /api/embed response with orjson.
+
+        Args:
+            response: Raw HTTP response from Ollama
+
+        Returns:
+            List of embedding vectors (or None if missing)
+
+        Raises:
+            ResponseError: If Ollama returned an error status
+        """
+        if response.is_error:
+            raise ResponseError(response.text, response.status_code)
+        return orjson.loads(response.content).get('embeddings')
+
+    def _decode_embeddings(self, response: httpx.Response, expected: int) -> Optional[np.ndarray]:
+        """
+        Decode an /api/embed response into a read-only float32 matrix.
+
+        orjson parsing and the list-to-array conversion are the CPU-bound part
+        of a batch request, so the async path runs this in a worker thread.
+
+        Args:
+            response: Raw HTTP response from Ollama
+            expected: Number of embeddings requested
+
+        Returns:
+            (expected, d) matrix, or None if the response held no embeddings
+
+        Raises:
+            ResponseError: If Ollama returned an error status
+        """
+        vectors = self._embed_vectors(response)
+        if not vectors or len(vectors) != expected:
+            return None
+        return self._to_vector(vectors)
+
+    @staticmethod
+    def _cache_key(model: str, text: str) -> Tuple[str, str]:
+        """
+        Build the cache key for a text embedded with a model.
+
+        Texts are keyed (and embedded) without surrounding whitespace, so the
+        single-text and batch paths share one entry per chunk.
+        """
+        return model, hashlib.sha256(text.strip().encode('utf-8')).hexdigest()
+
+    def _cache_get(
+        self,
+        key: Tuple[str, str],
+        text: Optional[str] = None,
+        count_miss: bool = True
+    ) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding, marking it as recently used.
+
+        On an exact miss, falls back to a near-duplicate of text when the
+        SimHash index is enabled. Pre-checks whose misses go on to a path that
+        looks the text up again pass count_miss=False.
+        """
+        stored = self._cache.get(key)
+        if stored is None and text is not None and self._near_dups is not None:
+            near_key = self._near_dups.get(key[0], simhash(text))
+            if near_key is not None:
+                stored = self._cache.get(near_key)
+                if stored is not None:
+                    key = near_key
+                    self._near_dup_hits += 1
+
+        if stored is None:
+            if count_miss:
+                self._cache_misses += 1
+            return None
+
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return self.dequantize(stored)
+
+    def _cache_put(
+        self,
+        key: Tuple[str, str],
+        embedding: np.ndarray,
+        text: Optional[str] = None
+    ) -> None:
+        """Store an embedding, evicting the least recently used entries."""
+        if self._cache_max_size <= 0:
+            return
+
+        if text is not None and self._near_dups is not None:
+            self._near_dups.add(key[0], simhash(text), key)
+
+        self._cache[key] = self.quantize(embedding)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max_size:
+            self._cache.popitem(last=False)
+
+    def quantize(self, embedding: np.ndarray) -> Any:
+        """
+        Convert a float32 embedding to the configured storage format.
+
+        Args:
+            embedding: float32 embedding vector
+
+        Returns:
+            Embedding in storage format (float32, packed bfloat16, or an
+            (int8 codes, scale) tuple)
+        """
+        if self.storage_dtype == "bf16":
+            return to_bfloat16(embedding)
+        if self.storage_dtype == "int8":
+            codes, scales = self.quantize_int8(embedding)
+            return codes, float(scales)
+        return embedding
+
+    def dequantize(self, stored: Any) -> np.ndarray:
+        """
+        Convert a stored embedding back to a read-only float32 vector.
+
+        Args:
+            stored: Embedding in storage format
+
+        Returns:
+            float32 embedding vector
+        """
+        if self.storage_dtype == "bf16":
+            vector = from_bfloat16(stored)
+        elif self.storage_dtype == "int8":
+            codes, scale = stored
+            vector = codes.astype(np.float32) * np.float32(scale)
+        else:
+            return stored
+
+        vector.setflags(write=False)
+        return vector
+
+    @staticmethod
+    def quantize_int8(vectors: Union[List[float], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Symmetric per-vector int8 scalar quantization.
+
+        Each vector is scaled so its largest magnitude maps to 127, which cuts
+        storage to a quarter of float32.
+
+        Args:
+            vectors: A vector of dimension d, or an (N, d) matrix
+
+        Returns:
+            Tuple of (int8 codes with the input's shape, float32 scales with
+            one entry per vector; a 0-d array for a single vector)
+        """
+        values = np.asarray(vectors, dtype=np.float32)
+        scales = np.abs(values).max(axis=-1) / np.float32(127)
+        safe_scales = np.where(scales > 0, scales, np.float32(1))
+        codes = np.rint(values / safe_scales[..., None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get embedding cache statistics.
+
+        Returns:
+            Dict with hits, misses, hit_rate, near_dup_hits, size, max_size,
+            storage_dtype and bytes (memory held by cached vectors)
+        """
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'hit_rate': self._cache_hits / lookups if lookups else 0.0,
+            'near_dup_hits': self._near_dup_hits,
+            'size': len(self._cache),
+            'max_size': self._cache_max_size,
+            'storage_dtype': self.storage_dtype,
+            'bytes': sum(
+                stored[0].nbytes + 4 if isinstance(stored, tuple) else stored.nbytes
+                for stored in self._cache.values()
+            )
+        }
+
+    def clear_cache(self) -> None:
+        """Remove all cached embeddings and reset statistics."""
+        self._cache.clear()
+        if self._near_dups is not None:
+            self._near_dups.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._near_dup_hits = 0
+
     def generate_embedding(
         self,
         text: str,
         model: Optional[str] = None
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
         Generate embedding for a single text.
 
@@ -73,30 +581,40 @@ class EmbeddingService:
             model: Embedding model to use (defaults to self.model)
 
         Returns:
-            Embedding vector as list of floats
+            Embedding vector as a read-only float32 array
 
         Raises:
             EmbeddingError: If embedding generation fails
         """
         model = model or self.model
 
-        if not text.strip():
+        # Embed exactly what the batch path embeds (see _cache_key)
+        text = text.strip()
+        if not text:
             raise EmbeddingError("Cannot generate embedding for empty text")
 
+        key = self._cache_key(model, text)
+        cached = self._cache_get(key, text)
+        if cached is not None:
+            return cached
+
         try:
-            logger.debug(f"Generating embedding for text of length {len(text)}")
+            logger.debug("Generating embedding for text of length %d", len(text))
 
             response = self.client.embeddings(
                 model=model,
                 prompt=text
             )
 
-            embedding = response.get('embedding', [])
+            values = response.get('embedding', [])
 
-            if not embedding:
+            if not values:
                 raise EmbeddingError("Empty embedding returned from Ollama")
 
-            logger.debug(f"Generated embedding of dimension {len(embedding)}")
+            embedding = self._to_vector(values)
+
+            logger.debug("Generated embedding of dimension %d", len(embedding))
+            self._cache_put(key, embedding, text)
             return embedding
 
         except Exception as e:
@@ -107,7 +625,7 @@ class EmbeddingService:
         self,
         text: str,
         model: Optional[str] = None
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
         Generate embedding for a single text (async).
 
@@ -116,30 +634,41 @@ class EmbeddingService:
             model: Embedding model to use (defaults to self.model)
 
         Returns:
-            Embedding vector as list of floats
+            Embedding vector as a read-only float32 array
 
         Raises:
             EmbeddingError: If embedding generation fails
         """
         model = model or self.model
 
-        if not text.strip():
+        # Embed exactly what the batch path embeds (see _cache_key)
+        text = text.strip()
+        if not text:
             raise EmbeddingError("Cannot generate embedding for empty text")
 
+        key = self._cache_key(model, text)
+        cached = self._cache_get(key, text)
+        if cached is not None:
+            return cached
+
         try:
-            logger.debug(f"Generating embedding for text of length {len(text)}")
+            logger.debug("Generating embedding for text of length %d", len(text))
 
-            response = await self.async_client.embeddings(
-                model=model,
-                prompt=text
-            )
+            async with _ollama_semaphore():
+                response = await self.async_client.embeddings(
+                    model=model,
+                    prompt=text
+                )
 
-            embedding = response.get('embedding', [])
+            values = response.get('embedding', [])
 
-            if not embedding:
+            if not values:
                 raise EmbeddingError("Empty embedding returned from Ollama")
 
-            logger.debug(f"Generated embedding of dimension {len(embedding)}")
+            embedding = self._to_vector(values)
+
+            logger.debug("Generated embedding of dimension %d", len(embedding))
+            self._cache_put(key, embedding, text)
             return embedding
 
         except Exception as e:
@@ -150,52 +679,66 @@ class EmbeddingService:
         self,
         texts: List[str],
         model: Optional[str] = None,
-        batch_size: int = 10
-    ) -> List[List[float]]:
+        batch_size: Optional[int] = None,
+        persist: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate embeddings for multiple texts in batches.
 
         Args:
             texts: List of texts to embed
             model: Embedding model to use (defaults to self.model)
-            batch_size: Number of texts to process at once
+            batch_size: Initial number of texts per request (defaults to
+                settings.OLLAMA_EMBED_BATCH_SIZE); adapts to failures
+            persist: Also look up and store the embeddings in the persistent
+                cache (document chunks at ingest; not queries)
 
         Returns:
-            List of embedding vectors
+            Tuple of (indices of the non-empty texts, float32 (M, d) embedding
+            matrix with one row per index). Empty texts are skipped.
 
         Raises:
             EmbeddingError: If embedding generation fails
         """
         model = model or self.model
 
-        if not texts:
-            return []
-
-        logger.info(f"Generating embeddings for {len(texts)} texts in batches of {batch_size}")
-
-        embeddings = []
-
-        try:
-            # Process in batches
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                batch_embeddings = []
+        indices, inputs = self._non_empty(texts)
+        if not inputs:
+            return self._empty_batch()
 
-                for text in batch:
-                    if text.strip():
-                        embedding = self.generate_embedding(text, model)
-                        batch_embeddings.append(embedding)
-                    else:
-                        # For empty texts, add zero vector (will be filtered later)
-                        logger.warning(f"Empty text at index {i + len(batch_embeddings)}, skipping")
-                        batch_embeddings.append([])
+        batch = AdaptiveBatchSize(batch_size)
 
-                embeddings.extend(batch_embeddings)
+        logger.info(f"Generating embeddings for {len(inputs)} texts in batches of {batch.size}")
 
-                logger.debug(f"Processed batch {i // batch_size + 1}/{(len(texts) + batch_size - 1) // batch_size}")
+        # Rows are written straight into one contiguous (M, d) buffer
+        out = None
 
-            logger.info(f"Successfully generated {len(embeddings)} embeddings")
-            return embeddings
+        try:
+            # Process in batches, shrinking on failure and growing back on success
+            row = 0
+            while row < len(inputs):
+                batch_inputs = inputs[row:row + batch.size]
+
+                try:
+                    vectors = self._embed_many(batch_inputs, model, persist=persist)
+                except BATCH_RETRY_ERRORS as e:
+                    if not batch.shrink():
+                        raise
+                    logger.warning(
+                        f"Embedding batch failed ({e}), retrying with batch size {batch.size}"
+                    )
+                    continue
+
+                if out is None:
+                    out = self._allocate_matrix(len(inputs), model, vectors[0])
+                out[row:row + len(vectors)] = vectors
+                row += len(vectors)
+                batch.grow()
+
+                logger.debug("Processed %d/%d texts", row, len(inputs))
+
+            logger.info(f"Successfully generated {len(inputs)} embeddings")
+            return np.asarray(indices, dtype=np.intp), out
 
         except Exception as e:
             logger.error(f"Batch embedding generation failed: {str(e)}")
@@ -205,56 +748,393 @@ class EmbeddingService:
         self,
         texts: List[str],
         model: Optional[str] = None,
-        batch_size: int = 10
-    ) -> List[List[float]]:
+        batch_size: Optional[int] = None,
+        persist: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate embeddings for multiple texts in batches (async).
 
         Args:
             texts: List of texts to embed
             model: Embedding model to use (defaults to self.model)
-            batch_size: Number of texts to process at once
+            batch_size: Initial number of texts per request (defaults to
+                settings.OLLAMA_EMBED_BATCH_SIZE); adapts to failures
+            persist: Also look up and store the embeddings in the persistent
+                cache (document chunks at ingest; not queries)
 
         Returns:
-            List of embedding vectors
+            Tuple of (indices of the non-empty texts, float32 (M, d) embedding
+            matrix with one row per index). Empty texts are skipped.
 
         Raises:
             EmbeddingError: If embedding generation fails
         """
         model = model or self.model
 
-        if not texts:
-            return []
+        indices, inputs = self._non_empty(texts)
+        if not inputs:
+            return self._empty_batch()
+
+        batch = AdaptiveBatchSize(batch_size)
 
-        logger.info(f"Generating embeddings for {len(texts)} texts in batches of {batch_size}")
+        logger.info(f"Generating embeddings for {len(inputs)} texts in batches of {batch.size}")
 
-        embeddings = []
+        # Rows are written straight into one contiguous (M, d) buffer
+        out = None
 
         try:
-            # Process in batches
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                batch_embeddings = []
+            # Process in batches, shrinking on failure and growing back on success
+            row = 0
+            while row < len(inputs):
+                batch_inputs = inputs[row:row + batch.size]
+
+                try:
+                    vectors = await self._embed_many_async(batch_inputs, model, persist=persist)
+                except BATCH_RETRY_ERRORS as e:
+                    if not batch.shrink():
+                        raise
+                    logger.warning(
+                        f"Embedding batch failed ({e}), retrying with batch size {batch.size}"
+                    )
+                    continue
+
+                if out is None:
+                    out = self._allocate_matrix(len(inputs), model, vectors[0])
+                out[row:row + len(vectors)] = vectors
+                row += len(vectors)
+                batch.grow()
+
+                logger.debug("Processed %d/%d texts", row, len(inputs))
+
+            logger.info(f"Successfully generated {len(inputs)} embeddings")
+            return np.asarray(indices, dtype=np.intp), out
 
-                for text in batch:
-                    if text.strip():
-                        embedding = await self.generate_embedding_async(text, model)
-                        batch_embeddings.append(embedding)
-                    else:
-                        # For empty texts, add zero vector (will be filtered later)
-                        logger.warning(f"Empty text at index {i + len(batch_embeddings)}, skipping")
-                        batch_embeddings.append([])
+        except Exception as e:
+            logger.error(f"Batch embedding generation failed: {str(e)}")
+            raise EmbeddingError(f"Batch embedding generation failed: {str(e)}") from e
 
-                embeddings.extend(batch_embeddings)
+    @staticmethod
+    def _to_vector(values: Any) -> np.ndarray:
+        """
+        Convert embedding values from Ollama to a read-only float32 array.
 
-                logger.debug(f"Processed batch {i // batch_size + 1}/{(len(texts) + batch_size - 1) // batch_size}")
+        Read-only arrays can be shared (e.g. from the cache) without copying.
 
-            logger.info(f"Successfully generated {len(embeddings)} embeddings")
-            return embeddings
+        Args:
+            values: Embedding values (a vector, or a list of vectors for a matrix)
 
-        except Exception as e:
-            logger.error(f"Batch embedding generation failed: {str(e)}")
-            raise EmbeddingError(f"Batch embedding generation failed: {str(e)}") from e
+        Returns:
+            float32 ndarray
+        """
+        vector = np.asarray(values, dtype=np.float32)
+        vector.setflags(write=False)
+        return vector
+
+    @staticmethod
+    def _non_empty(texts: List[str]) -> Tuple[List[int], List[str]]:
+        """
+        Separate non-empty texts from the input, remembering their positions.
+
+        Each text is stripped exactly once here; the stripped copy is what gets
+        cached and sent to Ollama, so batch retries never strip again.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Tuple of (positions in the input, stripped non-empty texts)
+        """
+        indices = []
+        inputs = []
+        for j, text in enumerate(texts):
+            stripped = text.strip()
+            if stripped:
+                indices.append(j)
+                inputs.append(stripped)
+            else:
+                logger.warning(f"Empty text at index {j}, skipping")
+        return indices, inputs
+
+    def _allocate_matrix(self, rows: int, model: str, first: np.ndarray) -> np.ndarray:
+        """
+        Preallocate the output matrix for a batch.
+
+        The dimension comes from the first returned vector, which also primes
+        the get_embedding_dimension() cache for the model.
+
+        Args:
+            rows: Number of embeddings in the batch
+            model: Embedding model used
+            first: First embedding returned for the batch
+
+        Returns:
+            Uninitialized C-contiguous float32 matrix of shape (rows, d)
+        """
+        dimension = self._dimensions.setdefault(model, len(first))
+        return np.empty((rows, dimension), dtype=np.float32)
+
+    @staticmethod
+    def _empty_batch() -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch result for input with no non-empty texts.
+
+        Returns:
+            Tuple of (empty index array, empty float32 matrix)
+        """
+        return np.empty(0, dtype=np.intp), np.empty((0, 0), dtype=np.float32)
+
+    def _embed_many(
+        self,
+        inputs: List[str],
+        model: str,
+        persist: bool = False
+    ) -> List[np.ndarray]:
+        """
+        Embed several texts, requesting only those not already cached.
+
+        Args:
+            inputs: Non-empty texts to embed
+            model: Embedding model to use
+            persist: Also use the persistent cache
+
+        Returns:
+            Embedding vectors in input order
+        """
+        keys = [self._cache_key(model, text) for text in inputs]
+        vectors = [self._cache_get(key, text) for key, text in zip(keys, inputs)]
+        missing = [j for j, vector in enumerate(vectors) if vector is None]
+        disk_cache = self._disk_cache if persist else None
+
+        if missing and disk_cache is not None:
+            stored, near = self._disk_lookup(model, [inputs[j] for j in missing])
+            self._near_dup_hits += len(near)
+            missing = self._fill_from_disk(keys, inputs, vectors, missing, stored, near)
+
+        if missing:
+            texts = [inputs[j] for j in missing]
+            fresh = self._request_many(texts, model)
+            for j, vector in zip(missing, fresh):
+                vectors[j] = vector
+                self._cache_put(keys[j], vector, inputs[j])
+            if disk_cache is not None:
+                self._disk_store(model, texts, fresh)
+
+        return vectors
+
+    async def _embed_many_async(
+        self,
+        inputs: List[str],
+        model: str,
+        persist: bool = False
+    ) -> List[np.ndarray]:
+        """
+        Embed several texts, requesting only those not already cached (async).
+
+        Args:
+            inputs: Non-empty texts to embed
+            model: Embedding model to use
+            persist: Also use the persistent cache
+
+        Returns:
+            Embedding vectors in input order
+        """
+        keys = [self._cache_key(model, text) for text in inputs]
+        vectors = [self._cache_get(key, text) for key, text in zip(keys, inputs)]
+        missing = [j for j, vector in enumerate(vectors) if vector is None]
+        disk_cache = self._disk_cache if persist else None
+
+        if missing and disk_cache is not None:
+            stored, near = await asyncio.to_thread(
+                self._disk_lookup, model, [inputs[j] for j in missing]
+            )
+            # Counted here, on the event loop, rather than in the worker thread
+            self._near_dup_hits += len(near)
+            missing = self._fill_from_disk(keys, inputs, vectors, missing, stored, near)
+
+        if missing:
+            texts = [inputs[j] for j in missing]
+            fresh = await self._request_many_async(texts, model)
+            for j, vector in zip(missing, fresh):
+                vectors[j] = vector
+                self._cache_put(keys[j], vector, inputs[j])
+            if disk_cache is not None:
+                await asyncio.to_thread(self._disk_store, model, texts, fresh)
+
+        return vectors
+
+    def _disk_lookup(
+        self,
+        model: str,
+        texts: List[str]
+    ) -> Tuple[List[Optional[np.ndarray]], Set[int]]:
+        """
+        Look up texts in the persistent store (blocking).
+
+        Texts not stored under their exact hash fall back to a near-duplicate
+        match when EMBEDDING_NEAR_DUP_DISTANCE is set. Matches are written back
+        under the new text's hash so the next lookup is exact, but without a
+        fingerprint: only texts that were actually embedded anchor
+        near-duplicate matches, so chained small edits can't keep reusing an
+        embedding that drifts further from the text.
+
+        Args:
+            model: Embedding model to use
+            texts: Texts missing from the in-process cache
+
+        Returns:
+            Tuple of (stored vector for each text, None where it still needs
+            embedding; positions whose vector came from a near-duplicate)
+        """
+        stored = self._disk_cache.get_many(model, texts)
+
+        max_distance = settings.EMBEDDING_NEAR_DUP_DISTANCE
+        pending = [i for i, vector in enumerate(stored) if vector is None]
+        if max_distance <= 0 or not pending:
+            return stored, set()
+
+        fingerprints = [simhash(texts[i]) for i in pending]
+        near = self._disk_cache.find_near_duplicates(model, fingerprints, max_distance)
+        reused = [(i, vector) for i, vector in zip(pending, near) if vector is not None]
+
+        if reused:
+            for i, vector in reused:
+                stored[i] = vector
+            self._disk_cache.put_many(
+                model,
+                [texts[i] for i, _ in reused],
+                [vector for _, vector in reused]
+            )
+            logger.info(f"Reused {len(reused)} stored embeddings of near-duplicate chunks")
+
+        return stored, {i for i, _ in reused}
+
+    def _disk_store(self, model: str, texts: List[str], vectors: List[np.ndarray]) -> None:
+        """
+        Write fresh embeddings to the persistent store (blocking).
+
+        Args:
+            model: Embedding model the vectors come from
+            texts: Embedded texts
+            vectors: Embedding for each text
+        """
+        fingerprints = None
+        if settings.EMBEDDING_NEAR_DUP_DISTANCE > 0:
+            fingerprints = [simhash(text) for text in texts]
+        self._disk_cache.put_many(model, texts, vectors, fingerprints)
+
+    def _fill_from_disk(
+        self,
+        keys: List[Tuple[str, str]],
+        inputs: List[str],
+        vectors: List[Optional[np.ndarray]],
+        missing: List[int],
+        stored: List[Optional[np.ndarray]],
+        near: Set[int]
+    ) -> List[int]:
+        """
+        Copy embeddings found in the persistent store into vectors and the LRU.
+
+        Vectors reused from a near-duplicate are not added to the SimHash
+        index, for the same reason they are stored without a fingerprint.
+
+        Args:
+            keys: LRU cache keys for inputs
+            inputs: Texts being embedded
+            vectors: Output vectors (updated in place)
+            missing: Positions not found in the LRU
+            stored: Persistent store result for each missing position
+            near: Indexes into stored whose vector came from a near-duplicate
+
+        Returns:
+            Positions that still need embedding
+        """
+        still_missing = []
+        for k, (j, vector) in enumerate(zip(missing, stored)):
+            if vector is None:
+                still_missing.append(j)
+            else:
+                vectors[j] = vector
+                self._cache_put(keys[j], vector, None if k in near else inputs[j])
+        return still_missing
+
+    def _request_many(self, inputs: List[str], model: str) -> List[np.ndarray]:
+        """
+        Embed several texts in one request to Ollama's /api/embed endpoint.
+
+        The request goes over plain httpx so the response is decoded by orjson
+        rather than the ollama client's stdlib json. Falls back to one
+        /api/embeddings request per text if the server does not support batch
+        embedding.
+
+        Args:
+            inputs: Non-empty texts to embed
+            model: Embedding model to use
+
+        Returns:
+            Embedding vectors in input order
+        """
+        try:
+            response = self.http.post(
+                '/api/embed',
+                content=self._embed_payload(inputs, model),
+                headers={'Content-Type': 'application/json'}
+            )
+            matrix = self._decode_embeddings(response, len(inputs))
+            if matrix is not None:
+                return list(matrix)
+            logger.warning("Batch embed returned no embeddings, falling back to per-text requests")
+        except ResponseError as e:
+            # Only a missing /api/embed endpoint falls back; other errors go to the batch sizer
+            if e.status_code != 404:
+                raise
+            logger.warning(f"Batch embed unavailable ({e}), falling back to per-text requests")
+
+        return [self.generate_embedding(text, model) for text in inputs]
+
+    async def _request_many_async(self, inputs: List[str], model: str) -> List[np.ndarray]:
+        """
+        Embed several texts in one request to Ollama's /api/embed endpoint (async).
+
+        The response is decoded and converted to float32 in a worker thread so
+        large batches don't stall the event loop. Falls back to concurrent
+        /api/embeddings requests (one per text, bounded by
+        OLLAMA_MAX_CONCURRENCY) if the server does not support batch embedding.
+
+        Args:
+            inputs: Non-empty texts to embed
+            model: Embedding model to use
+
+        Returns:
+            Embedding vectors in input order
+        """
+        try:
+            async with _ollama_semaphore():
+                response = await self.async_http.post(
+                    '/api/embed',
+                    content=self._embed_payload(inputs, model),
+                    headers={'Content-Type': 'application/json'}
+                )
+            matrix = await asyncio.to_thread(self._decode_embeddings, response, len(inputs))
+            if matrix is not None:
+                return list(matrix)
+            logger.warning("Batch embed returned no embeddings, falling back to per-text requests")
+        except ResponseError as e:
+            # Only a missing /api/embed endpoint falls back; other errors go to the batch sizer
+            if e.status_code != 404:
+                raise
+            logger.warning(f"Batch embed unavailable ({e}), falling back to per-text requests")
+
+        results = await asyncio.gather(
+            *(self.generate_embedding_async(text, model) for text in inputs),
+            return_exceptions=True
+        )
+
+        # Surface the first failure once every request has settled
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        return results
 
     def get_embedding_dimension(self, model: Optional[str] = None) -> int:
         """
@@ -271,10 +1151,14 @@ class EmbeddingService:
         """
         model = model or self.model
 
+        if model in self._dimensions:
+            return self._dimensions[model]
+
         try:
             # Generate a sample embedding to get dimension
             sample_embedding = self.generate_embedding("test", model)
             dimension = len(sample_embedding)
+            self._dimensions[model] = dimension
 
             logger.info(f"Model {model} produces embeddings of dimension {dimension}")
             return dimension
@@ -285,8 +1169,8 @@ class EmbeddingService:
 
     @staticmethod
     def cosine_similarity(
-        embedding1: List[float],
-        embedding2: List[float]
+        embedding1: Union[List[float], np.ndarray],
+        embedding2: Union[List[float], np.ndarray]
     ) -> float:
         """
         Calculate cosine similarity between two embeddings.
@@ -301,27 +1185,24 @@ class EmbeddingService:
         Raises:
             ValueError: If embeddings have different dimensions
         """
-        if len(embedding1) != len(embedding2):
+        # float32 views (no copy if already float32 arrays)
+        vec1 = np.asarray(embedding1, dtype=np.float32)
+        vec2 = np.asarray(embedding2, dtype=np.float32)
+
+        if vec1.shape != vec2.shape:
             raise ValueError(
-                f"Embedding dimensions don't match: {len(embedding1)} vs {len(embedding2)}"
+                f"Embedding dimensions don't match: {len(vec1)} vs {len(vec2)}"
             )
 
-        # Convert to numpy arrays for efficient computation
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
-
-        # Calculate cosine similarity
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+        norms = float(np.sqrt(vec1 @ vec1) * np.sqrt(vec2 @ vec2))
 
-        if norm1 == 0 or norm2 == 0:
+        if norms == 0:
             return 0.0
 
-        similarity = dot_product / (norm1 * norm2)
+        similarity = float(vec1 @ vec2) / norms
 
         # Ensure result is in [0, 1] range (handle floating point errors)
-        return float(np.clip(similarity, 0.0, 1.0))
+        return min(max(similarity, 0.0), 1.0)
 
     def switch_model(self, model_name: str) -> None:
         """
@@ -356,12 +1237,120 @@ class EmbeddingService:
             return False
 
 
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into batched calls.
+
+    Texts submitted within max_wait_ms of each other (up to max_batch) are
+    embedded with one generate_embeddings_batch_async call, so a burst of
+    queries costs one request to Ollama instead of one each. Cached texts
+    are answered immediately without waiting for a batch.
+    """
+
+    def __init__(
+        self,
+        service: EmbeddingService,
+        max_batch: int = 32,
+        max_wait_ms: float = 10.0
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            service: Embedding service used for the batched calls
+            max_batch: Maximum texts per batch
+            max_wait_ms: Longest a text waits for others to join its batch
+        """
+        self.service = service
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: set = set()
+
+    async def submit(self, text: str) -> np.ndarray:
+        """
+        Embed a text as part of the next batch.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector as a float32 array
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        # Strip once, as the batch path does, so both look up the same entry
+        text = text.strip()
+        if not text:
+            raise EmbeddingError("Cannot generate embedding for empty text")
+
+        # A miss is counted by the batch call that embeds the text
+        key = self.service._cache_key(self.service.model, text)
+        cached = self.service._cache_get(key, text, count_miss=False)
+        if cached is not None:
+            return cached
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        return await future
+
+    async def _run(self) -> None:
+        """Collect queued texts into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Skip callers that gave up while waiting
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            # Let the next batch fill up while this one is in flight
+            task = asyncio.create_task(self._flush(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Embed one batch and hand each row to its caller."""
+        try:
+            _, matrix = await self.service.generate_embeddings_batch_async(
+                [text for text, _ in batch],
+                batch_size=len(batch)
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug("Embedded a batch of %d queries", len(batch))
+        for row, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(matrix[row])
+
+
 # Create global embedding service instance
 embedding_service = EmbeddingService()
 
 
 # Convenience functions
-def generate_embedding(text: str, model: Optional[str] = None) -> List[float]:
+def generate_embedding(text: str, model: Optional[str] = None) -> np.ndarray:
     """
     Generate embedding for text.
 
@@ -375,7 +1364,7 @@ def generate_embedding(text: str, model: Optional[str] = None) -> List[float]:
     return embedding_service.generate_embedding(text, model)
 
 
-async def generate_embedding_async(text: str, model: Optional[str] = None) -> List[float]:
+async def generate_embedding_async(text: str, model: Optional[str] = None) -> np.ndarray:
     """
     Generate embedding for text (async).
 
@@ -392,18 +1381,18 @@ async def generate_embedding_async(text: str, model: Optional[str] = None) -> Li
 def generate_embeddings_batch(
     texts: List[str],
     model: Optional[str] = None,
-    batch_size: int = 10
-) -> List[List[float]]:
+    batch_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate embeddings for multiple texts.
 
     Args:
         texts: List of texts to embed
         model: Embedding model to use
-        batch_size: Batch size for processing
+        batch_size: Initial batch size (defaults to settings.OLLAMA_EMBED_BATCH_SIZE)
 
     Returns:
-        List of embedding vectors
+        Tuple of (indices of non-empty texts, embedding matrix)
     """
     return embedding_service.generate_embeddings_batch(texts, model, batch_size)
 
@@ -411,17 +1400,17 @@ def generate_embeddings_batch(
 async def generate_embeddings_batch_async(
     texts: List[str],
     model: Optional[str] = None,
-    batch_size: int = 10
-) -> List[List[float]]:
+    batch_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate embeddings for multiple texts (async).
 
     Args:
         texts: List of texts to embed
         model: Embedding model to use
-        batch_size: Batch size for processing
+        batch_size: Initial batch size (defaults to settings.OLLAMA_EMBED_BATCH_SIZE)
 
     Returns:
-        List of embedding vectors
+        Tuple of (indices of non-empty texts, embedding matrix)
     """
     return await embedding_service.generate_embeddings_batch_async(texts, model, batch_size)
@@ -8,31 +8,468 @@ This module provides a wrapper around the Ollama API for:
 - Error handling and connection management
 """
 
+import asyncio
+import json
 import logging
-from typing import Optional, Dict, List, AsyncGenerator, Any
+import time
+import types
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import (
+    Optional, Dict, List, AsyncGenerator, AsyncIterator, Any, Tuple,
+    Awaitable, Callable, Deque, Mapping, TypeVar
+)
+import httpx
+import orjson
 import ollama
-from ollama import AsyncClient, Client
+import ollama._client
+from ollama import AsyncClient
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def _orjson_loads(s: Any, **kwargs) -> Any:
+    """json.loads() replacement using orjson for plain calls."""
+    if kwargs:
+        return json.loads(s, **kwargs)
+    return orjson.loads(s)
+
+
+def _install_orjson_decoder() -> None:
+    """
+    Make the ollama SDK parse streamed NDJSON chunks with orjson.
+
+    The SDK calls json.loads() on every line of a streamed generate/chat
+    response (one per token). Its module-level json reference is swapped for
+    a copy of the stdlib json module whose loads() uses orjson; everything
+    else, including JSONDecodeError (orjson's is a subclass), is unchanged.
+
+    This relies on SDK internals, so requirements.txt caps ollama below 0.7
+    and nothing is patched if the SDK no longer imports the stdlib json
+    module there.
+    """
+    if getattr(ollama._client, 'json', None) is not json:
+        logger.debug("ollama SDK json hook not found, keeping stdlib json")
+        return
+
+    shim = types.ModuleType(json.__name__)
+    shim.__dict__.update(json.__dict__)
+    shim.loads = _orjson_loads
+    ollama._client.json = shim
+
+
+_install_orjson_decoder()
+
+# Keep-alive pool shared by generate/chat/list calls. Reads have no timeout
+# because streamed generations can legitimately run for minutes.
+OLLAMA_HTTP_LIMITS = httpx.Limits(
+    max_connections=settings.OLLAMA_POOL_MAX,
+    max_keepalive_connections=max(1, settings.OLLAMA_POOL_MAX // 2),
+    keepalive_expiry=30
+)
+OLLAMA_HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=None, write=30.0, pool=5.0)
+OLLAMA_HTTP_HEADERS = {"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"}
+
+# Seconds a failed connection check is reused before probing again
+CONNECTION_FAILURE_TTL = 1.0
+
+# Fields read from each entry of Ollama's model list
+_model_fields = attrgetter('model', 'size', 'modified_at', 'digest')
+
+# One pooled AsyncClient per Ollama host, shared by every OllamaClient instance.
+# Always go through get_async_client(): a closed client is replaced here, so
+# nothing should keep its own reference.
+async_clients: Dict[str, AsyncClient] = {}
+
+
+def get_async_client(host: str) -> AsyncClient:
+    """
+    Get or create the pooled async Ollama client for a host.
+
+    Args:
+        host: Ollama server URL
+
+    Returns:
+        AsyncClient backed by a keep-alive httpx connection pool
+    """
+    client = async_clients.get(host)
+    if client is None:
+        # Extra kwargs are forwarded by the ollama SDK to httpx.AsyncClient.
+        # httpx decodes gzip/deflate transparently; Ollama itself does not
+        # compress, but a compressing reverse proxy in front of a remote
+        # OLLAMA_HOST can then shrink model listings and long generations.
+        client = AsyncClient(
+            host=host,
+            timeout=OLLAMA_HTTP_TIMEOUT,
+            limits=OLLAMA_HTTP_LIMITS,
+            headers=OLLAMA_HTTP_HEADERS
+        )
+        async_clients[host] = client
+    return client
+
+
+async def close_async_client(host: str) -> None:
+    """
+    Close the pooled async Ollama client for a host.
+
+    The next get_async_client() call for the host opens a new pool.
+
+    Args:
+        host: Ollama server URL
+    """
+    client = async_clients.pop(host, None)
+    if client is not None:
+        await client.close()
+
+
+# Streamed text is buffered until it reaches this many characters, or until
+# the oldest buffered piece has waited this long
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.02
+
+
+async def coalesce_stream(
+    pieces: AsyncIterator[str],
+    min_chars: int = STREAM_FLUSH_CHARS,
+    interval: float = STREAM_FLUSH_INTERVAL
+) -> AsyncGenerator[str, None]:
+    """
+    Merge small streamed text pieces into fewer, larger ones.
+
+    Ollama emits one chunk per token, so forwarding each one costs an await
+    and a socket write per few bytes. Pieces are joined until min_chars is
+    reached or interval has passed since the first buffered piece; a pending
+    buffer is flushed on time even if the model stalls.
+
+    Args:
+        pieces: Source of text pieces
+        min_chars: Buffered length that triggers a flush
+        interval: Maximum seconds a piece is held back
+
+    Yields:
+        Joined text
+    """
+    loop = asyncio.get_running_loop()
+    iterator = pieces.__aiter__()
+    buffer: List[str] = []
+    size = 0
+    deadline = 0.0
+    pending: Optional[asyncio.Future] = None
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            timeout = max(0.0, deadline - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+            if not done:
+                # Model is slow: don't hold back what we already have
+                yield ''.join(buffer)
+                buffer, size = [], 0
+                continue
+
+            finished, pending = pending, None
+            try:
+                piece = finished.result()
+            except StopAsyncIteration:
+                break
+
+            if not piece:
+                continue
+
+            if not buffer:
+                deadline = loop.time() + interval
+            buffer.append(piece)
+            size += len(piece)
+
+            if size >= min_chars or loop.time() >= deadline:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+
+        if buffer:
+            yield ''.join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+# Sampling temperature used when callers don't pass one, and the accepted range
+DEFAULT_TEMPERATURE = 0.7
+MAX_TEMPERATURE = 2.0
+
+# Shared read-only options for requests that use all the defaults
+_DEFAULT_OPTIONS = MappingProxyType({"temperature": DEFAULT_TEMPERATURE})
+
+
+def build_options(
+    temperature: float,
+    max_tokens: Optional[int],
+    extra: Dict[str, Any]
+) -> Mapping[str, Any]:
+    """
+    Assemble the Ollama options dict for a request.
+
+    Keys are sorted so identical settings always serialize to the same
+    request body, whatever order the caller passed them in. Ollama reuses a
+    loaded model and its cached prompt prefix only while options like
+    num_ctx stay the same; keep the system prompt identical across requests
+    too (varying temperature is fine).
+
+    Args:
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate (num_predict), if set
+        extra: Additional Ollama options (override the above)
+
+    Returns:
+        Options mapping with sorted keys (a shared read-only mapping when
+        every value is the default)
+    """
+    if not max_tokens and not extra and temperature == DEFAULT_TEMPERATURE:
+        return _DEFAULT_OPTIONS
+
+    if max_tokens:
+        options = {"temperature": temperature, "num_predict": max_tokens, **extra}
+    else:
+        options = {"temperature": temperature, **extra}
+    return dict(sorted(options.items()))
+
 
 class OllamaClientError(Exception):
     """Custom exception for Ollama client errors"""
     pass
 
 
+class OllamaOverloadedError(OllamaClientError):
+    """Raised when too many requests are already waiting for Ollama"""
+    pass
+
+
+def is_overloaded(error: BaseException) -> bool:
+    """
+    Check whether an error was caused by Ollama admission control.
+
+    Services wrap client errors in their own exceptions, so the whole cause
+    chain is inspected.
+
+    Args:
+        error: Exception to inspect
+
+    Returns:
+        True if an OllamaOverloadedError is in the cause chain
+    """
+    while error is not None:
+        if isinstance(error, OllamaOverloadedError):
+            return True
+        error = error.__cause__
+    return False
+
+
+def _validate_generation_params(temperature: float, max_tokens: Optional[int]) -> None:
+    """
+    Reject bad parameters before paying for an Ollama round-trip.
+
+    Args:
+        temperature: Sampling temperature (0.0 to MAX_TEMPERATURE)
+        max_tokens: Maximum tokens to generate, if set (must be positive)
+
+    Raises:
+        OllamaClientError: If either parameter is out of range
+    """
+    if not 0.0 <= temperature <= MAX_TEMPERATURE or (max_tokens is not None and max_tokens <= 0):
+        raise OllamaClientError(
+            f"Invalid generation parameters: temperature={temperature}, max_tokens={max_tokens}"
+        )
+
+
+class RequestScheduler:
+    """
+    Fair scheduler for Ollama generate/chat requests, streaming or not.
+
+    Callers wait per (model, user) and are granted slots round-robin across
+    queues, so a caller submitting many prompts cannot hold up everyone else.
+    At most max_parallel slots are held at once, matching the number of
+    requests Ollama serves in parallel per model (OLLAMA_NUM_PARALLEL), and at
+    most max_queued callers may wait; beyond that new requests are rejected so
+    tail latency stays bounded.
+
+    A slot is held by the caller's own task, so cancelling the caller also
+    cancels its Ollama request and frees the slot. Ollama's API takes one
+    prompt per request, so requests are scheduled rather than merged into a
+    single batched call.
+    """
+
+    def __init__(self, max_parallel: int, max_queued: int):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_parallel: Maximum concurrent requests sent to Ollama
+            max_queued: Maximum requests waiting for a slot
+        """
+        self.max_parallel = max(1, max_parallel)
+        self.max_queued = max_queued
+        self._queued = 0
+        self._active = 0
+        self._queues: Dict[Tuple[str, str], Deque[asyncio.Future]] = {}
+        self._order: Deque[Tuple[str, str]] = deque()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_parallel)
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for a slot."""
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently sent to Ollama."""
+        return self._active
+
+    @asynccontextmanager
+    async def slot(self, model: str, user_id: str) -> AsyncIterator[None]:
+        """
+        Wait for a slot and hold it for the duration of the block.
+
+        Streaming requests hold their slot until the stream is closed.
+
+        Args:
+            model: Model the request targets
+            user_id: Caller the request is accounted to
+
+        Raises:
+            OllamaOverloadedError: If max_queued requests are already waiting
+        """
+        if self._queued >= self.max_queued:
+            raise OllamaOverloadedError(
+                f"Ollama is overloaded ({self._queued} requests waiting), try again later"
+            )
+
+        grant = asyncio.get_running_loop().create_future()
+
+        key = (model, user_id)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = deque()
+            self._order.append(key)
+        queue.append(grant)
+        self._queued += 1
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+        try:
+            await grant
+        except asyncio.CancelledError:
+            # The slot may have been granted just as the caller gave up
+            if grant.done() and not grant.cancelled():
+                self._release()
+            raise
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def submit(
+        self,
+        model: str,
+        user_id: str,
+        request: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Queue a request and wait for its result.
+
+        Args:
+            model: Model the request targets
+            user_id: Caller the request is accounted to
+            request: Zero-argument callable that performs the request
+
+        Returns:
+            Result of the request
+
+        Raises:
+            OllamaOverloadedError: If max_queued requests are already waiting
+        """
+        async with self.slot(model, user_id):
+            return await request()
+
+    def _release(self) -> None:
+        """Return a granted slot."""
+        self._active -= 1
+        self._slots.release()
+
+    async def _run(self) -> None:
+        """Grant slots to waiting callers round-robin as they free up."""
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while self._order:
+                    await self._slots.acquire()
+
+                    key = self._order.popleft()
+                    queue = self._queues[key]
+                    grant = queue.popleft()
+                    self._queued -= 1
+                    if queue:
+                        self._order.append(key)
+                    else:
+                        del self._queues[key]
+
+                    # Caller gave up while queued
+                    if grant.done():
+                        self._slots.release()
+                        continue
+
+                    self._active += 1
+                    grant.set_result(None)
+        finally:
+            # Cancelled (e.g. at shutdown): don't leave callers waiting forever
+            for queue in self._queues.values():
+                for grant in queue:
+                    if not grant.done():
+                        grant.set_exception(OllamaClientError("Request scheduler stopped"))
+            self._queues.clear()
+            self._order.clear()
+            self._queued = 0
+
+
+# Shared by every OllamaClient so fairness and the parallel limit are global
+request_scheduler = RequestScheduler(settings.OLLAMA_NUM_PARALLEL, settings.OLLAMA_MAX_QUEUED)
+
+
 class OllamaClient:
     """
     Wrapper class for Ollama API operations.
 
-    Provides both synchronous and asynchronous methods for:
+    All requests are asynchronous; there is no synchronous Ollama client.
+    Provides methods for:
     - Model listing and information
     - Text generation (blocking and streaming)
     - Connection health checks
     - Model switching
     """
 
+    __slots__ = (
+        'host',
+        'default_model',
+        '_models_cache',
+        '_models_ttl',
+        '_models_lock',
+        '_connection_down_until',
+    )
+
     def __init__(
         self,
         host: Optional[str] = None,
@@ -48,39 +485,47 @@ class OllamaClient:
         self.host = host or settings.OLLAMA_HOST
         self.default_model = default_model or settings.OLLAMA_MODEL
 
-        # Initialize sync and async clients
-        self._client: Optional[Client] = None
-        self._async_client: Optional[AsyncClient] = None
+        # Short-lived cache of list_models(); the lock collapses concurrent misses
+        # into a single /api/tags request
+        self._models_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        self._models_ttl = 10.0
+        self._models_lock = asyncio.Lock()
 
-        logger.info(f"OllamaClient initialized with host={self.host}, model={self.default_model}")
+        # Monotonic time until which check_connection() reports the last failure
+        self._connection_down_until = 0.0
 
-    @property
-    def client(self) -> Client:
-        """Get or create synchronous Ollama client"""
-        if self._client is None:
-            self._client = Client(host=self.host)
-        return self._client
+        logger.info(f"OllamaClient initialized with host={self.host}, model={self.default_model}")
 
     @property
     def async_client(self) -> AsyncClient:
-        """Get or create asynchronous Ollama client"""
-        if self._async_client is None:
-            self._async_client = AsyncClient(host=self.host)
-        return self._async_client
+        """Get asynchronous Ollama client (pooled and shared per host)"""
+        return get_async_client(self.host)
+
+    async def aclose(self) -> None:
+        """Close the pooled connections for this client's host."""
+        await close_async_client(self.host)
 
     async def check_connection(self) -> bool:
         """
         Check if Ollama server is accessible.
 
+        Probes the running-models endpoint, which Ollama answers from memory,
+        rather than listing installed models from disk. A failed probe is
+        remembered for a second so a burst of health checks against a down
+        server doesn't each wait on a connect timeout.
+
         Returns:
             True if connection successful, False otherwise
         """
+        if time.monotonic() < self._connection_down_until:
+            return False
+
         try:
-            response = await self.async_client.list()
-            model_count = len(response.models) if hasattr(response, 'models') else 0
-            logger.info(f"Successfully connected to Ollama. Found {model_count} models.")
+            await self.async_client.ps()
+            logger.debug("Successfully connected to Ollama at %s", self.host)
             return True
         except Exception as e:
+            self._connection_down_until = time.monotonic() + CONNECTION_FAILURE_TTL
             logger.error(f"Failed to connect to Ollama at {self.host}: {str(e)}")
             return False
 
@@ -88,6 +533,47 @@ class OllamaClient:
         """
         List all available models.
 
+        Results are cached for a few seconds; pulling a model or switching the
+        default model invalidates the cache.
+
+        Returns:
+            List of model information dictionaries
+
+        Raises:
+            OllamaClientError: If unable to fetch models
+        """
+        cached = self._fresh_models()
+        if cached is not None:
+            return cached
+
+        async with self._models_lock:
+            # Another coroutine may have refreshed the cache while we waited
+            cached = self._fresh_models()
+            if cached is not None:
+                return cached
+
+            models = await self._fetch_models()
+            self._models_cache = (time.monotonic(), models)
+            return list(models)
+
+    def _fresh_models(self) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached model list if it has not expired."""
+        if self._models_cache is None:
+            return None
+
+        fetched_at, models = self._models_cache
+        if time.monotonic() - fetched_at >= self._models_ttl:
+            return None
+        return list(models)
+
+    def invalidate_models_cache(self) -> None:
+        """Drop the cached model list so the next call refetches it."""
+        self._models_cache = None
+
+    async def _fetch_models(self) -> List[Dict[str, Any]]:
+        """
+        Fetch the model list from Ollama.
+
         Returns:
             List of model information dictionaries
 
@@ -100,16 +586,17 @@ class OllamaClient:
             models_list = response.models
 
             # Convert model objects to dictionaries
-            models = []
-            for model in models_list:
-                models.append({
-                    'name': model.model,
-                    'size': model.size,
-                    'modified_at': str(model.modified_at) if model.modified_at else None,
-                    'digest': getattr(model, 'digest', None)
-                })
-
-            logger.info(f"Retrieved {len(models)} models from Ollama")
+            models = [
+                {
+                    'name': name,
+                    'size': size,
+                    'modified_at': str(modified_at) if modified_at else None,
+                    'digest': digest
+                }
+                for name, size, modified_at, digest in map(_model_fields, models_list)
+            ]
+
+            logger.info("Retrieved %d models from Ollama", len(models))
             return models
         except Exception as e:
             logger.error(f"Failed to list models: {str(e)}")
@@ -130,7 +617,7 @@ class OllamaClient:
         """
         try:
             response = await self.async_client.show(model_name)
-            logger.info(f"Retrieved info for model: {model_name}")
+            logger.info("Retrieved info for model: %s", model_name)
             return response
         except Exception as e:
             logger.error(f"Failed to get model info for {model_name}: {str(e)}")
@@ -141,55 +628,61 @@ class OllamaClient:
         prompt: str,
         model: Optional[str] = None,
         system: Optional[str] = None,
-        temperature: float = 0.7,
+        temperature: float = DEFAULT_TEMPERATURE,
         max_tokens: Optional[int] = None,
+        user_id: str = "default_user",
         **kwargs
     ) -> str:
         """
         Generate a response from the LLM (non-streaming).
 
+        Requests go through the shared RequestScheduler.
+
         Args:
             prompt: User prompt/question
             model: Model to use (defaults to self.default_model)
             system: System prompt to set context
-            temperature: Sampling temperature (0.0 to 1.0)
+            temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
+            user_id: Caller used for fair scheduling
             **kwargs: Additional parameters for Ollama API
 
         Returns:
             Generated text response
 
         Raises:
-            OllamaClientError: If generation fails
+            OllamaClientError: If parameters are invalid or generation fails
         """
+        _validate_generation_params(temperature, max_tokens)
+
         model = model or self.default_model
 
         try:
-            logger.info(f"Generating response with model={model}, temp={temperature}")
+            logger.info("Generating response with model=%s, temp=%s", model, temperature)
 
-            # Prepare options
-            options = {
-                "temperature": temperature,
-            }
-            if max_tokens:
-                options["num_predict"] = max_tokens
-
-            # Merge with additional kwargs
-            options.update(kwargs)
+            options = build_options(temperature, max_tokens, kwargs)
 
             # Call Ollama API
-            response = await self.async_client.generate(
-                model=model,
-                prompt=prompt,
-                system=system,
-                options=options,
-                stream=False
+            response = await request_scheduler.submit(
+                model,
+                user_id,
+                lambda: self.async_client.generate(
+                    model=model,
+                    prompt=prompt,
+                    system=system,
+                    options=options,
+                    stream=False
+                )
             )
 
-            generated_text = response.get('response', '')
-            logger.info(f"Generated {len(generated_text)} characters")
+            # GenerateResponse is a typed model; response is always present
+            generated_text = response.response or ''
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Generated %d characters", len(generated_text))
             return generated_text
 
+        except OllamaOverloadedError:
+            raise
         except Exception as e:
             logger.error(f"Generation failed: {str(e)}")
             raise OllamaClientError(f"Generation failed: {str(e)}")
@@ -199,113 +692,170 @@ class OllamaClient:
         prompt: str,
         model: Optional[str] = None,
         system: Optional[str] = None,
-        temperature: float = 0.7,
+        temperature: float = DEFAULT_TEMPERATURE,
         max_tokens: Optional[int] = None,
+        user_id: str = "default_user",
         **kwargs
     ) -> AsyncGenerator[str, None]:
         """
         Generate a streaming response from the LLM.
 
+        The stream holds a RequestScheduler slot until it is exhausted or
+        closed.
+
         Args:
             prompt: User prompt/question
             model: Model to use (defaults to self.default_model)
             system: System prompt to set context
-            temperature: Sampling temperature (0.0 to 1.0)
+            temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
+            user_id: Caller used for fair scheduling
             **kwargs: Additional parameters for Ollama API
 
         Yields:
             Text chunks as they are generated
 
         Raises:
-            OllamaClientError: If generation fails
+            OllamaOverloadedError: If too many requests are waiting for Ollama
+            OllamaClientError: If parameters are invalid or generation fails
         """
+        _validate_generation_params(temperature, max_tokens)
+
         model = model or self.default_model
 
         try:
-            logger.info(f"Starting streaming generation with model={model}, temp={temperature}")
-
-            # Prepare options
-            options = {
-                "temperature": temperature,
-            }
-            if max_tokens:
-                options["num_predict"] = max_tokens
-
-            # Merge with additional kwargs
-            options.update(kwargs)
-
-            # Stream from Ollama API
-            stream = await self.async_client.generate(
-                model=model,
-                prompt=prompt,
-                system=system,
-                options=options,
-                stream=True
-            )
+            logger.info("Starting streaming generation with model=%s, temp=%s", model, temperature)
+
+            options = build_options(temperature, max_tokens, kwargs)
+
+            async with request_scheduler.slot(model, user_id):
+                # Stream from Ollama API
+                stream = await self.async_client.generate(
+                    model=model,
+                    prompt=prompt,
+                    system=system,
+                    options=options,
+                    stream=True
+                )
 
-            # Yield chunks as they arrive
-            async for chunk in stream:
-                if 'response' in chunk:
-                    yield chunk['response']
+                async def pieces():
+                    async for chunk in stream:
+                        if 'response' in chunk:
+                            yield chunk['response']
 
-            logger.info("Streaming generation completed")
+                # Yield coalesced chunks as they arrive
+                async for text in coalesce_stream(pieces()):
+                    yield text
 
+            logger.debug("Streaming generation completed")
+
+        except OllamaOverloadedError:
+            raise
         except Exception as e:
             logger.error(f"Streaming generation failed: {str(e)}")
             raise OllamaClientError(f"Streaming generation failed: {str(e)}")
 
+    async def generate_stream_sse(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        system: Optional[str] = None,
+        temperature: float = DEFAULT_TEMPERATURE,
+        max_tokens: Optional[int] = None,
+        user_id: str = "default_user",
+        **kwargs
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Generate a streaming response framed as Server-Sent Events.
+
+        Each chunk is serialized straight to bytes with orjson (a JSON string,
+        so newlines inside tokens can't break the SSE framing) and can be
+        handed to the transport as-is.
+
+        Args:
+            prompt: User prompt/question
+            model: Model to use (defaults to self.default_model)
+            system: System prompt to set context
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
+            user_id: Caller used for fair scheduling
+            **kwargs: Additional parameters for Ollama API
+
+        Yields:
+            b"data: <json string>\n\n" frames
+
+        Raises:
+            OllamaOverloadedError: If too many requests are waiting for Ollama
+            OllamaClientError: If parameters are invalid or generation fails
+        """
+        async for text in self.generate_stream(
+            prompt=prompt,
+            model=model,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            user_id=user_id,
+            **kwargs
+        ):
+            yield b"data: " + orjson.dumps(text) + b"\n\n"
+
     async def chat(
         self,
         messages: List[Dict[str, str]],
         model: Optional[str] = None,
-        temperature: float = 0.7,
+        temperature: float = DEFAULT_TEMPERATURE,
         max_tokens: Optional[int] = None,
+        user_id: str = "default_user",
         **kwargs
     ) -> str:
         """
         Chat completion using message history (non-streaming).
 
+        Requests go through the shared RequestScheduler.
+
         Args:
             messages: List of message dicts with 'role' and 'content'
             model: Model to use (defaults to self.default_model)
-            temperature: Sampling temperature (0.0 to 1.0)
+            temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
+            user_id: Caller used for fair scheduling
             **kwargs: Additional parameters for Ollama API
 
         Returns:
             Generated response text
 
         Raises:
-            OllamaClientError: If chat fails
+            OllamaClientError: If parameters are invalid or chat fails
         """
+        _validate_generation_params(temperature, max_tokens)
+
         model = model or self.default_model
 
         try:
-            logger.info(f"Chat completion with model={model}, {len(messages)} messages")
-
-            # Prepare options
-            options = {
-                "temperature": temperature,
-            }
-            if max_tokens:
-                options["num_predict"] = max_tokens
+            logger.info("Chat completion with model=%s, %d messages", model, len(messages))
 
-            # Merge with additional kwargs
-            options.update(kwargs)
+            options = build_options(temperature, max_tokens, kwargs)
 
             # Call Ollama chat API
-            response = await self.async_client.chat(
-                model=model,
-                messages=messages,
-                options=options,
-                stream=False
+            response = await request_scheduler.submit(
+                model,
+                user_id,
+                lambda: self.async_client.chat(
+                    model=model,
+                    messages=messages,
+                    options=options,
+                    stream=False
+                )
             )
 
-            message_content = response.get('message', {}).get('content', '')
-            logger.info(f"Chat completed, generated {len(message_content)} characters")
+            # ChatResponse is a typed model; message is always present
+            message_content = response.message.content or ''
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Chat completed, generated %d characters", len(message_content))
             return message_content
 
+        except OllamaOverloadedError:
+            raise
         except Exception as e:
             logger.error(f"Chat failed: {str(e)}")
             raise OllamaClientError(f"Chat failed: {str(e)}")
@@ -314,63 +864,121 @@ class OllamaClient:
         self,
         messages: List[Dict[str, str]],
         model: Optional[str] = None,
-        temperature: float = 0.7,
+        temperature: float = DEFAULT_TEMPERATURE,
         max_tokens: Optional[int] = None,
+        user_id: str = "default_user",
         **kwargs
     ) -> AsyncGenerator[str, None]:
         """
         Chat completion with streaming response.
 
+        The stream holds a RequestScheduler slot until it is exhausted or
+        closed.
+
         Args:
             messages: List of message dicts with 'role' and 'content'
             model: Model to use (defaults to self.default_model)
-            temperature: Sampling temperature (0.0 to 1.0)
+            temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
+            user_id: Caller used for fair scheduling
             **kwargs: Additional parameters for Ollama API
 
         Yields:
             Text chunks as they are generated
 
         Raises:
-            OllamaClientError: If chat fails
+            OllamaOverloadedError: If too many requests are waiting for Ollama
+            OllamaClientError: If parameters are invalid or chat fails
         """
+        _validate_generation_params(temperature, max_tokens)
+
         model = model or self.default_model
 
         try:
-            logger.info(f"Starting streaming chat with model={model}, {len(messages)} messages")
-
-            # Prepare options
-            options = {
-                "temperature": temperature,
-            }
-            if max_tokens:
-                options["num_predict"] = max_tokens
-
-            # Merge with additional kwargs
-            options.update(kwargs)
-
-            # Stream from Ollama chat API
-            stream = await self.async_client.chat(
-                model=model,
-                messages=messages,
-                options=options,
-                stream=True
-            )
+            logger.info("Starting streaming chat with model=%s, %d messages", model, len(messages))
+
+            options = build_options(temperature, max_tokens, kwargs)
+
+            async with request_scheduler.slot(model, user_id):
+                # Stream from Ollama chat API
+                stream = await self.async_client.chat(
+                    model=model,
+                    messages=messages,
+                    options=options,
+                    stream=True
+                )
+
+                async def pieces():
+                    async for chunk in stream:
+                        if 'message' in chunk and 'content' in chunk['message']:
+                            yield chunk['message']['content']
 
-            # Yield chunks as they arrive
-            async for chunk in stream:
-                if 'message' in chunk and 'content' in chunk['message']:
-                    yield chunk['message']['content']
+                # Yield coalesced chunks as they arrive
+                async for text in coalesce_stream(pieces()):
+                    yield text
 
-            logger.info("Streaming chat completed")
+            logger.debug("Streaming chat completed")
 
+        except OllamaOverloadedError:
+            raise
         except Exception as e:
             logger.error(f"Streaming chat failed: {str(e)}")
             raise OllamaClientError(f"Streaming chat failed: {str(e)}")
 
-    async def pull_model(self, model_name: str) -> bool:
+    async def pull_model(self, model_name: str) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Pull/download a model from Ollama library, streaming progress.
+
+        Args:
+            model_name: Name of the model to pull
+
+        Ollama reports progress one layer (digest) at a time, so bytes are
+        summed over every layer seen so far. Layers announce their size only
+        when they start, so the percentage is kept from moving backwards.
+
+        Args:
+            model_name: Name of the model to pull
+
+        Yields:
+            Progress dicts with 'status', 'completed', 'total' (bytes across
+            all layers seen so far) and 'percent' (None when unknown)
+
+        Raises:
+            OllamaClientError: If the pull fails
         """
-        Pull/download a model from Ollama library.
+        try:
+            logger.info("Pulling model: %s", model_name)
+            stream = await self.async_client.pull(model_name, stream=True)
+
+            # digest -> (completed, total) bytes
+            layers: Dict[str, Tuple[int, int]] = {}
+            percent: Optional[float] = None
+
+            async for progress in stream:
+                if progress.digest and progress.total:
+                    layers[progress.digest] = (progress.completed or 0, progress.total)
+
+                completed = sum(done for done, _ in layers.values())
+                total = sum(size for _, size in layers.values())
+                if completed and total:
+                    percent = max(percent or 0.0, completed * 100.0 / total)
+
+                yield {
+                    'status': progress.status,
+                    'completed': completed,
+                    'total': total,
+                    'percent': percent
+                }
+
+            self.invalidate_models_cache()
+            logger.info("Successfully pulled model: %s", model_name)
+        except Exception as e:
+            logger.error(f"Failed to pull model {model_name}: {str(e)}")
+            raise OllamaClientError(f"Failed to pull model: {str(e)}")
+
+    async def pull_model_blocking(self, model_name: str) -> bool:
+        """
+        Pull/download a model and wait for it to finish.
 
         Args:
             model_name: Name of the model to pull
@@ -379,12 +987,10 @@ class OllamaClient:
             True if successful, False otherwise
         """
         try:
-            logger.info(f"Pulling model: {model_name}")
-            await self.async_client.pull(model_name)
-            logger.info(f"Successfully pulled model: {model_name}")
+            async for _ in self.pull_model(model_name):
+                pass
             return True
-        except Exception as e:
-            logger.error(f"Failed to pull model {model_name}: {str(e)}")
+        except OllamaClientError:
             return False
 
     def switch_model(self, model_name: str) -> None:
@@ -396,10 +1002,28 @@ class OllamaClient:
         """
         logger.info(f"Switching default model from {self.default_model} to {model_name}")
         self.default_model = model_name
+        self.invalidate_models_cache()
 
 
-# Create global instance
-ollama_client = OllamaClient()
+@lru_cache(maxsize=1)
+def get_ollama_client() -> OllamaClient:
+    """
+    Get the shared OllamaClient, created on first use.
+
+    Deferring construction means settings are read (and the connection pool
+    is set up) only once something actually talks to Ollama.
+
+    Returns:
+        Process-wide OllamaClient
+    """
+    return OllamaClient()
+
+
+def __getattr__(name: str) -> OllamaClient:
+    """Resolve the shared `ollama_client` lazily (PEP 562)."""
+    if name == "ollama_client":
+        return get_ollama_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Convenience functions for direct access
@@ -407,7 +1031,7 @@ async def generate_response(
     prompt: str,
     model: Optional[str] = None,
     system: Optional[str] = None,
-    temperature: float = 0.7,
+    temperature: float = DEFAULT_TEMPERATURE,
     **kwargs
 ) -> str:
     """
@@ -423,7 +1047,7 @@ async def generate_response(
     Returns:
         Generated text
     """
-    return await ollama_client.generate(
+    return await get_ollama_client().generate(
         prompt=prompt,
         model=model,
         system=system,
@@ -432,16 +1056,19 @@ async def generate_response(
     )
 
 
-async def generate_response_stream(
+def generate_response_stream(
     prompt: str,
     model: Optional[str] = None,
     system: Optional[str] = None,
-    temperature: float = 0.7,
+    temperature: float = DEFAULT_TEMPERATURE,
     **kwargs
 ) -> AsyncGenerator[str, None]:
     """
     Convenience function for streaming generation.
 
+    Returns the client's generator directly rather than re-yielding from it,
+    so each chunk crosses one generator frame instead of two.
+
     Args:
         prompt: User prompt
         model: Model to use
@@ -449,14 +1076,13 @@ async def generate_response_stream(
         temperature: Sampling temperature
         **kwargs: Additional parameters
 
-    Yields:
-        Text chunks
+    Returns:
+        Async generator of text chunks
     """
-    async for chunk in ollama_client.generate_stream(
+    return get_ollama_client().generate_stream(
         prompt=prompt,
         model=model,
         system=system,
         temperature=temperature,
         **kwargs
-    ):
-        yield chunk
+    )
@@ -7,19 +7,27 @@ This module orchestrates the complete RAG flow:
 3. Context preparation and prompt construction
 4. LLM response generation with source attribution
 5. Response streaming support
+6. Exact and semantic caching of answers to repeated questions
 """
 
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional, AsyncGenerator
 from dataclasses import dataclass
 
-from core.embeddings import EmbeddingService
+import numpy as np
+
+from core.embeddings import EmbeddingService, EmbeddingBatcher
 from core.vectorstore import VectorStore
-from core.llm import OllamaClient
+from core.llm import OllamaClient, get_ollama_client
+from core.semantic_cache import SemanticCache, semantic_cache
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Chat history messages sent to the LLM with each question
+DEFAULT_MAX_HISTORY = 5
+
 
 class RAGError(Exception):
     """Raised when RAG pipeline encounters an error."""
@@ -130,6 +138,12 @@ Question: {question}
 
 Please answer the question based on the context provided above. If you reference specific information, indicate which part of the context it comes from."""
 
+    # Template split once around its placeholders, so building a prompt is a
+    # join instead of re-parsing the template with .format() on every query
+    _CONTEXT_PREFIX, _rest = CONTEXT_PROMPT_TEMPLATE.split("{context}")
+    _CONTEXT_MIDDLE, _CONTEXT_SUFFIX = _rest.split("{question}")
+    del _rest
+
     def __init__(
         self,
         embedding_service: Optional[EmbeddingService] = None,
@@ -137,7 +151,8 @@ Please answer the question based on the context provided above. If you reference
         llm_client: Optional[OllamaClient] = None,
         top_k: int = 5,
         min_relevance_score: float = 0.3,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        answer_cache: Optional[SemanticCache] = None
     ):
         """
         Initialize RAG pipeline.
@@ -149,10 +164,22 @@ Please answer the question based on the context provided above. If you reference
             top_k: Number of documents to retrieve (default: 5)
             min_relevance_score: Minimum relevance score threshold (default: 0.3)
             system_prompt: Custom system prompt (defaults to DEFAULT_SYSTEM_PROMPT)
+            answer_cache: Cache for generated answers (defaults to the shared cache,
+                which the vector store invalidates on writes)
         """
         self.embedding_service = embedding_service or EmbeddingService()
         self.vector_store = vector_store or VectorStore()
-        self.llm_client = llm_client or OllamaClient()
+        # Resolved on first use (see llm_client) so importing this module does not
+        # create the Ollama client
+        self._llm_client = llm_client
+        self.answer_cache = answer_cache or semantic_cache
+
+        # Concurrent queries share batched embedding requests
+        self.batcher = EmbeddingBatcher(
+            self.embedding_service,
+            max_batch=settings.EMBEDDING_QUERY_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_QUERY_BATCH_WAIT_MS
+        )
 
         self.top_k = top_k
         self.min_relevance_score = min_relevance_score
@@ -163,12 +190,18 @@ Please answer the question based on the context provided above. If you reference
             f"min_relevance_score={min_relevance_score}"
         )
 
+    @property
+    def llm_client(self) -> OllamaClient:
+        """LLM client passed to the constructor, or the shared OllamaClient."""
+        return self._llm_client or get_ollama_client()
+
     async def retrieve_context(
         self,
         query: str,
         project_id: int,
         top_k: Optional[int] = None,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[RetrievedDocument]:
         """
         Retrieve relevant documents for a query.
@@ -178,6 +211,7 @@ Please answer the question based on the context provided above. If you reference
             project_id: Project to search within
             top_k: Number of documents to retrieve (overrides default)
             metadata_filter: Optional metadata filter for ChromaDB
+            query_embedding: Precomputed embedding of the query (generated if omitted)
 
         Returns:
             List of retrieved documents with relevance scores
@@ -190,44 +224,54 @@ Please answer the question based on the context provided above. If you reference
 
             logger.info(f"Retrieving context for query in project {project_id}, top_k={k}")
 
-            # Generate query embedding
-            query_embedding = await self.embedding_service.generate_embedding_async(query)
+            if query_embedding is None:
+                # Fetch the collection while the query embedding is generated
+                embedding_task = asyncio.ensure_future(self.batcher.submit(query))
+                try:
+                    collection = await asyncio.to_thread(
+                        self.vector_store.get_or_create_collection, project_id
+                    )
+                except BaseException:
+                    embedding_task.cancel()
+                    raise
+                query_embedding = await embedding_task
+            else:
+                collection = self.vector_store.get_or_create_collection(project_id)
 
             # Search vector store
-            results = self.vector_store.search(
-                project_id=project_id,
-                query_embedding=query_embedding,
+            results = self.vector_store.search_with_collection(
+                collection,
+                query_embedding,
                 n_results=k,
                 where=metadata_filter
             )
 
-            # Parse results into RetrievedDocument objects
-            documents = []
-            for i, (doc_id, content, metadata, distance) in enumerate(zip(
-                results['ids'],
-                results['documents'],
-                results['metadatas'],
-                results['distances']
-            )):
-                retrieved_doc = RetrievedDocument(
-                    id=doc_id,
-                    content=content,
-                    metadata=metadata or {},
-                    distance=distance
+            # Filter by minimum relevance score in one vectorized pass
+            # (same conversion as RetrievedDocument.score)
+            distances = np.asarray(results['distances'], dtype=np.float64)
+            scores = np.clip(1.0 - distances, 0.0, 1.0)
+            keep = np.flatnonzero(scores >= self.min_relevance_score)
+
+            # Only build RetrievedDocument objects for the survivors
+            ids = results['ids']
+            contents = results['documents']
+            metadatas = results['metadatas']
+            documents = [
+                RetrievedDocument(
+                    id=ids[i],
+                    content=contents[i],
+                    metadata=metadatas[i] or {},
+                    distance=results['distances'][i]
+                )
+                for i in keep.tolist()
+            ]
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Relevance scores: %s (threshold %s)",
+                    np.round(scores, 3).tolist(),
+                    self.min_relevance_score
                 )
-
-                # Filter by minimum relevance score
-                if retrieved_doc.score >= self.min_relevance_score:
-                    documents.append(retrieved_doc)
-                    logger.debug(
-                        f"Retrieved doc {i+1}: score={retrieved_doc.score:.3f}, "
-                        f"distance={distance:.3f}"
-                    )
-                else:
-                    logger.debug(
-                        f"Filtered out doc {i+1}: score={retrieved_doc.score:.3f} "
-                        f"< threshold {self.min_relevance_score}"
-                    )
 
             logger.info(
                 f"Retrieved {len(documents)} documents "
@@ -259,26 +303,26 @@ Please answer the question based on the context provided above. If you reference
             logger.warning("No context documents provided, using query only")
             return query
 
-        # Format context documents
+        # Format context documents, each with its source attribution header
         context_parts = []
         for i, doc in enumerate(documents, 1):
-            # Add source attribution info in context
-            source_info = f"[Source {i}"
-            if doc.document_id:
-                source_info += f", Document ID: {doc.document_id}"
-            if doc.chunk_index is not None:
-                source_info += f", Chunk: {doc.chunk_index}"
-            source_info += f", Relevance: {doc.score:.2f}]"
-
-            context_parts.append(f"{source_info}\n{doc.content}\n")
-
-        context_text = "\n---\n\n".join(context_parts)
+            document_id = doc.document_id
+            chunk_index = doc.chunk_index
+            context_parts.append(
+                f"[Source {i}"
+                f"{f', Document ID: {document_id}' if document_id else ''}"
+                f"{f', Chunk: {chunk_index}' if chunk_index is not None else ''}"
+                f", Relevance: {doc.score:.2f}]\n{doc.content}\n"
+            )
 
         # Inject into template
-        prompt = self.CONTEXT_PROMPT_TEMPLATE.format(
-            context=context_text,
-            question=query
-        )
+        prompt = "".join((
+            self._CONTEXT_PREFIX,
+            "\n---\n\n".join(context_parts),
+            self._CONTEXT_MIDDLE,
+            query,
+            self._CONTEXT_SUFFIX
+        ))
 
         logger.debug(f"Built prompt with {len(documents)} context documents")
 
@@ -289,7 +333,7 @@ Please answer the question based on the context provided above. If you reference
         query: str,
         documents: List[RetrievedDocument],
         chat_history: Optional[List[Dict[str, str]]] = None,
-        max_history: int = 5
+        max_history: int = DEFAULT_MAX_HISTORY
     ) -> List[Dict[str, str]]:
         """
         Build chat messages array with system prompt, history, and context.
@@ -335,11 +379,17 @@ Please answer the question based on the context provided above. If you reference
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        user_id: str = "default_user"
     ) -> RAGResponse:
         """
         Generate an answer using the RAG pipeline (non-streaming).
 
+        Answers are cached per project, recent chat history and generation
+        settings. A repeated question is served from the exact-match tier; a
+        near-identical one (by query embedding) from the semantic tier, which
+        skips retrieval and generation entirely.
+
         Args:
             query: User question
             project_id: Project context for retrieval
@@ -348,6 +398,7 @@ Please answer the question based on the context provided above. If you reference
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             metadata_filter: Optional filter for document retrieval
+            user_id: Caller the LLM request is scheduled for
 
         Returns:
             RAG response with answer and sources
@@ -358,11 +409,36 @@ Please answer the question based on the context provided above. If you reference
         try:
             logger.info(f"Generating RAG answer for query in project {project_id}")
 
+            model_name = model or self.llm_client.default_model
+            cache = self.answer_cache
+            cache_key = None
+            query_embedding = None
+
+            # Step 0: Serve repeated and near-identical questions from the cache
+            if cache.enabled:
+                # Documents may change while we retrieve and generate; read the
+                # project's invalidation count first so a stale answer isn't stored
+                generation = cache.generation(project_id)
+                cache_key, scope = cache.make_key(
+                    project_id,
+                    query,
+                    (chat_history or [])[-DEFAULT_MAX_HISTORY:],
+                    (model_name, temperature, max_tokens, metadata_filter)
+                )
+                cached = cache.get(cache_key)
+                if cached is None:
+                    query_embedding = await self.batcher.submit(query)
+                    cached = cache.lookup(scope, query_embedding)
+                if cached is not None:
+                    logger.info("Serving cached RAG answer")
+                    return cached
+
             # Step 1: Retrieve context
             documents = await self.retrieve_context(
                 query=query,
                 project_id=project_id,
-                metadata_filter=metadata_filter
+                metadata_filter=metadata_filter,
+                query_embedding=query_embedding
             )
 
             if not documents:
@@ -378,12 +454,12 @@ Please answer the question based on the context provided above. If you reference
             )
 
             # Step 3: Generate response
-            model_name = model or self.llm_client.default_model
             answer = await self.llm_client.chat(
                 messages=messages,
                 model=model_name,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                user_id=user_id
             )
 
             # Step 4: Create response object
@@ -398,6 +474,16 @@ Please answer the question based on the context provided above. If you reference
                 f"with {len(documents)} sources"
             )
 
+            if cache_key is not None:
+                cache.put(
+                    cache_key,
+                    scope,
+                    project_id,
+                    query_embedding,
+                    response,
+                    generation=generation
+                )
+
             return response
 
         except Exception as e:
@@ -412,7 +498,8 @@ Please answer the question based on the context provided above. If you reference
         model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        user_id: str = "default_user"
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Generate an answer using the RAG pipeline with streaming.
@@ -430,6 +517,7 @@ Please answer the question based on the context provided above. If you reference
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             metadata_filter: Optional filter for document retrieval
+            user_id: Caller the LLM request is scheduled for
 
         Yields:
             Stream events with answer chunks and metadata
@@ -475,7 +563,8 @@ Please answer the question based on the context provided above. If you reference
                 messages=messages,
                 model=model_name,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                user_id=user_id
             ):
                 yield {
                     'type': 'token',
@@ -506,7 +595,8 @@ Please answer the question based on the context provided above. If you reference
         self,
         top_k: Optional[int] = None,
         min_relevance_score: Optional[float] = None,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        query_batch_size: Optional[int] = None
     ) -> None:
         """
         Update RAG pipeline configuration.
@@ -515,6 +605,7 @@ Please answer the question based on the context provided above. If you reference
             top_k: New top_k value
             min_relevance_score: New relevance threshold
             system_prompt: New system prompt
+            query_batch_size: New maximum queries per batched embedding request
         """
         if top_k is not None:
             self.top_k = top_k
@@ -528,6 +619,10 @@ Please answer the question based on the context provided above. If you reference
             self.system_prompt = system_prompt
             logger.info("Updated system prompt")
 
+        if query_batch_size is not None:
+            self.batcher.max_batch = max(1, query_batch_size)
+            logger.info(f"Updated query_batch_size to {query_batch_size}")
+
 
 # Global RAG pipeline instance
 rag_pipeline = RAGPipeline()
@@ -0,0 +1,305 @@
+"""
+Semantic answer cache for the RAG pipeline.
+
+This module provides:
+- An exact-match LRU for answers keyed on project, query, chat history and
+  generation settings
+- A similarity tier that reuses an answer when a new query embedding is
+  nearly identical (cosine) to a cached one in the same scope
+- TTL expiry and per-project invalidation when a project's documents change
+"""
+
+import copy
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Two-tier LRU cache for RAG responses.
+
+    Cached query embeddings are L2-normalized and kept in one contiguous
+    float32 matrix with parallel scope/project/expiry arrays, so a similarity
+    lookup is a single matrix-vector product plus a mask.
+
+    A scope is the hash of everything besides the query that changes the
+    answer (project, recent chat history, model, temperature, ...). Semantic
+    hits are only returned within the same scope.
+
+    Responses are deep-copied on the way in and out, so callers may modify
+    what they get back without affecting the cached answer.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, threshold: float):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum answers kept per tier (0 disables the cache)
+            ttl: Seconds an answer stays valid
+            threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self.threshold = threshold
+
+        # key -> (expires_at, project_id, response)
+        self.exact: "OrderedDict[bytes, Tuple[float, int, Any]]" = OrderedDict()
+        # matrix row -> response, in LRU order
+        self.semantic: "OrderedDict[int, Any]" = OrderedDict()
+
+        self._matrix: Optional[np.ndarray] = None
+        self._scopes = np.zeros(self.max_entries, dtype=np.int64)
+        self._projects = np.zeros(self.max_entries, dtype=np.int64)
+        self._expires = np.zeros(self.max_entries, dtype=np.float64)
+        self._live = np.zeros(self.max_entries, dtype=bool)
+        self._free: List[int] = list(range(self.max_entries - 1, -1, -1))
+
+        # Invalidation counts per project, and of the whole cache
+        self._generations: Dict[int, int] = {}
+        self._clears = 0
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores anything."""
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(
+        project_id: int,
+        query: str,
+        chat_history: Sequence[Dict[str, str]],
+        params: Sequence[Any]
+    ) -> Tuple[bytes, int]:
+        """
+        Build the exact-match key and scope for a request.
+
+        Args:
+            project_id: Project the answer is retrieved from
+            query: User question
+            chat_history: History messages that are sent to the LLM
+            params: Other settings that change the answer (model, temperature, ...)
+
+        Returns:
+            Tuple of (exact key, scope id)
+        """
+        scope = hashlib.blake2b(
+            orjson.dumps(
+                [project_id, list(chat_history), list(params)],
+                option=orjson.OPT_SORT_KEYS
+            ),
+            digest_size=8
+        ).digest()
+        key = hashlib.blake2b(query.encode('utf-8'), digest_size=16, key=scope).digest()
+        return key, int.from_bytes(scope, 'little', signed=True)
+
+    def generation(self, project_id: int) -> int:
+        """
+        Get the invalidation count of a project.
+
+        Args:
+            project_id: Project to check
+
+        Returns:
+            Counter that changes whenever the project's answers are invalidated
+        """
+        return self._generations.get(project_id, 0) + self._clears
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """
+        Look up an answer by exact key.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Cached response or None on miss/expiry
+        """
+        entry = self.exact.get(key)
+        if entry is None:
+            return None
+
+        if entry[0] <= time.monotonic():
+            del self.exact[key]
+            return None
+
+        self.exact.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[2])
+
+    def lookup(self, scope: int, embedding: np.ndarray) -> Optional[Any]:
+        """
+        Look up an answer for a similar query in the same scope.
+
+        Args:
+            scope: Scope id from make_key
+            embedding: Query embedding (need not be normalized)
+
+        Returns:
+            Cached response or None if no stored query is similar enough
+        """
+        if not self.semantic or self._matrix is None or len(embedding) != self._matrix.shape[1]:
+            self.misses += 1
+            return None
+
+        candidates = self._live & (self._scopes == scope) & (self._expires > time.monotonic())
+        if not candidates.any():
+            self.misses += 1
+            return None
+
+        scores = self._matrix @ self._normalize(embedding)
+        scores[~candidates] = -np.inf
+        row = int(scores.argmax())
+
+        if scores[row] < self.threshold:
+            self.misses += 1
+            return None
+
+        self.semantic.move_to_end(row)
+        self.semantic_hits += 1
+        logger.debug("Semantic cache hit with similarity %.3f", scores[row])
+        return copy.deepcopy(self.semantic[row])
+
+    def put(
+        self,
+        key: bytes,
+        scope: int,
+        project_id: int,
+        embedding: np.ndarray,
+        response: Any,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Store an answer in both tiers.
+
+        Args:
+            key: Key from make_key
+            scope: Scope id from make_key
+            project_id: Project the answer was retrieved from
+            embedding: Query embedding
+            response: Response to cache
+            generation: Value of generation(project_id) read before retrieval;
+                if the project was invalidated since, nothing is stored
+        """
+        if not self.enabled:
+            return
+
+        if generation is not None and generation != self.generation(project_id):
+            logger.debug(f"Not caching answer for project {project_id}: invalidated meanwhile")
+            return
+
+        response = copy.deepcopy(response)
+
+        expires_at = time.monotonic() + self.ttl
+
+        self.exact[key] = (expires_at, project_id, response)
+        self.exact.move_to_end(key)
+        while len(self.exact) > self.max_entries:
+            self.exact.popitem(last=False)
+
+        # (Re)allocate the matrix on first use or when the embedding model changes
+        if self._matrix is None or self._matrix.shape[1] != len(embedding):
+            self._reset_semantic()
+            self._matrix = np.zeros((self.max_entries, len(embedding)), dtype=np.float32)
+
+        if not self._free:
+            self._release(next(iter(self.semantic)))
+
+        row = self._free.pop()
+        self._matrix[row] = self._normalize(embedding)
+        self._scopes[row] = scope
+        self._projects[row] = project_id
+        self._expires[row] = expires_at
+        self._live[row] = True
+        self.semantic[row] = response
+
+    def invalidate_project(self, project_id: int) -> None:
+        """
+        Drop every answer retrieved from a project.
+
+        Called when the project's documents are added, updated or deleted.
+
+        Args:
+            project_id: Project whose answers are stale
+        """
+        self._generations[project_id] = self._generations.get(project_id, 0) + 1
+
+        stale = [key for key, entry in self.exact.items() if entry[1] == project_id]
+        for key in stale:
+            del self.exact[key]
+
+        for row in np.flatnonzero(self._live & (self._projects == project_id)):
+            self._release(int(row))
+
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached answers for project {project_id}")
+
+    def clear(self) -> None:
+        """Remove all cached answers and reset statistics."""
+        self._clears += 1
+        self.exact.clear()
+        self._reset_semantic()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with hits, semantic_hits, misses, hit_rate and tier sizes
+        """
+        lookups = self.hits + self.semantic_hits + self.misses
+        return {
+            'hits': self.hits,
+            'semantic_hits': self.semantic_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+            'exact_size': len(self.exact),
+            'semantic_size': len(self.semantic),
+            'max_size': self.max_entries
+        }
+
+    def _release(self, row: int) -> None:
+        """Free a semantic row."""
+        del self.semantic[row]
+        self._live[row] = False
+        self._free.append(row)
+
+    def _reset_semantic(self) -> None:
+        """Free every semantic row."""
+        self.semantic.clear()
+        self._live[:] = False
+        self._free = list(range(self.max_entries - 1, -1, -1))
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """Return a unit-length float32 copy of an embedding."""
+        vector = np.array(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+# Create global cache instance (shared by every RAGPipeline)
+semantic_cache = SemanticCache(
+    max_entries=settings.RAG_CACHE_SIZE,
+    ttl=settings.RAG_CACHE_TTL,
+    threshold=settings.RAG_SEMANTIC_CACHE_THRESHOLD
+)
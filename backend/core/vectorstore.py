@@ -5,16 +5,19 @@ This module provides ChromaDB integration for storing and retrieving document em
 Supports project-based isolation via separate collections and metadata filtering.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 import uuid
 import shutil
 import logging
+from collections import OrderedDict
 from pathlib import Path
 
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 
 from .config import settings
+from .semantic_cache import semantic_cache
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +31,15 @@ class VectorStore:
     - Vector storage and retrieval
     - Metadata filtering
     - Similarity search with configurable top-k
+    - Cached collection handles (one manager lookup per project)
     """
 
+    # LRU of collection handles by project ID, bounded by
+    # settings.MAX_OPEN_COLLECTIONS. Shared by all instances because they
+    # open the same persist directory, so a delete through one instance
+    # cannot leave a stale handle in another.
+    _collections: "OrderedDict[int, chromadb.Collection]" = OrderedDict()
+
     def __init__(self):
         """Initialize ChromaDB client with persistent storage."""
         # Ensure storage directory exists
@@ -54,21 +64,48 @@ class VectorStore:
         Returns:
             ChromaDB collection instance
         """
-        collection_name = f"project_{project_id}"
-
-        # ChromaDB collection names must be 3-63 characters and contain only alphanumeric, underscore, or hyphen
-        collection_name = collection_name.replace(" ", "_").lower()
+        collection = self._collections.get(project_id)
+        if collection is not None:
+            try:
+                self._collections.move_to_end(project_id)
+            except KeyError:
+                # Evicted by a concurrent call (searches fetch handles in worker threads)
+                pass
+            return collection
 
         collection = self.client.get_or_create_collection(
-            name=collection_name,
+            name=self.collection_name(project_id),
             metadata={
                 "project_id": str(project_id),
-                "hnsw:space": "cosine"  # Use cosine similarity instead of L2 distance
+                "hnsw:space": "cosine",  # Use cosine similarity instead of L2 distance
+                # Chroma's built-in hnswlib index; only applied when the collection is created
+                "hnsw:M": settings.CHROMA_HNSW_M,
+                "hnsw:construction_ef": settings.CHROMA_HNSW_CONSTRUCTION_EF,
+                "hnsw:search_ef": settings.CHROMA_HNSW_SEARCH_EF,
+                "hnsw:batch_size": settings.CHROMA_HNSW_BATCH_SIZE
             }
         )
 
+        self._collections[project_id] = collection
+        while len(self._collections) > settings.MAX_OPEN_COLLECTIONS:
+            self._collections.popitem(last=False)
         return collection
 
+    @staticmethod
+    def collection_name(project_id: int) -> str:
+        """
+        Get the ChromaDB collection name for a project.
+
+        Args:
+            project_id: The project ID
+
+        Returns:
+            Collection name
+        """
+        # ChromaDB collection names must be 3-63 characters and contain only
+        # alphanumeric, underscore, or hyphen
+        return f"project_{project_id}".replace(" ", "_").lower()
+
     def delete_collection(self, project_id: int) -> bool:
         """
         Delete a project's collection and clean up physical files.
@@ -84,8 +121,10 @@ class VectorStore:
             True if successful, False otherwise
         """
         try:
-            collection_name = f"project_{project_id}"
-            collection_name = collection_name.replace(" ", "_").lower()
+            collection_name = self.collection_name(project_id)
+
+            semantic_cache.invalidate_project(project_id)
+            self._collections.pop(project_id, None)
 
             # Step 1: Delete collection from ChromaDB metadata
             try:
@@ -109,7 +148,7 @@ class VectorStore:
         self,
         project_id: int,
         documents: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         metadatas: Optional[List[Dict[str, Any]]] = None,
         ids: Optional[List[str]] = None
     ) -> bool:
@@ -119,7 +158,7 @@ class VectorStore:
         Args:
             project_id: The project ID
             documents: List of document texts (chunks)
-            embeddings: List of embedding vectors
+            embeddings: List of embedding vectors, or an (N, d) matrix
             metadatas: Optional list of metadata dicts for each document
             ids: Optional list of unique IDs for each document
 
@@ -137,12 +176,17 @@ class VectorStore:
             if metadatas is None:
                 metadatas = [{"chunk_index": i} for i in range(len(documents))]
 
+            # Chroma's index stores float32; hand it one contiguous matrix so
+            # nothing is converted element by element from Python lists
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
             collection.add(
                 documents=documents,
                 embeddings=embeddings,
                 metadatas=metadatas,
                 ids=ids
             )
+            semantic_cache.invalidate_project(project_id)
 
             return True
         except Exception as e:
@@ -152,7 +196,7 @@ class VectorStore:
     def search(
         self,
         project_id: int,
-        query_embedding: List[float],
+        query_embedding: Union[List[float], np.ndarray],
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
         where_document: Optional[Dict[str, Any]] = None
@@ -172,9 +216,50 @@ class VectorStore:
         """
         try:
             collection = self.get_or_create_collection(project_id)
+        except Exception as e:
+            logger.error(f"Error searching documents: {e}", exc_info=True)
+            return {
+                "ids": [],
+                "documents": [],
+                "metadatas": [],
+                "distances": []
+            }
 
+        return self.search_with_collection(
+            collection,
+            query_embedding,
+            n_results=n_results,
+            where=where,
+            where_document=where_document
+        )
+
+    def search_with_collection(
+        self,
+        collection: chromadb.Collection,
+        query_embedding: Union[List[float], np.ndarray],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Search a collection that has already been fetched.
+
+        Lets callers acquire the collection concurrently with computing the
+        query embedding.
+
+        Args:
+            collection: Collection from get_or_create_collection
+            query_embedding: The query embedding vector
+            n_results: Number of results to return (default: 5)
+            where: Optional metadata filter (e.g., {"document_id": "123"})
+            where_document: Optional document content filter
+
+        Returns:
+            Dictionary containing ids, documents, metadatas, and distances
+        """
+        try:
             results = collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=[np.asarray(query_embedding, dtype=np.float32)],
                 n_results=n_results,
                 where=where,
                 where_document=where_document
@@ -188,7 +273,7 @@ class VectorStore:
                 "distances": results["distances"][0] if results["distances"] else []
             }
         except Exception as e:
-            print(f"Error searching documents: {e}")
+            logger.error(f"Error searching documents: {e}", exc_info=True)
             return {
                 "ids": [],
                 "documents": [],
@@ -222,6 +307,7 @@ class VectorStore:
                 collection.delete(where=where)
             else:
                 raise ValueError("Either ids or where filter must be provided")
+            semantic_cache.invalidate_project(project_id)
 
             return True
         except Exception as e:
@@ -318,7 +404,7 @@ class VectorStore:
         project_id: int,
         document_id: str,
         document: Optional[str] = None,
-        embedding: Optional[List[float]] = None,
+        embedding: Optional[Union[List[float], np.ndarray]] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
@@ -340,9 +426,12 @@ class VectorStore:
             collection.update(
                 ids=[document_id],
                 documents=[document] if document else None,
-                embeddings=[embedding] if embedding else None,
+                embeddings=(
+                    [np.asarray(embedding, dtype=np.float32)] if embedding is not None else None
+                ),
                 metadatas=[metadata] if metadata else None
             )
+            semantic_cache.invalidate_project(project_id)
 
             return True
         except Exception as e:
@@ -359,6 +448,8 @@ class VectorStore:
         """
         try:
             self.client.reset()
+            self._collections.clear()
+            semantic_cache.clear()
             return True
         except Exception as e:
             print(f"Error resetting vector store: {e}")
@@ -2,7 +2,7 @@
 CRUD operations for UserSettings model.
 """
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import select, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user_settings import UserSettings
@@ -23,8 +23,9 @@ class CRUDUserSettings(CRUDBase[UserSettings]):
         Returns:
             UserSettings instance or None
         """
+        # Looked up on most requests; lambda_stmt reuses the compiled statement
         result = await db.execute(
-            select(UserSettings).where(UserSettings.user_id == user_id)
+            lambda_stmt(lambda: select(UserSettings).where(UserSettings.user_id == user_id))
         )
         return result.scalar_one_or_none()
 
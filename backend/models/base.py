@@ -38,16 +38,14 @@ def format_datetime(dt: datetime | None) -> str | None:
     if dt is None:
         return None
 
-    # If datetime is naive (no timezone info), assume it's UTC
-    # SQLite DateTime(timezone=True) stores UTC times as naive datetimes
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-
-    # Convert to UTC if it's in a different timezone
-    dt_utc = dt.astimezone(timezone.utc)
+    # Naive datetimes are already UTC: SQLite DateTime(timezone=True) stores UTC
+    # times as naive datetimes, so this is the common path for every DB row
+    if dt.tzinfo is not None:
+        # Convert to UTC and drop the offset (re-added as 'Z' below)
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
 
     # Format with 'Z' suffix for UTC (more compatible than +00:00)
-    return dt_utc.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+    return dt.isoformat(timespec='milliseconds') + 'Z'
 
 
 class TimestampMixin:
@@ -442,7 +442,7 @@ class AnalyticsService:
 
             return {
                 "query": query,
-                "query_embedding": query_embedding if return_embeddings else None,
+                "query_embedding": query_embedding.tolist() if return_embeddings else None,
                 "results": retrieved_chunks,
                 "stats": {
                     "avg_score": float(scores_array.mean()) if len(scores) > 0 else 0.0,
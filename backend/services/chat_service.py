@@ -13,7 +13,7 @@ import logging
 from typing import List, Dict, Any, Optional, AsyncGenerator
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, lambda_stmt
 from sqlalchemy.orm import selectinload
 
 from models.chat import Chat
@@ -117,10 +117,11 @@ class ChatService:
             Chat object or None if not found
         """
         try:
-            query = select(Chat).where(Chat.id == chat_id)
+            # lambda_stmt caches the compiled SQL; chat_id is extracted as a bound parameter
+            query = lambda_stmt(lambda: select(Chat).where(Chat.id == chat_id))
 
             if include_messages:
-                query = query.options(selectinload(Chat.messages))
+                query += lambda q: q.options(selectinload(Chat.messages))
 
             result = await db.execute(query)
             chat = result.scalar_one_or_none()
@@ -377,7 +378,8 @@ class ChatService:
         model: Optional[str] = None,
         temperature: float = 0.7,
         include_history: bool = True,
-        max_history: int = 5
+        max_history: int = 5,
+        user_id: str = "default_user"
     ) -> RAGResponse:
         """
         Send a user message and generate a response using RAG pipeline.
@@ -390,6 +392,7 @@ class ChatService:
             temperature: Sampling temperature
             include_history: Whether to include conversation history
             max_history: Maximum history messages to include
+            user_id: Caller the LLM request is scheduled for
 
         Returns:
             RAG response with answer and sources
@@ -431,7 +434,8 @@ class ChatService:
                 project_id=chat.project_id,
                 chat_history=history,
                 model=model,
-                temperature=temperature
+                temperature=temperature,
+                user_id=user_id
             )
 
             # Add assistant message to database
@@ -474,7 +478,8 @@ class ChatService:
         model: Optional[str] = None,
         temperature: float = 0.7,
         include_history: bool = True,
-        max_history: int = 5
+        max_history: int = 5,
+        user_id: str = "default_user"
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Send a user message and stream the response.
@@ -492,6 +497,7 @@ class ChatService:
             temperature: Sampling temperature
             include_history: Whether to include conversation history
             max_history: Maximum history messages to include
+            user_id: Caller the LLM request is scheduled for
 
         Yields:
             Stream events from RAG pipeline
@@ -536,7 +542,8 @@ class ChatService:
                 project_id=chat.project_id,
                 chat_history=history,
                 model=model,
-                temperature=temperature
+                temperature=temperature,
+                user_id=user_id
             ):
                 # Forward event to caller
                 yield event
@@ -10,11 +10,13 @@ This service handles:
 - Project export/import functionality
 """
 
+import asyncio
 import logging
 import json
+import os
 import shutil
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Set
+from datetime import datetime, timezone
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
@@ -160,15 +162,18 @@ class ProjectService:
             logger.error(f"Failed to get project {project_id}: {str(e)}")
             return None
 
-    async def list_projects(
+    async def list_project_summaries(
         self,
         db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         include_deleted: bool = False
-    ) -> List[Project]:
+    ) -> List[Dict[str, Any]]:
         """
-        List all projects.
+        List projects as JSON-ready dicts.
+
+        Selects only the listed columns, so rows skip ORM hydration and identity
+        map bookkeeping; datetimes are formatted once here.
 
         Args:
             db: Database session
@@ -177,10 +182,21 @@ class ProjectService:
             include_deleted: Whether to include soft-deleted projects
 
         Returns:
-            List of project objects
+            List of project dicts matching the ProjectResponse fields
         """
         try:
-            query = select(Project)
+            query = select(
+                Project.id,
+                Project.name,
+                Project.description,
+                Project.chroma_collection_name,
+                Project.document_count,
+                Project.chat_count,
+                Project.total_chunks,
+                Project.settings,
+                Project.created_at,
+                Project.updated_at
+            )
 
             if not include_deleted:
                 query = query.where(Project.deleted_at.is_(None))
@@ -193,10 +209,17 @@ class ProjectService:
             )
 
             result = await db.execute(query)
-            projects = result.scalars().all()
+            projects = [
+                {
+                    **row,
+                    'created_at': format_datetime(row['created_at']),
+                    'updated_at': format_datetime(row['updated_at'])
+                }
+                for row in result.mappings()
+            ]
 
             logger.info(f"Retrieved {len(projects)} projects")
-            return list(projects)
+            return projects
 
         except Exception as e:
             logger.error(f"Failed to list projects: {str(e)}")
@@ -374,20 +397,12 @@ class ProjectService:
             # Update project with folder path
             await self.update_project(db, project_id, folder_path=str(folder.absolute()))
 
-            # Scan for supported document files
+            # Scan for supported document files in a worker thread so a large
+            # folder tree does not block the event loop
             supported_extensions = {'.pdf', '.docx', '.txt', '.md', '.csv', '.xlsx'}
-            discovered_files = []
-
-            for ext in supported_extensions:
-                for file_path in folder.rglob(f'*{ext}'):
-                    if file_path.is_file():
-                        discovered_files.append({
-                            'name': file_path.name,
-                            'path': str(file_path.absolute()),
-                            'size': file_path.stat().st_size,
-                            'extension': ext,
-                            'relative_path': str(file_path.relative_to(folder))
-                        })
+            discovered_files = await asyncio.to_thread(
+                self._scan_folder, folder, supported_extensions
+            )
 
             logger.info(f"Opened folder '{folder_path}' for project {project_id}, found {len(discovered_files)} files")
 
@@ -422,11 +437,10 @@ class ProjectService:
         try:
             project = await self.get_project(db, project_id)
 
-            if not project or not project.settings:
+            if not project:
                 return None
 
-            settings_dict = json.loads(project.settings)
-            return settings_dict.get('folder_path')
+            return self._folder_path_of(project)
 
         except Exception as e:
             logger.error(f"Failed to get project folder: {str(e)}")
@@ -458,28 +472,7 @@ class ProjectService:
             if not project:
                 raise ProjectServiceError(f"Project {project_id} not found")
 
-            # Get vector store statistics
-            vector_count = vector_store.get_collection_count(project_id)
-
-            # Calculate document statistics
-            total_size = sum(doc.file_size for doc in project.documents if doc.file_size)
-
-            # Get chat statistics
-            active_chats = [chat for chat in project.chats if not chat.deleted_at]
-            total_messages = sum(chat.message_count for chat in active_chats)
-
-            return {
-                'project_id': project.id,
-                'project_name': project.name,
-                'document_count': len(project.documents),
-                'total_chunks': vector_count,
-                'total_size_bytes': total_size,
-                'chat_count': len(active_chats),
-                'message_count': total_messages,
-                'created_at': format_datetime(project.created_at),
-                'updated_at': format_datetime(project.updated_at),
-                'folder_path': await self.get_project_folder(db, project_id)
-            }
+            return self._build_statistics(project)
 
         except ProjectServiceError:
             raise
@@ -524,7 +517,7 @@ class ProjectService:
 
             export_data = {
                 'version': '1.0',
-                'export_date': datetime.utcnow().isoformat(),
+                'export_date': format_datetime(datetime.now(timezone.utc)),
                 'project': {
                     'name': project.name,
                     'description': project.description,
@@ -540,7 +533,7 @@ class ProjectService:
                         'file_type': doc.file_type,
                         'file_size': doc.file_size,
                         'file_path': doc.file_path,
-                        'upload_date': doc.upload_date.isoformat() if doc.upload_date else None
+                        'upload_date': format_datetime(doc.upload_date)
                     }
                     for doc in project.documents
                 ]
@@ -657,9 +650,23 @@ class ProjectService:
             ProjectServiceError: If switching fails
         """
         try:
+            # Fetch both projects in one query (documents/chats are selectin
+            # loaded for both rows together)
+            result = await db.execute(
+                select(Project)
+                .where(
+                    and_(
+                        Project.id.in_([from_project_id, to_project_id]),
+                        Project.deleted_at.is_(None)
+                    )
+                )
+                .options(selectinload(Project.documents), selectinload(Project.chats))
+            )
+            projects = {project.id: project for project in result.scalars()}
+
             # Validate both projects exist
-            from_project = await self.get_project(db, from_project_id)
-            to_project = await self.get_project(db, to_project_id)
+            from_project = projects.get(from_project_id)
+            to_project = projects.get(to_project_id)
 
             if not from_project:
                 raise ProjectServiceError(f"Source project {from_project_id} not found")
@@ -667,8 +674,8 @@ class ProjectService:
             if not to_project:
                 raise ProjectServiceError(f"Target project {to_project_id} not found")
 
-            # Get statistics for the new project
-            stats = await self.get_project_statistics(db, to_project_id)
+            # Get statistics for the new project from the already loaded row
+            stats = self._build_statistics(to_project)
 
             logger.info(f"Switched project context from {from_project_id} to {to_project_id}")
 
@@ -693,6 +700,110 @@ class ProjectService:
 
     # Private helper methods
 
+    @staticmethod
+    def _scan_folder(folder: Path, extensions: Set[str]) -> List[Dict[str, Any]]:
+        """
+        Recursively find files with supported extensions.
+
+        Walks the tree once with os.scandir (instead of one rglob pass per
+        extension); blocking, so call it from a worker thread.
+
+        Args:
+            folder: Folder to scan
+            extensions: File extensions to include (e.g. '.pdf')
+
+        Returns:
+            List of discovered file info dictionaries
+        """
+        root = folder.absolute()
+        discovered_files = []
+        pending = [str(root)]
+
+        while pending:
+            directory = pending.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError as e:
+                # Unreadable or vanished directory: skip it, like Path.rglob
+                logger.warning(f"Skipping folder {directory}: {e}")
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+
+                    ext = os.path.splitext(entry.name)[1]
+                    if ext not in extensions or not entry.is_file():
+                        continue
+                    size = entry.stat().st_size
+                except OSError as e:
+                    logger.warning(f"Skipping {entry.path}: {e}")
+                    continue
+
+                discovered_files.append({
+                    'name': entry.name,
+                    'path': entry.path,
+                    'size': size,
+                    'extension': ext,
+                    'relative_path': os.path.relpath(entry.path, root)
+                })
+
+        return discovered_files
+
+    @staticmethod
+    def _folder_path_of(project: Project) -> Optional[str]:
+        """
+        Read the folder path from a project's settings JSON.
+
+        Args:
+            project: Project object
+
+        Returns:
+            Folder path or None if not set
+        """
+        if not project.settings:
+            return None
+
+        try:
+            return json.loads(project.settings).get('folder_path')
+        except (json.JSONDecodeError, AttributeError):
+            return None
+
+    def _build_statistics(self, project: Project) -> Dict[str, Any]:
+        """
+        Build statistics for a project with documents and chats loaded.
+
+        Args:
+            project: Project object (documents and chats loaded)
+
+        Returns:
+            Dictionary with project statistics
+        """
+        # Get vector store statistics
+        vector_count = vector_store.get_collection_count(project.id)
+
+        # Calculate document statistics
+        total_size = sum(doc.file_size for doc in project.documents if doc.file_size)
+
+        # Get chat statistics
+        active_chats = [chat for chat in project.chats if not chat.deleted_at]
+        total_messages = sum(chat.message_count for chat in active_chats)
+
+        return {
+            'project_id': project.id,
+            'project_name': project.name,
+            'document_count': len(project.documents),
+            'total_chunks': vector_count,
+            'total_size_bytes': total_size,
+            'chat_count': len(active_chats),
+            'message_count': total_messages,
+            'created_at': format_datetime(project.created_at),
+            'updated_at': format_datetime(project.updated_at),
+            'folder_path': self._folder_path_of(project)
+        }
+
     async def _get_by_name(
         self,
         db: AsyncSession,
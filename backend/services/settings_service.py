@@ -6,14 +6,22 @@ This service handles:
 - RAG settings (chunk size, overlap, retrieval count)
 - Model installation and validation
 - Persistence of settings to database
+- Background model pull jobs with progress events
+- Periodic pre-serialization of the model catalogs
 """
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import uuid
+
+import orjson
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Dict, List, Optional, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud.user_settings import user_settings as crud_user_settings
 from models.user_settings import UserSettings
-from core.llm import ollama_client
+from core.cache import response_cache, INSTALLED_MODELS_KEY, POPULAR_MODELS_KEY
+from core.llm import get_ollama_client
 from core.embeddings import embedding_service
 
 logger = logging.getLogger(__name__)
@@ -103,9 +111,51 @@ POPULAR_MODELS = {
 }
 
 
+# Seconds a finished pull job stays queryable before it is dropped
+PULL_JOB_RETENTION = 300
+
+
+@dataclass
+class PullJob:
+    """State of a background model pull."""
+    job_id: str
+    model_name: str
+    status: str = "queued"  # queued, downloading, success, failed
+    percent: Optional[float] = None
+    error: Optional[str] = None
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the pull reached a terminal state."""
+        return self.status in ("success", "failed")
+
+    def to_event(self) -> Dict[str, Any]:
+        """Serialize the job state as a progress event."""
+        return {
+            "job_id": self.job_id,
+            "model_name": self.model_name,
+            "status": self.status,
+            "percent": self.percent,
+            "error": self.error,
+        }
+
+    async def update(self, **changes: Any) -> None:
+        """Apply state changes and wake up event subscribers."""
+        for key, value in changes.items():
+            setattr(self, key, value)
+        async with self.changed:
+            self.changed.notify_all()
+
+
 class SettingsService:
     """Service for managing system settings and model configuration."""
 
+    def __init__(self):
+        """Initialize the service with an empty pull job registry."""
+        self._pull_jobs: Dict[str, PullJob] = {}
+        self._pull_tasks: Dict[str, asyncio.Task] = {}
+
     @staticmethod
     async def get_settings(db: AsyncSession) -> UserSettings:
         """
@@ -122,67 +172,86 @@ class SettingsService:
         return settings
 
     @staticmethod
-    async def update_llm_model(db: AsyncSession, model_name: str) -> UserSettings:
+    async def _installed_model_names() -> List[str]:
         """
-        Update the default LLM model.
+        Get the base names (without tag) of all installed models.
+
+        Returns:
+            List of installed model names
+        """
+        installed_models = await get_ollama_client().list_models()
+        return [
+            model.get('name', '').split(':')[0]
+            for model in installed_models
+            if model.get('name', '').split(':')[0].strip() != ''
+        ]
+
+    @staticmethod
+    async def update_models(
+        db: AsyncSession,
+        llm_model: Optional[str] = None,
+        embedding_model: Optional[str] = None
+    ) -> UserSettings:
+        """
+        Update the default LLM and/or embedding model.
 
         This method:
-        1. Validates that the model is installed
-        2. Updates the database
-        3. Updates the global ollama_client singleton
+        1. Validates that the models are installed (one Ollama listing)
+        2. Updates the database in a single write
+        3. Updates the shared OllamaClient / embedding_service singletons
 
         Args:
             db: Database session
-            model_name: Name of the LLM model
+            llm_model: Name of the LLM model (optional)
+            embedding_model: Name of the embedding model (optional)
 
         Returns:
             Updated UserSettings instance
 
         Raises:
-            ValueError: If model is not installed
+            ValueError: If a model is not installed
         """
-        # Validate model exists
+        # Validate models exist
         try:
-            installed_models = await ollama_client.list_models()
-            model_names = [
-                model.get('name', '').split(':')[0]
-                for model in installed_models
-                if model.get('name', '').split(':')[0].strip() != ''
-            ]
+            model_names = await SettingsService._installed_model_names()
 
-            if model_name not in model_names:
-                raise ValueError(f"Model '{model_name}' is not installed. Please install it first.")
+            for model_name in (llm_model, embedding_model):
+                if model_name and model_name not in model_names:
+                    raise ValueError(
+                        f"Model '{model_name}' is not installed. Please install it first."
+                    )
 
         except Exception as e:
-            logger.error(f"Failed to validate LLM model '{model_name}': {e}")
+            logger.error(f"Failed to validate models: {e}")
             raise ValueError(f"Failed to validate model: {str(e)}")
 
         # Update database
         settings = await crud_user_settings.update_model_settings(
             db,
-            llm_model=model_name
+            llm_model=llm_model,
+            embedding_model=embedding_model
         )
         await db.commit()
 
-        # Update global singleton (for immediate effect)
-        ollama_client.switch_model(model_name)
+        # Update global singletons (for immediate effect)
+        if llm_model:
+            get_ollama_client().switch_model(llm_model)
+            logger.info(f"Successfully updated LLM model to '{llm_model}'")
+
+        if embedding_model:
+            embedding_service.switch_model(embedding_model)
+            logger.info(f"Successfully updated embedding model to '{embedding_model}'")
 
-        logger.info(f"Successfully updated LLM model to '{model_name}'")
         return settings
 
     @staticmethod
-    async def update_embedding_model(db: AsyncSession, model_name: str) -> UserSettings:
+    async def update_llm_model(db: AsyncSession, model_name: str) -> UserSettings:
         """
-        Update the default embedding model.
-
-        This method:
-        1. Validates that the model is installed
-        2. Updates the database
-        3. Updates the global embedding_service singleton
+        Update the default LLM model.
 
         Args:
             db: Database session
-            model_name: Name of the embedding model
+            model_name: Name of the LLM model
 
         Returns:
             Updated UserSettings instance
@@ -190,34 +259,24 @@ class SettingsService:
         Raises:
             ValueError: If model is not installed
         """
-        # Validate model exists
-        try:
-            installed_models = await ollama_client.list_models()
-            model_names = [
-                model.get('name', '').split(':')[0]
-                for model in installed_models
-                if model.get('name', '').split(':')[0].strip() != ''
-            ]
-
-            if model_name not in model_names:
-                raise ValueError(f"Model '{model_name}' is not installed. Please install it first.")
+        return await SettingsService.update_models(db, llm_model=model_name)
 
-        except Exception as e:
-            logger.error(f"Failed to validate embedding model '{model_name}': {e}")
-            raise ValueError(f"Failed to validate model: {str(e)}")
+    @staticmethod
+    async def update_embedding_model(db: AsyncSession, model_name: str) -> UserSettings:
+        """
+        Update the default embedding model.
 
-        # Update database
-        settings = await crud_user_settings.update_model_settings(
-            db,
-            embedding_model=model_name
-        )
-        await db.commit()
+        Args:
+            db: Database session
+            model_name: Name of the embedding model
 
-        # Update global singleton (for immediate effect)
-        embedding_service.switch_model(model_name)
+        Returns:
+            Updated UserSettings instance
 
-        logger.info(f"Successfully updated embedding model to '{model_name}'")
-        return settings
+        Raises:
+            ValueError: If model is not installed
+        """
+        return await SettingsService.update_models(db, embedding_model=model_name)
 
     @staticmethod
     async def get_installed_models() -> Dict[str, Any]:
@@ -232,7 +291,7 @@ class SettingsService:
             Dictionary with llm_models, embedding_models, current_llm, current_embedding
         """
         try:
-            all_models = await ollama_client.list_models()
+            all_models = await get_ollama_client().list_models()
 
             llm_models = []
             embedding_models = []
@@ -266,7 +325,7 @@ class SettingsService:
             return {
                 "llm_models": llm_models,
                 "embedding_models": embedding_models,
-                "current_llm": ollama_client.default_model,
+                "current_llm": get_ollama_client().default_model,
                 "current_embedding": embedding_service.model
             }
 
@@ -275,7 +334,7 @@ class SettingsService:
             return {
                 "llm_models": [],
                 "embedding_models": [],
-                "current_llm": ollama_client.default_model,
+                "current_llm": get_ollama_client().default_model,
                 "current_embedding": embedding_service.model
             }
 
@@ -290,7 +349,7 @@ class SettingsService:
         """
         try:
             # Get installed models
-            all_models = await ollama_client.list_models()
+            all_models = await get_ollama_client().list_models()
             installed_names = {
                 model.get('name', '').split(':')[0]
                 for model in all_models
@@ -351,7 +410,7 @@ class SettingsService:
             query_lower = query.lower().strip()
 
             # Get installed models
-            all_models = await ollama_client.list_models()
+            all_models = await get_ollama_client().list_models()
             installed_names = {
                 model.get('name', '').split(':')[0]
                 for model in all_models
@@ -402,7 +461,7 @@ class SettingsService:
         """
         try:
             logger.info(f"Pulling model '{model_name}'...")
-            success = await ollama_client.pull_model(model_name)
+            success = await get_ollama_client().pull_model_blocking(model_name)
 
             if success:
                 logger.info(f"Successfully pulled model '{model_name}'")
@@ -416,5 +475,134 @@ class SettingsService:
             raise Exception(f"Failed to pull model: {str(e)}")
 
 
+    async def refresh_model_catalogs(self, ttl: float) -> None:
+        """
+        Pre-serialize the installed/popular model catalogs into the response cache.
+
+        Args:
+            ttl: Seconds the serialized catalogs stay valid
+        """
+        # Skip the write for a catalog invalidated (pull, model switch) mid-fetch
+        installed_generation = response_cache.generation(INSTALLED_MODELS_KEY)
+        popular_generation = response_cache.generation(POPULAR_MODELS_KEY)
+
+        installed = await self.get_installed_models()
+        popular = await self.get_popular_models()
+
+        response_cache.set(
+            INSTALLED_MODELS_KEY, orjson.dumps(installed), ttl, generation=installed_generation
+        )
+        response_cache.set(
+            POPULAR_MODELS_KEY, orjson.dumps(popular), ttl, generation=popular_generation
+        )
+
+    async def run_catalog_refresher(self, interval: float) -> None:
+        """
+        Refresh the model catalogs every `interval` seconds until cancelled.
+
+        Entries outlive one interval so requests never fall through to Ollama
+        between refreshes; pulls and model updates still invalidate them.
+
+        Args:
+            interval: Seconds between refreshes
+        """
+        while True:
+            try:
+                await self.refresh_model_catalogs(ttl=interval * 2)
+            except Exception as e:
+                logger.warning(f"Failed to refresh model catalogs: {e}")
+
+            await asyncio.sleep(interval)
+
+    def start_pull(self, model_name: str) -> PullJob:
+        """
+        Start pulling a model in the background.
+
+        A pull that is already running for the same model is reused instead of
+        starting a second download.
+
+        Args:
+            model_name: Name of the model to pull
+
+        Returns:
+            PullJob tracking the download
+        """
+        for job in self._pull_jobs.values():
+            if job.model_name == model_name and not job.finished:
+                return job
+
+        job = PullJob(job_id=uuid.uuid4().hex, model_name=model_name)
+        self._pull_jobs[job.job_id] = job
+        # Keep a reference so the task is not garbage collected mid-download
+        self._pull_tasks[job.job_id] = asyncio.create_task(self._run_pull(job))
+        return job
+
+    def get_pull_job(self, job_id: str) -> Optional[PullJob]:
+        """
+        Get a pull job by ID.
+
+        Args:
+            job_id: Pull job identifier
+
+        Returns:
+            PullJob or None if unknown or expired
+        """
+        return self._pull_jobs.get(job_id)
+
+    async def pull_job_events(self, job: PullJob) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Stream progress events for a pull job until it finishes.
+
+        Args:
+            job: Pull job to follow
+
+        Yields:
+            Job state dicts (see PullJob.to_event)
+        """
+        while True:
+            event = job.to_event()
+            yield event
+
+            if job.finished:
+                return
+
+            async with job.changed:
+                # Skip the wait if the state moved on while the event was sent
+                if job.to_event() == event:
+                    await job.changed.wait()
+
+    async def _run_pull(self, job: PullJob) -> None:
+        """
+        Run a pull job and record its outcome.
+
+        Args:
+            job: Pull job to run
+        """
+        try:
+            await job.update(status="downloading")
+            logger.info(f"Pulling model '{job.model_name}'...")
+
+            async for progress in get_ollama_client().pull_model(job.model_name):
+                percent = progress['percent']
+                # Only wake subscribers when the whole-number percentage moves
+                last = -1 if job.percent is None else int(job.percent)
+                if percent is not None and int(percent) != last:
+                    await job.update(percent=percent)
+
+            logger.info(f"Successfully pulled model '{job.model_name}'")
+            await job.update(status="success", percent=100.0)
+
+        except Exception as e:
+            await job.update(status="failed", error=str(e))
+
+        finally:
+            # Installation status changed (or may have partially changed)
+            response_cache.delete(INSTALLED_MODELS_KEY, POPULAR_MODELS_KEY)
+            self._pull_tasks.pop(job.job_id, None)
+            asyncio.get_running_loop().call_later(
+                PULL_JOB_RETENTION, self._pull_jobs.pop, job.job_id, None
+            )
+
+
 # Create service instance
 settings_service = SettingsService()
@@ -383,9 +383,38 @@ export const systemApi = {
     return response.data;
   },
 
-  // Install a model
-  pullModel: async (modelName: string): Promise<void> => {
-    await apiClient.post('/api/settings/models/pull', { model_name: modelName });
+  // Install a model (runs as a background job; resolves once the download finishes)
+  pullModel: async (
+    modelName: string,
+    onProgress?: (percent: number | null) => void
+  ): Promise<void> => {
+    const response = await apiClient.post<{ job_id: string }>('/api/settings/models/pull', {
+      model_name: modelName,
+    });
+
+    await new Promise<void>((resolve, reject) => {
+      const events = new EventSource(
+        `${API_BASE_URL}/api/settings/models/pull/${response.data.job_id}/events`
+      );
+
+      events.onmessage = (message) => {
+        const event = JSON.parse(message.data);
+        onProgress?.(event.percent);
+
+        if (event.status === 'success') {
+          events.close();
+          resolve();
+        } else if (event.status === 'failed') {
+          events.close();
+          reject(new Error(event.error || `Failed to pull model '${modelName}'`));
+        }
+      };
+
+      events.onerror = () => {
+        events.close();
+        reject(new Error(`Lost connection while pulling model '${modelName}'`));
+      };
+    });
   },
 
   // Search for models
@@ -15,7 +15,8 @@ export interface SourceDocument {
 
 export interface MessageTokenEvent {
   chat_id: number;
-  token: string;
+  token: string; // Coalesced text of all tokens in this batch
+  tokens?: string[];
 }
 
 export interface MessageSourcesEvent {